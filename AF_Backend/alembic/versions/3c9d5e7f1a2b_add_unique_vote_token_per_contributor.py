@@ -0,0 +1,32 @@
+"""add_unique_vote_token_per_contributor
+
+Revision ID: 3c9d5e7f1a2b
+Revises: 8b1f2e3d4c5a
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d5e7f1a2b'
+down_revision = '8b1f2e3d4c5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the oldest token where concurrent pledges created duplicates
+    op.execute("""
+        DELETE FROM vote_token a
+        USING vote_token b
+        WHERE a.campaign_id = b.campaign_id
+          AND a.contributor_id = b.contributor_id
+          AND (a.created_at, a.token_id) > (b.created_at, b.token_id)
+    """)
+    op.create_unique_constraint('uq_vote_token_campaign_contributor', 'vote_token', ['campaign_id', 'contributor_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_vote_token_campaign_contributor', 'vote_token', type_='unique')
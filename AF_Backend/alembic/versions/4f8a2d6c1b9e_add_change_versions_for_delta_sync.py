@@ -0,0 +1,49 @@
+"""add_change_versions_for_delta_sync
+
+Revision ID: 4f8a2d6c1b9e
+Revises: 9a3c6e1d4b7f
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8a2d6c1b9e'
+down_revision = '9a3c6e1d4b7f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One sequence for every synced table, so a single since_version covers them all
+    op.execute("CREATE SEQUENCE change_version_seq")
+    next_value = sa.text("nextval('change_version_seq')")
+
+    # The volatile default gives every existing row its own version
+    op.add_column('campaign', sa.Column('change_version', sa.BigInteger(), nullable=False, server_default=next_value))
+    op.add_column('milestone', sa.Column('change_version', sa.BigInteger(), nullable=False, server_default=next_value))
+    op.create_index('ix_campaign_fundraiser_change_version', 'campaign', ['fundraiser_id', 'change_version'])
+    op.create_index('ix_milestone_campaign_change_version', 'milestone', ['campaign_id', 'change_version'])
+
+    op.create_table('change_tombstone',
+    sa.Column('tombstone_id', sa.UUID(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('scope_id', sa.UUID(), nullable=True),
+    sa.Column('change_version', sa.BigInteger(), nullable=False, server_default=next_value),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('tombstone_id')
+    )
+    op.create_index('ix_change_tombstone_scope', 'change_tombstone', ['entity', 'scope_id', 'change_version'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_tombstone_scope', table_name='change_tombstone')
+    op.drop_table('change_tombstone')
+    op.drop_index('ix_milestone_campaign_change_version', table_name='milestone')
+    op.drop_index('ix_campaign_fundraiser_change_version', table_name='campaign')
+    op.drop_column('milestone', 'change_version')
+    op.drop_column('campaign', 'change_version')
+    op.execute("DROP SEQUENCE change_version_seq")
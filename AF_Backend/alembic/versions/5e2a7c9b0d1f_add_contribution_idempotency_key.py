@@ -0,0 +1,45 @@
+"""add_contribution_idempotency_key
+
+Revision ID: 5e2a7c9b0d1f
+Revises: 3c9d5e7f1a2b
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a7c9b0d1f'
+down_revision = '3c9d5e7f1a2b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('contribution', sa.Column('idempotency_key', sa.String(length=100), nullable=True))
+    op.create_unique_constraint('uq_contribution_idempotency_key', 'contribution', ['idempotency_key'])
+    # Retried callbacks already double-credited some receipts. Keep the oldest
+    # ledger row's code and suffix the others, so they stay visible for
+    # reconciliation instead of failing the unique index
+    op.execute("""
+        UPDATE transaction_ledger t
+        SET reference_code = t.reference_code || '#dup' || d.n
+        FROM (
+            SELECT transaction_id,
+                   row_number() OVER (PARTITION BY reference_code ORDER BY created_at, transaction_id) - 1 AS n
+            FROM transaction_ledger
+            WHERE transaction_type = 'contribution' AND reference_code IS NOT NULL
+        ) d
+        WHERE t.transaction_id = d.transaction_id AND d.n > 0
+    """)
+    op.create_index(
+        'uq_transaction_ledger_contribution_reference', 'transaction_ledger', ['reference_code'], unique=True,
+        postgresql_where=sa.text("transaction_type = 'contribution'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_transaction_ledger_contribution_reference', table_name='transaction_ledger')
+    op.drop_constraint('uq_contribution_idempotency_key', 'contribution', type_='unique')
+    op.drop_column('contribution', 'idempotency_key')
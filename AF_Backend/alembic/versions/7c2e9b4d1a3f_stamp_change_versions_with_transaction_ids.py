@@ -0,0 +1,50 @@
+"""stamp_change_versions_with_transaction_ids
+
+Revision ID: 7c2e9b4d1a3f
+Revises: 4f8a2d6c1b9e
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9b4d1a3f'
+down_revision = '4f8a2d6c1b9e'
+branch_labels = None
+depends_on = None
+
+TABLES = ('campaign', 'milestone', 'change_tombstone')
+
+
+def upgrade() -> None:
+    # Offset transaction ids past every sequence value already handed out, so
+    # cursors clients hold from the sequence stay below every new version
+    offset = op.get_bind().execute(sa.text(
+        "SELECT GREATEST(0, (SELECT last_value FROM change_version_seq) - pg_current_xact_id()::text::bigint)"
+    )).scalar_one()
+    op.execute(
+        "CREATE FUNCTION change_version_stamp() RETURNS bigint LANGUAGE sql VOLATILE AS "
+        f"$$ SELECT pg_current_xact_id()::text::bigint + {offset} $$"
+    )
+    op.execute(
+        "CREATE FUNCTION change_version_horizon() RETURNS bigint LANGUAGE sql VOLATILE AS "
+        f"$$ SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint + {offset} - 1 $$"
+    )
+    for table in TABLES:
+        op.alter_column(table, 'change_version', server_default=sa.text("change_version_stamp()"))
+    op.execute("DROP SEQUENCE change_version_seq")
+
+
+def downgrade() -> None:
+    op.execute("CREATE SEQUENCE change_version_seq")
+    op.execute(
+        "SELECT setval('change_version_seq', GREATEST("
+        + ", ".join(f"(SELECT max(change_version) FROM {table})" for table in TABLES)
+        + ", change_version_stamp()))"
+    )
+    for table in TABLES:
+        op.alter_column(table, 'change_version', server_default=sa.text("nextval('change_version_seq')"))
+    op.execute("DROP FUNCTION change_version_horizon()")
+    op.execute("DROP FUNCTION change_version_stamp()")
@@ -0,0 +1,25 @@
+"""add_version_to_campaign
+
+Revision ID: 7d4b1e8f2c3a
+Revises: 5e2a7c9b0d1f
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d4b1e8f2c3a'
+down_revision = '5e2a7c9b0d1f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Optimistic concurrency token for status transitions
+    op.add_column('campaign', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('campaign', 'version')
@@ -0,0 +1,58 @@
+"""add_contributor_phone_normalized
+
+Revision ID: 9a3c6e1d4b7f
+Revises: 7d4b1e8f2c3a
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3c6e1d4b7f'
+down_revision = '7d4b1e8f2c3a'
+branch_labels = None
+depends_on = None
+
+
+def _normalize_phone(phone):
+    # Frozen copy of app.utils.phone.normalize_phone as of this revision
+    digits = re.sub(r"[\s\-()]", "", phone or "").lstrip("+")
+    if not digits.isdigit():
+        return None
+    if digits.startswith("254"):
+        digits = digits[3:]
+    if digits.startswith("0"):
+        digits = digits[1:]
+    return "254" + digits if len(digits) == 9 else None
+
+
+def upgrade() -> None:
+    op.add_column('contributor_profile', sa.Column('phone_normalized', sa.String(length=12), nullable=True))
+
+    # Backfill; the oldest profile keeps a number that normalizes to the same
+    # MSISDN as another (e.g. 07... and 2547...), later ones log in by username
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT contributor_id, phone_number FROM contributor_profile "
+        "WHERE phone_number IS NOT NULL ORDER BY created_at"
+    )).fetchall()
+    seen = set()
+    for contributor_id, phone_number in rows:
+        normalized = _normalize_phone(phone_number)
+        if normalized is None or normalized in seen:
+            continue
+        seen.add(normalized)
+        conn.execute(
+            sa.text("UPDATE contributor_profile SET phone_normalized = :phone WHERE contributor_id = :id"),
+            {"phone": normalized, "id": contributor_id}
+        )
+
+    op.create_index(op.f('ix_contributor_profile_phone_normalized'), 'contributor_profile', ['phone_normalized'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_contributor_profile_phone_normalized'), table_name='contributor_profile')
+    op.drop_column('contributor_profile', 'phone_normalized')
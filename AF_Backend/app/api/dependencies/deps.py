@@ -1,15 +1,21 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Any, Dict, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 from app.db.session import SessionLocal
+from app.db.async_session import AsyncSessionLocal, get_async_db
+from app.db.replica import ReplicaSessionLocal, AsyncReplicaSessionLocal, HAS_REPLICA
+from app.core.redis import is_pinned_to_primary, is_pinned_to_primary_async
 from app.core import security
 from app.core.config import settings
+from app.core.revocation import revocation_list
 from app.models.user import User
-from app.schemas.user import TokenData
+from app.schemas.user import TokenData, TokenUser
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -20,25 +26,126 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+def account_id_from_request(request: Request) -> Optional[str]:
+    """
+    Best-effort account id from the bearer token; None for anonymous or invalid tokens.
+    """
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return payload.get("sub")
+    except JWTError:
+        return None
+
+def get_read_db(request: Request) -> Generator:
+    """
+    Session for read-only endpoints. Served by the replica unless the caller
+    wrote recently and is pinned to the primary (read-your-writes).
+    """
+    session_factory = SessionLocal
+    if HAS_REPLICA:
+        account_id = account_id_from_request(request)
+        if account_id is None or not is_pinned_to_primary(account_id):
+            session_factory = ReplicaSessionLocal
+    try:
+        db = session_factory()
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    """
+    Async variant of get_read_db.
+    """
+    session_factory = AsyncSessionLocal
+    if HAS_REPLICA:
+        account_id = account_id_from_request(request)
+        if account_id is None or not await is_pinned_to_primary_async(account_id):
+            session_factory = AsyncReplicaSessionLocal
+    async with session_factory() as db:
+        yield db
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_claims(token: str) -> Dict[str, Any]:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        account_id: str = payload.get("sub")
-        if account_id is None:
-            raise credentials_exception
-        token_data = TokenData(account_id=account_id)
-    except (JWTError, ValidationError):
-        raise credentials_exception
-        
+        payload = security.decode_access_token(token)
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None or payload.get("type", "access") != "access":
+        raise _credentials_exception()
+    if revocation_list.is_revoked(payload):
+        raise _credentials_exception()
+    return payload
+
+def _decode_token(token: str) -> TokenData:
+    try:
+        return TokenData(account_id=_decode_claims(token)["sub"])
+    except ValidationError:
+        raise _credentials_exception()
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    """
+    Verified claims of the bearer token.
+    """
+    return _decode_claims(token)
+
+def get_token_account_id(token: str = Depends(oauth2_scheme)) -> str:
+    """
+    Account id from a valid bearer token, without loading the user.
+    For cheap, frequently polled endpoints.
+    """
+    return _decode_token(token).account_id
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> TokenUser:
+    """
+    The caller's account id, role, email and display name from the access
+    token, without a database round trip. Use get_current_user when the
+    endpoint needs the User row or its profiles.
+    """
+    claims = _decode_claims(token)
+    # Tokens issued before role claims existed; the client refreshes or signs in again
+    if "role" not in claims:
+        raise _credentials_exception()
+    try:
+        return TokenUser(
+            account_id=claims["sub"],
+            role=claims["role"],
+            email=claims.get("email"),
+            display_name=claims.get("name")
+        )
+    except ValidationError:
+        raise _credentials_exception()
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    token_data = _decode_token(token)
     user = db.query(User).filter(User.account_id == token_data.account_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Async variant of get_current_user for endpoints on the AsyncSession stack.
+    Relationships are not loaded; only use column attributes of the result.
+    """
+    token_data = _decode_token(token)
+    result = await db.execute(select(User).filter(User.account_id == token_data.account_id))
+    user = result.scalars().first()
+    if user is None:
+        raise _credentials_exception()
     return user
@@ -1,140 +1,265 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import literal, select, union_all
 
-from app.api.dependencies.deps import get_db, get_current_user
+from app.api.dependencies.deps import get_db, get_current_user, get_token_claims
+from app.db.async_session import get_async_db
 from app.core import security
 from app.core.config import settings
+from app.core.redis import (
+    register_login_attempt_async,
+    clear_login_attempts_async,
+    store_refresh_token_async,
+    consume_refresh_token_async,
+    revoke_refresh_token_async,
+)
+from app.core.revocation import revoke_access_token, revoke_account_tokens
 from app.models.user import User, ContributorProfile, FundraiserProfile
-from app.schemas.user import ContributorRegister, FundraiserRegister, Token, User as UserSchema, UserOut, FCMTokenUpdate
+from app.utils.phone import normalize_phone
+from app.schemas.user import (
+    ContributorRegister, FundraiserRegister, Token, User as UserSchema, UserOut, FCMTokenUpdate,
+    RefreshTokenRequest, LogoutRequest
+)
 
 router = APIRouter()
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests right now, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+# Unique indexes that back the registration duplicate checks, matched
+# against the violated constraint / column name
+_DUPLICATE_MESSAGES = (
+    ("email", "User with this email already exists"),
+    ("uname", "Username is already taken"),
+    ("phone", "Phone number is already registered"),
+)
+
+def _duplicate_detail(error: IntegrityError) -> str:
+    # First line only: Postgres appends the offending value on a DETAIL line
+    message = str(error.orig).splitlines()[0]
+    for column, detail in _DUPLICATE_MESSAGES:
+        if column in message:
+            return detail
+    raise error
+
+def _login_lookup(identifier: str):
+    """
+    One statement resolving an email, username or phone number to its account
+    with both profiles loaded. Every branch is an equality lookup on a unique
+    index; an email match wins over a username, a username over a phone.
+    """
+    branches = [
+        select(User.account_id.label("account_id"), literal(1).label("rank")).where(User.email == identifier),
+        select(ContributorProfile.contributor_id, literal(2)).where(ContributorProfile.uname == identifier),
+    ]
+    phone = normalize_phone(identifier)
+    if phone:
+        branches.append(
+            select(ContributorProfile.contributor_id, literal(3)).where(ContributorProfile.phone_normalized == phone)
+        )
+    matches = union_all(*branches).subquery()
+
+    return (
+        select(User)
+        .join(matches, matches.c.account_id == User.account_id)
+        .options(joinedload(User.contributor_profile), joinedload(User.fundraiser_profile))
+        .order_by(matches.c.rank)
+        .limit(1)
+    )
+
+def _display_name(user: User):
+    if user.role == 'fundraiser' and user.fundraiser_profile:
+        return user.fundraiser_profile.company_name
+    if user.role == 'contributor' and user.contributor_profile:
+        return user.contributor_profile.uname
+    return None
+
+async def _issue_tokens(user: User, family: Optional[str] = None) -> dict:
+    """
+    Short-lived access token carrying the claims get_current_principal needs,
+    plus a new refresh token (continuing family when rotating).
+    """
+    display_name = _display_name(user)
+    access_token = security.create_access_token(
+        subject=user.account_id,
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        claims={"role": user.role, "email": user.email, "name": display_name}
+    )
+    refresh_token = security.create_refresh_token()
+    if not await store_refresh_token_async(security.hash_refresh_token(refresh_token), user.account_id, family):
+        refresh_token = None
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+        "role": user.role,
+        "account_id": user.account_id,
+        "email": user.email,
+        "display_name": display_name
+    }
+
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db) 
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     OAuth2 compatible token login, supports Email, Username or Phone (for contributors)
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    
+    attempts = await register_login_attempt_async(form_data.username)
+    if attempts is not None and attempts > settings.LOGIN_RATE_LIMIT_ATTEMPTS:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS)}
+        )
+
+    user = (await db.execute(_login_lookup(form_data.username))).scalars().first()
+
     if not user:
-        user = db.query(User)\
-            .join(ContributorProfile, User.account_id == ContributorProfile.contributor_id)\
-            .filter(
-                or_(
-                    ContributorProfile.uname == form_data.username,
-                    ContributorProfile.phone_number == form_data.username
-                )
-            ).first()
-
-    if not user or not security.verify_password(form_data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="Incorrect email, username, or password")
-    
+
+    try:
+        valid, new_hash = await security.verify_and_update_password_async(form_data.password, user.password_hash)
+    except security.PasswordHasherBusy:
+        raise _hasher_busy()
+    if not valid:
+        raise HTTPException(status_code=400, detail="Incorrect email, username, or password")
+
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-        
 
-    display_name = None
-    if user.role == 'fundraiser' and user.fundraiser_profile:
-        display_name = user.fundraiser_profile.company_name
-    elif user.role == 'contributor' and user.contributor_profile:
-        display_name = user.contributor_profile.uname
-        
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = security.create_access_token(
-        subject=user.account_id, expires_delta=access_token_expires
+    # Stored hash predates the current PASSWORD_BCRYPT_ROUNDS
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    await clear_login_attempts_async(form_data.username)
+    return await _issue_tokens(user)
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    data: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    Each refresh token works once; replaying a used one signs that login out.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"}
     )
-    return {
-        "access_token": access_token, 
-        "token_type": "bearer", 
-        "role": user.role, 
-        "account_id": user.account_id,
-        "email": user.email,
-        "display_name": display_name
-    }
+    token = await consume_refresh_token_async(security.hash_refresh_token(data.refresh_token))
+    if token is None:
+        raise invalid
+    if token["reused"]:
+        # Either the client or whoever copied the token already rotated it
+        await revoke_account_tokens(token["account_id"])
+        raise invalid
+
+    # Claims are re-read so role / profile changes and deactivation apply
+    user = (await db.execute(
+        select(User)
+        .where(User.account_id == token["account_id"])
+        .options(joinedload(User.contributor_profile), joinedload(User.fundraiser_profile))
+    )).scalars().first()
+    if user is None or not user.is_active:
+        raise invalid
+    return await _issue_tokens(user, family=token["family"])
+
+@router.post("/logout")
+async def logout(
+    data: Optional[LogoutRequest] = None,
+    claims: dict = Depends(get_token_claims)
+) -> Any:
+    """
+    Revoke the current access token and, if given, the refresh token.
+    """
+    await revoke_access_token(claims)
+    if data and data.refresh_token:
+        await revoke_refresh_token_async(security.hash_refresh_token(data.refresh_token))
+    return {"status": "ok", "message": "Signed out"}
 
 @router.post("/register/contributor", response_model=UserSchema)
-def register_contributor(
+async def register_contributor(
     data: ContributorRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new contributor with profile. Checks for duplicates.
     """
-    def normalize_phone(phone: str) -> str:
-        p = phone.strip().replace("+", "")
-        if p.startswith("254"):
-            p = p[3:]
-        if p.startswith("0"):
-            p = p[1:]
-        return p
-
-    if db.query(User).filter(User.email == data.email).first():
-        raise HTTPException(status_code=400, detail="User with this email already exists")
-    
-    if db.query(ContributorProfile).filter(ContributorProfile.uname == data.uname).first():
-        raise HTTPException(status_code=400, detail="Username is already taken")
-    
-    norm_phone = normalize_phone(data.phone_number)
-    if db.query(ContributorProfile).filter(ContributorProfile.phone_number.like(f"%{norm_phone}")).first():
-        raise HTTPException(status_code=400, detail="Phone number is already registered")
-    
+    phone_normalized = normalize_phone(data.phone_number)
+    if phone_normalized is None:
+        raise HTTPException(status_code=400, detail="Enter a valid Kenyan phone number")
+
+    try:
+        password_hash = await security.get_password_hash_async(data.password)
+    except security.PasswordHasherBusy:
+        raise _hasher_busy()
+
+    # Duplicate email / username / phone surface as unique violations
     user = User(
         email=data.email,
-        password_hash=security.get_password_hash(data.password),
+        password_hash=password_hash,
         role='contributor',
-        is_active=True
+        is_active=True,
+        contributor_profile=ContributorProfile(
+            uname=data.uname,
+            phone_number=data.phone_number,
+            phone_normalized=phone_normalized,
+            public_key=data.public_key
+        )
     )
     db.add(user)
-    db.flush()
-    
-    profile = ContributorProfile(
-        contributor_id=user.account_id,
-        uname=data.uname,
-        phone_number=data.phone_number,
-        public_key=data.public_key
-    )
-    db.add(profile)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=_duplicate_detail(e))
     return user
 
 @router.post("/register/fundraiser", response_model=UserSchema)
-def register_fundraiser(
+async def register_fundraiser(
     data: FundraiserRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Register a new fundraiser with profile.
     """
-    if db.query(User).filter(User.email == data.email).first():
-        raise HTTPException(status_code=400, detail="User with this email already exists")
-    
+    try:
+        password_hash = await security.get_password_hash_async(data.password)
+    except security.PasswordHasherBusy:
+        raise _hasher_busy()
+
     user = User(
         email=data.email,
-        password_hash=security.get_password_hash(data.password),
+        password_hash=password_hash,
         role='fundraiser',
-        is_active=True
+        is_active=True,
+        fundraiser_profile=FundraiserProfile(
+            company_name=data.company_name,
+            br_number=data.br_number,
+            industry_l1_id=data.industry_l1_id,
+            industry_l2_id=data.industry_l2_id
+        )
     )
     db.add(user)
-    db.flush()
-    
-    profile = FundraiserProfile(
-        fundraiser_id=user.account_id,
-        company_name=data.company_name,
-        br_number=data.br_number,
-        industry_l1_id=data.industry_l1_id,
-        industry_l2_id=data.industry_l2_id
-    )
-    db.add(profile)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=_duplicate_detail(e))
     return user
 
 @router.get("/me", response_model=UserOut)
@@ -1,20 +1,25 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from typing import Any, List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, File, Query, Request, UploadFile
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 import uuid
 import os
 import shutil
 from app.core.cloudinary_upload import upload_image
 
-from app.api.dependencies.deps import get_db, get_current_user
-from app.schemas.campaign import CampaignCreate, CampaignOut, CampaignUpdate, MilestoneOut, CampaignProgress, FundraiserStats, WithdrawalRequest, WithdrawalResult
+from app.api.dependencies.deps import get_db, get_read_db, get_async_read_db, get_current_user, get_current_principal
+from app.schemas.campaign import CampaignCreate, CampaignBulkCreate, CampaignBulkCreateResult, CampaignPlanRequest, CampaignPlanResponse, CampaignOut, CampaignListDelta, CampaignUpdate, MilestoneOut, MilestoneTimelineDelta, CampaignProgress, FundraiserStats, WithdrawalRequest, WithdrawalResult
 from app.models.milestone import Milestone
 from app.models.user import User
+from app.schemas.user import TokenUser
 from app.models.campaign import Campaign
 from app.services.campaign_service import CampaignService
 from app.services.campaign_state_service import CampaignStateService
-from sqlalchemy import func
+from app.core.reference_data import reference_data
+from app.core.response_cache import CachedCampaignRead, mark_campaign_changed
+from app.core.serialization import CAMPAIGN_LIST, CAMPAIGN_LIST_DELTA, json_response
+from sqlalchemy import func, select
 from datetime import datetime
 
 router = APIRouter()
@@ -23,7 +28,7 @@ router = APIRouter()
 def create_campaign(
     campaign_in: CampaignCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Create new campaign.
@@ -47,16 +52,86 @@ def create_campaign(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/my-campaigns", response_model=List[CampaignOut])
-def read_my_campaigns(
+@router.post("/bulk", response_model=CampaignBulkCreateResult)
+def bulk_create_campaigns(
+    bulk_in: CampaignBulkCreate,
     db: Session = Depends(get_db),
+    current_user: TokenUser = Depends(get_current_principal)
+) -> Any:
+    """
+    Create many draft campaigns for the current fundraiser in one request (imports).
+    """
+    if current_user.role != 'fundraiser':
+        raise HTTPException(status_code=403, detail="Only fundraisers can create campaigns")
+
+    try:
+        campaign_ids = CampaignService.bulk_create_campaigns(db, [
+            {
+                "fundraiser_id": current_user.account_id,
+                "title": c.title,
+                "description": c.description,
+                "funding_goal": float(c.funding_goal_f),
+                "duration_months": c.duration_d,
+                "category": c.category,
+                "campaign_type": c.campaign_type_ct,
+                "budget_data": c.budget_data
+            }
+            for c in bulk_in.campaigns
+        ])
+        return {"created": len(campaign_ids), "campaign_ids": campaign_ids}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/plan", response_model=CampaignPlanResponse)
+def plan_campaign(
+    plan_in: CampaignPlanRequest,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
-    Retrieve campaigns created by the current user.
+    Preview phase counts, weights, release amounts and deadlines for a grid of
+    goals, durations and industry categories. Nothing is written.
+    """
+    if current_user.role != 'fundraiser':
+        raise HTTPException(status_code=403, detail="Only fundraisers can plan campaigns")
+    if any(goal <= 0 for goal in plan_in.funding_goals) or any(months <= 0 for months in plan_in.duration_months):
+        raise HTTPException(status_code=400, detail="Funding goals and durations must be positive")
+
+    if plan_in.categories:
+        categories = [(c.industry_l1_id, c.industry_l2_id) for c in plan_in.categories]
+    else:
+        profile = current_user.fundraiser_profile
+        categories = [(profile.industry_l1_id, profile.industry_l2_id) if profile else (None, None)]
+
+    unknown = [
+        c for c in categories
+        if (c[0] and not reference_data.has_l1(c[0], db)) or (c[1] and not reference_data.has_l2(c[1], db))
+    ]
+    if unknown:
+        raise HTTPException(status_code=400, detail="Industry category not found")
+
+    risk_weights = [reference_data.risk_weights(l1, l2, db) for l1, l2 in categories]
+    plans = CampaignService.plan_milestones(risk_weights, plan_in.funding_goals, plan_in.duration_months)
+
+    per_category = len(plan_in.funding_goals) * len(plan_in.duration_months)
+    for k, plan in enumerate(plans):
+        plan["industry_l1_id"], plan["industry_l2_id"] = categories[k // per_category]
+    return {"plans": plans}
+
+@router.get("/my-campaigns", response_model=Union[List[CampaignOut], CampaignListDelta])
+def read_my_campaigns(
+    since_version: Optional[int] = Query(None, ge=0, description="Only campaigns changed after this change_version"),
+    db: Session = Depends(get_db),
+    current_user: TokenUser = Depends(get_current_principal)
+) -> Any:
+    """
+    Retrieve campaigns created by the current user. With since_version, only
+    the campaigns changed since then and the ids of deleted ones.
     """
+    if since_version is not None:
+        return json_response(CAMPAIGN_LIST_DELTA, CampaignService.fundraiser_campaigns_delta(db, current_user.account_id, since_version))
     campaigns = db.query(Campaign).filter(Campaign.fundraiser_id == current_user.account_id).all()
-    return campaigns
+    return json_response(CAMPAIGN_LIST, campaigns)
 
 @router.get("/fundraiser/stats", response_model=FundraiserStats)
 def get_fundraiser_stats(
@@ -112,36 +187,57 @@ def get_fundraiser_stats(
     }
 
 @router.get("/", response_model=List[CampaignOut])
-def read_campaigns(
+async def read_campaigns(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> Any:
     """
     Retrieve campaigns.
     """
-    campaigns = db.query(Campaign).filter(Campaign.status == 'active').offset(skip).limit(limit).all()
-    return campaigns
+    result = await db.execute(
+        select(Campaign)
+        .options(*CampaignService.campaign_out_options())
+        .filter(Campaign.status == 'active')
+        .offset(skip)
+        .limit(limit)
+    )
+    campaigns = result.unique().scalars().all()
+    if campaigns:
+        counts = await db.execute(CampaignService.backers_count_statement(c.campaign_id for c in campaigns))
+        CampaignService.attach_backers_counts(campaigns, counts.all())
+    return json_response(CAMPAIGN_LIST, campaigns)
+
+# The public per-campaign reads below are served from the response cache
+# (app/core/response_cache.py). A miss fills the cache for every reader, so
+# it reads from the primary: a lagging replica could pin a stale body under
+# the new version.
 
 @router.get("/{campaign_id}", response_model=CampaignOut)
 def read_campaign(
     campaign_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
     Get campaign by ID.
     """
+    read = CachedCampaignRead(request, campaign_id, "campaign")
+    cached = read.cached()
+    if cached:
+        return cached
+
     campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).first()
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    return campaign
+    return read.respond(campaign, CampaignOut)
 
 @router.post("/{campaign_id}/cover-image", response_model=CampaignOut)
 async def upload_cover_image(
     campaign_id: UUID,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Upload a cover image for a campaign.
@@ -167,6 +263,7 @@ async def upload_cover_image(
 
     # Update campaign with cloud URL
     campaign.cover_image_url = cloudinary_url
+    mark_campaign_changed(db, campaign_id)
     db.commit()
     db.refresh(campaign)
     
@@ -176,7 +273,7 @@ async def upload_cover_image(
 def launch_campaign(
     campaign_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Launch a draft campaign.
@@ -196,29 +293,47 @@ def launch_campaign(
 
 
 
-@router.get("/{campaign_id}/timeline", response_model=List[MilestoneOut])
+@router.get("/{campaign_id}/timeline", response_model=Union[List[MilestoneOut], MilestoneTimelineDelta])
 def get_campaign_timeline(
     campaign_id: UUID,
+    request: Request,
+    since_version: Optional[int] = Query(None, ge=0, description="Only milestones changed after this change_version"),
     db: Session = Depends(get_db)
 ) -> Any:
     """
-    Get campaign timeline with milestones.
+    Get campaign timeline with milestones. With since_version, only the
+    milestones changed since then and the ids of deleted ones.
     """
+    resource = "timeline" if since_version is None else f"timeline:since:{since_version}"
+    read = CachedCampaignRead(request, campaign_id, resource)
+    cached = read.cached()
+    if cached:
+        return cached
+
     campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).first()
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
+
+    if since_version is not None:
+        return read.respond(CampaignService.timeline_delta(db, campaign_id, since_version), MilestoneTimelineDelta)
     
     # Simple list of milestones with statuses
-    return campaign.milestones
+    return read.respond(campaign.milestones, List[MilestoneOut])
 
 @router.get("/{campaign_id}/progress", response_model=CampaignProgress)
 def get_campaign_progress(
     campaign_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
     Get a summary of campaign progress for dashboard displays.
     """
+    read = CachedCampaignRead(request, campaign_id, "progress")
+    cached = read.cached()
+    if cached:
+        return cached
+
     campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).first()
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
@@ -243,7 +358,7 @@ def get_campaign_progress(
         # More complex logic could check current milestone status
         next_action = f"Complete Milestone {campaign.current_milestone_number}"
 
-    return {
+    return read.respond({
         "status": campaign.status,
         "funding_percentage": funding_pct,
         "total_contributions": campaign.total_contributions,
@@ -253,13 +368,13 @@ def get_campaign_progress(
         "current_milestone_number": campaign.current_milestone_number,
         "next_action_required": next_action,
         "days_remaining": days_rem
-    }
+    }, CampaignProgress)
 
 @router.post("/{campaign_id}/cancel", response_model=CampaignOut)
 def cancel_campaign(
     campaign_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Cancel a campaign (Only allowed for Draft/Pending Review).
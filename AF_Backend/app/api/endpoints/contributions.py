@@ -1,8 +1,10 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
-from app.api.dependencies.deps import get_db, get_current_user
-from app.models.user import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies.deps import get_db, get_async_read_db, get_current_principal
+from app.schemas.user import TokenUser
 from app.schemas.contribution import (
     ContributionCreate, 
     ContributionResponse, 
@@ -15,14 +17,17 @@ from app.models.transaction import Contribution
 from app.models.campaign import Campaign
 from app.models.escrow import EscrowAccount
 from app.services.contribution_service import ContributionService
-from sqlalchemy import func
+from app.core.serialization import CONTRIBUTION_LIST, json_response
+from sqlalchemy import func, select
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.get("/wallet-stats", response_model=ContributorWalletStats)
-def get_contributor_wallet_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_contributor_wallet_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Get detailed wallet stats and history for the contributor.
@@ -31,42 +36,47 @@ def get_contributor_wallet_stats(
         raise HTTPException(status_code=403, detail="Stats only available for contributors")
 
     # 1. Lifetime Invested Funds (All successful pledges)
-    invested_funds = db.query(func.sum(Contribution.amount))\
-        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')\
-        .scalar() or 0
+    invested_funds = (await db.execute(
+        select(func.sum(Contribution.amount))
+        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')
+    )).scalar() or 0
 
     # 2. Available Funds (Safety Net / Escrow Balance)
     # Calculate share of escrow balance based on contributor's percentage share of the campaign
-    contributions = db.query(Contribution, EscrowAccount)\
-        .join(EscrowAccount, Contribution.campaign_id == EscrowAccount.campaign_id)\
-        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')\
-        .all()
+    contributions = (await db.execute(
+        select(Contribution, EscrowAccount, Campaign.title)
+        .join(EscrowAccount, Contribution.campaign_id == EscrowAccount.campaign_id)
+        .outerjoin(Campaign, Contribution.campaign_id == Campaign.campaign_id)
+        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')
+    )).all()
     
     available_funds = 0
     ledger_entries = []
-    print(f"[DEBUG] Wallet Stats for {current_user.account_id}: found {len(contributions)} contribution segments")
-    for contr, escrow in contributions:
+    logger.debug("Wallet stats for %s: %s contribution segments", current_user.account_id, len(contributions))
+    for contr, escrow, campaign_title in contributions:
         # Calculate current share of the escrow balance
         if escrow.total_contributions > 0:
             share_percentage = float(contr.amount) / float(escrow.total_contributions)
             user_available_share = float(escrow.balance) * share_percentage
             available_funds += user_available_share
-            print(f"  - Segment: Amt={contr.amount}, EscrowBal={escrow.balance}, TotalContr={escrow.total_contributions}, Share={share_percentage}, UserShare={user_available_share}")
+            logger.debug(
+                "Wallet segment: amount=%s escrow_balance=%s escrow_total=%s share=%s user_share=%s",
+                contr.amount, escrow.balance, escrow.total_contributions, share_percentage, user_available_share
+            )
         else:
-            print(f"  - Warning: escrow {escrow.escrow_id} has 0 total_contributions")
+            logger.warning(f"Escrow {escrow.escrow_id} has 0 total_contributions")
         
         # Add to ledger
-        campaign = db.query(Campaign).filter(Campaign.campaign_id == contr.campaign_id).first()
         ledger_entries.append({
             "id": contr.contribution_id,
-            "campaign_title": campaign.title if campaign else "Unknown",
+            "campaign_title": campaign_title or "Unknown",
             "amount": contr.amount,
             "type": "contribution",
             "status": contr.status,
             "date": contr.created_at
         })
 
-    print(f"[DEBUG] Wallet Stats Final: Available={available_funds}, Invested={invested_funds}")
+    logger.debug("Wallet stats final: available=%s invested=%s", available_funds, invested_funds)
     return {
         "available_funds": available_funds,
         "invested_funds": invested_funds,
@@ -74,9 +84,9 @@ def get_contributor_wallet_stats(
     }
 
 @router.get("/stats", response_model=ContributorStats)
-def get_contributor_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_contributor_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Get portfolio stats for the current contributor.
@@ -84,17 +94,17 @@ def get_contributor_stats(
     if current_user.role != 'contributor':
         raise HTTPException(status_code=403, detail="Stats only available for contributors")
 
-    # Aggregate total portfolio value
-    total_value = db.query(func.sum(Contribution.amount))\
-        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')\
-        .scalar() or 0
+    # Aggregate total portfolio value and count unique active campaigns invested in
+    row = (await db.execute(
+        select(
+            func.sum(Contribution.amount),
+            func.count(func.distinct(Contribution.campaign_id))
+        ).filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')
+    )).one()
+    total_value = row[0] or 0
+    active_count = row[1] or 0
 
-    # Count unique active campaigns invested in
-    active_count = db.query(func.count(func.distinct(Contribution.campaign_id)))\
-        .filter(Contribution.contributor_id == current_user.account_id, Contribution.status == 'completed')\
-        .scalar() or 0
-
-    print(f"[DEBUG] Stats for {current_user.account_id}: Value={total_value}, Count={active_count}")
+    logger.debug("Stats for %s: value=%s count=%s", current_user.account_id, total_value, active_count)
 
     return {
         "total_portfolio_value": total_value,
@@ -105,11 +115,13 @@ def get_contributor_stats(
 def create_contribution(
     contribution_in: ContributionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=60)
 ) -> Any:
     """
     Pledge a contribution to a campaign.
     Only users with 'contributor' role can perform this action.
+    Retrying with the same Idempotency-Key header returns the original pledge.
     """
     if current_user.role != 'contributor':
         raise HTTPException(
@@ -122,7 +134,8 @@ def create_contribution(
             db=db,
             campaign_id=contribution_in.campaign_id,
             contributor_id=current_user.account_id,
-            amount=float(contribution_in.amount)
+            amount=float(contribution_in.amount),
+            idempotency_key=f"{current_user.account_id}:{idempotency_key}" if idempotency_key else None
         )
         return result
     except ValueError as e:
@@ -131,27 +144,29 @@ def create_contribution(
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 @router.get("/my-contributions", response_model=List[UserContributionOut])
-def get_my_contributions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_my_contributions(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Get all contributions made by the current user.
     """
-    contributions = db.query(Contribution).join(Campaign).filter(
-        Contribution.contributor_id == current_user.account_id
-    ).all()
+    rows = (await db.execute(
+        select(Contribution, Campaign.title, Campaign.status)
+        .join(Campaign, Contribution.campaign_id == Campaign.campaign_id)
+        .filter(Contribution.contributor_id == current_user.account_id)
+    )).all()
     
     result = []
-    for c in contributions:
+    for c, campaign_title, campaign_status in rows:
         result.append({
             "contribution_id": c.contribution_id,
             "campaign_id": c.campaign_id,
-            "campaign_title": c.campaign.title,
-            "campaign_status": c.campaign.status,
+            "campaign_title": campaign_title,
+            "campaign_status": campaign_status,
             "amount": c.amount,
             "status": c.status,
             "created_at": c.created_at
         })
     
-    return result
+    return json_response(CONTRIBUTION_LIST, result)
@@ -1,16 +1,17 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from uuid import UUID
 import os
 from app.core.cloudinary_upload import upload_image
 
-from app.api.dependencies.deps import get_db, get_current_user
-from app.models.user import User
+from app.api.dependencies.deps import get_db, get_current_principal
+from app.schemas.user import TokenUser
 from app.models.milestone import Milestone
 from app.models.milestone_evidence import MilestoneEvidence
 from app.services.milestone_workflow_service import MilestoneWorkflowService
-from app.schemas.campaign import MilestoneOut
+from app.schemas.campaign import MilestoneOut, MilestoneEvidenceOut
+from app.core.response_cache import CachedCampaignRead, milestone_campaign, remember_milestone_campaign
 
 from app.core.socket_manager import emit_milestone_update
 
@@ -41,7 +42,7 @@ async def submit_evidence(
     description: str = Form(...),
     file: Optional[UploadFile] = File(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Fundraiser submits evidence for a milestone.
@@ -81,7 +82,7 @@ async def submit_evidence(
 def start_voting(
     milestone_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Fundraiser starts the voting period for a milestone.
@@ -133,16 +134,27 @@ def get_vote_status(
         "outcome": milestone.vote_result.outcome
     }
 
-@router.get("/{milestone_id}/evidence", response_model=List[Any])
+@router.get("/{milestone_id}/evidence", response_model=List[MilestoneEvidenceOut])
 def get_milestone_evidence(
     milestone_id: UUID,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> Any:
     """
     Get all evidence submitted for a milestone.
+    Cached with the milestone's campaign (app/core/response_cache.py).
     """
-    milestone = db.query(Milestone).filter(Milestone.milestone_id == milestone_id).first()
-    if not milestone:
-        raise HTTPException(status_code=404, detail="Milestone not found")
-    
-    return milestone.evidence
+    campaign_id = milestone_campaign(milestone_id)
+    if campaign_id is None:
+        campaign_id = db.query(Milestone.campaign_id).filter(Milestone.milestone_id == milestone_id).scalar()
+        if campaign_id is None:
+            raise HTTPException(status_code=404, detail="Milestone not found")
+        remember_milestone_campaign(milestone_id, campaign_id)
+
+    read = CachedCampaignRead(request, campaign_id, f"evidence:{milestone_id}")
+    cached = read.cached()
+    if cached:
+        return cached
+
+    evidence = db.query(MilestoneEvidence).filter(MilestoneEvidence.milestone_id == milestone_id).all()
+    return read.respond(evidence, List[MilestoneEvidenceOut])
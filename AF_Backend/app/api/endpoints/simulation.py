@@ -5,17 +5,12 @@ from app.models.campaign import Campaign
 from app.models.milestone import Milestone
 from app.services.milestone_workflow_service import MilestoneWorkflowService
 from app.services.escrow_service import EscrowService
-from app.core.socket_manager import sio
+from app.core.socket_manager import emit_milestone_update
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
-async def emit_milestone_update(campaign_id: str, data: dict):
-    """Notify clients of a state change via Socket.io"""
-    await sio.emit("milestone_update", data, room=campaign_id)
-    await sio.emit("milestone_update", data)
-
 @router.post("/{id}/advance")
 async def advance_campaign_simulation(
     id: uuid.UUID,
@@ -1,17 +1,22 @@
+import logging
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case, or_, and_
 from uuid import UUID
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.api.dependencies.deps import get_db, get_current_user
-from app.models.user import User
+from app.api.dependencies.deps import get_db, get_async_read_db, get_current_principal
+from app.schemas.user import TokenUser
 from app.models.vote import VoteSubmission, VoteToken
 from app.models.milestone import Milestone
 from app.services.voting_service import VotingService
 from app.services.escrow_service import EscrowService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class MilestonePending(BaseModel):
@@ -57,7 +62,7 @@ def generate_vote_token(
 async def submit_vote(
     request: VoteRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Submit a vote with signature verification.
@@ -79,7 +84,7 @@ async def submit_vote(
 def waive_votes(
     request: WaiverRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Waive voting right (automatic YES).
@@ -115,26 +120,37 @@ def tally_votes(
     }
 
 @router.get("/status/{milestone_id}")
-def get_vote_status(
+async def get_vote_status(
     milestone_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> Any:
     """
     Get live vote counts for a milestone (read-only, does not tally or finalize).
     For fundraiser visibility during voting_open phase.
     """
-    milestone = db.query(Milestone).filter(Milestone.milestone_id == milestone_id).first()
+    milestone = (await db.execute(
+        select(Milestone).filter(Milestone.milestone_id == milestone_id)
+    )).scalars().first()
     if not milestone:
-        print(f"DEBUG: Milestone {milestone_id} NOT FOUND")
+        logger.debug("Vote status: milestone %s not found", milestone_id)
         raise HTTPException(status_code=404, detail="Milestone not found")
 
-    votes = db.query(VoteSubmission).filter(VoteSubmission.milestone_id == milestone_id).all()
-    total_voters = db.query(VoteToken).filter(VoteToken.campaign_id == milestone.campaign_id).count()
-    
-    print(f"DEBUG: Status for M:{milestone_id} - Votes:{len(votes)}, Tokens:{total_voters}")
-    yes_votes = sum(1 for v in votes if str(v.vote_value).lower() == 'yes' or v.is_waived is True)
-    no_votes = sum(1 for v in votes if str(v.vote_value).lower() == 'no' and not v.is_waived)
-    votes_cast = len(votes)
+    # Count in SQL instead of loading every submission
+    is_yes = or_(VoteSubmission.vote_value == 'yes', VoteSubmission.is_waived.is_(True))
+    is_no = and_(VoteSubmission.vote_value == 'no', or_(VoteSubmission.is_waived.is_(False), VoteSubmission.is_waived.is_(None)))
+    counts = (await db.execute(
+        select(
+            func.count(VoteSubmission.vote_id),
+            func.coalesce(func.sum(case((is_yes, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((is_no, 1), else_=0)), 0),
+        ).filter(VoteSubmission.milestone_id == milestone_id)
+    )).one()
+    total_voters = (await db.execute(
+        select(func.count(VoteToken.token_id)).filter(VoteToken.campaign_id == milestone.campaign_id)
+    )).scalar()
+
+    votes_cast, yes_votes, no_votes = int(counts[0]), int(counts[1]), int(counts[2])
+    logger.debug("Vote status for %s: %s votes, %s tokens", milestone_id, votes_cast, total_voters)
     yes_pct = 0.0
     if votes_cast > 0:
         yes_pct = round(float(yes_votes) / votes_cast * 100, 1)
@@ -154,7 +170,7 @@ def get_vote_status(
 @router.get("/pending", response_model=PendingVoteOut)
 def get_pending_votes(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenUser = Depends(get_current_principal)
 ) -> Any:
     """
     Get all milestones awaiting vote for the current contributor.
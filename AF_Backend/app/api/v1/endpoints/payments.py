@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import logging
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
+from app.core.config import settings
+from app.core.redis import enqueue_mpesa_callback, get_payment_status_async
 from app.services.payment_service import PaymentService
-from app.api.dependencies.deps import get_current_user
+from app.api.dependencies.deps import get_current_user, get_token_account_id
 from app.models.user import User
 import uuid
 from typing import Optional
-from app.core.socket_manager import sio
+from app.core.socket_manager import emit_payment_received
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -22,6 +29,14 @@ class STKPushResponse(BaseModel):
     checkout_request_id: str
     message: str
 
+class PaymentStatusResponse(BaseModel):
+    checkout_request_id: str
+    status: str  # pending, success, failed or expired
+    campaign_id: Optional[str] = None
+    amount: Optional[float] = None
+    contribution_id: Optional[str] = None
+    message: Optional[str] = None
+
 class CallbackRequest(BaseModel):
     """
     Mimics the structure of Safaricom's callback payload.
@@ -49,7 +64,9 @@ def initiate_stk_push(
         if not phone_number:
             if not current_user.contributor_profile or not current_user.contributor_profile.phone_number:
                 raise ValueError("Phone number not found. Please provide one or update your profile.")
-            phone_number = current_user.contributor_profile.phone_number
+            # M-Pesa wants 254XXXXXXXXX; profiles store whatever format was typed
+            profile = current_user.contributor_profile
+            phone_number = profile.phone_normalized or profile.phone_number
 
         result = PaymentService.initiate_stk_push(
             db=db,
@@ -67,54 +84,80 @@ def initiate_stk_push(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Payment initiation failed: {str(e)}")
 
 @router.post("/callback", status_code=status.HTTP_200_OK)
-async def mpesa_callback(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+async def mpesa_callback(request: Request):
     """
     Handle M-Pesa STK Push callback.
     
     This endpoint is called by Safaricom (or our simulator) after the user enters their PIN.
     It's a public endpoint (no authentication) because Safaricom doesn't have a login token.
     
+    The raw payload is appended to the callback stream and processed by the
+    ingestion workers (app.tasks.callback_ingestion), so Safaricom gets an
+    answer in milliseconds. If the queue is disabled or Redis is down the
+    callback is processed inline as before.
+    
     In production, we'll add IP whitelisting to only accept requests from Safaricom's servers.
     """
     try:
         # Parse the callback payload flexibly
         data = await request.json()
-        print(f"[DEBUG] MPESA Callback Payload: {data}")
-        
-        stk_callback = data.get("Body", {}).get("stkCallback", {})
-        checkout_request_id = stk_callback.get("CheckoutRequestID")
-        result_code = stk_callback.get("ResultCode", -1)
-        result_desc = stk_callback.get("ResultDesc", "Unknown error")
+        logger.debug("M-Pesa callback payload: %s", data)
         
-        if not checkout_request_id:
-            print("[ERROR] MPESA Callback: Missing CheckoutRequestID")
+        callback = PaymentService.parse_stk_callback(data)
+        if not callback["checkout_request_id"]:
+            logger.warning("M-Pesa callback missing CheckoutRequestID")
             return {"ResultCode": 1, "ResultDesc": "Missing CheckoutRequestID"}
+
+        if settings.MPESA_CALLBACK_WORKERS > 0 and await enqueue_mpesa_callback(data):
+            return {"ResultCode": 0, "ResultDesc": "Callback accepted"}
         
         # Process the callback
-        result = PaymentService.process_stk_callback(
-            db=db,
-            checkout_request_id=checkout_request_id,
-            result_code=result_code,
-            result_desc=result_desc
-        )
+        result = await run_in_threadpool(_process_callback_inline, callback)
         
         # If successful, emit to websocket so the frontend auto-refreshes
         if result.get("status") == "success":
             campaign_id = result.get("campaign_id")
             amount = result.get("amount")
             if campaign_id:
-                # Emit specifically to users viewing this campaign
-                await sio.emit("payment_received", {"campaign_id": campaign_id, "amount": amount}, room=campaign_id)
-                # Global broadcast just in case
-                await sio.emit("payment_received", {"campaign_id": campaign_id, "amount": amount})
+                # Emit only to users viewing this campaign
+                await emit_payment_received(campaign_id, {"campaign_id": campaign_id, "amount": amount})
         
         return {"ResultCode": 0, "ResultDesc": "Callback processed successfully"}
     
     except Exception as e:
         # Always return 200 to Safaricom to prevent retries
-        # Log the error internally
-        import traceback; traceback.print_exc()
+        logger.exception("M-Pesa callback processing failed")
         return {"ResultCode": 1, "ResultDesc": f"Processing failed: {str(e)}"}
+
+def _process_callback_inline(callback: dict) -> dict:
+    db = SessionLocal()
+    try:
+        return PaymentService.process_stk_callback(db=db, **callback)
+    finally:
+        db.close()
+
+@router.get("/{checkout_request_id}", response_model=PaymentStatusResponse)
+async def get_payment_status(
+    checkout_request_id: str,
+    wait: int = Query(
+        0, ge=0, le=settings.PAYMENT_STATUS_MAX_WAIT_SECONDS,
+        description="Seconds to hold the request while the payment is still pending"
+    ),
+    account_id: str = Depends(get_token_account_id)
+):
+    """
+    Status of an STK push started by the current user.
+    
+    With wait > 0 this long-polls: it answers as soon as the payment leaves
+    'pending', or after wait seconds. Reads only Redis, never the database.
+    """
+    deadline = asyncio.get_running_loop().time() + wait
+    while True:
+        record = await get_payment_status_async(checkout_request_id)
+        if not record or record.get("contributor_id") != str(account_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
+        if record["status"] != "pending" or asyncio.get_running_loop().time() >= deadline:
+            return PaymentStatusResponse(checkout_request_id=checkout_request_id, **{
+                k: record.get(k) for k in ("status", "campaign_id", "amount", "contribution_id", "message")
+            })
+        await asyncio.sleep(settings.PAYMENT_STATUS_POLL_INTERVAL_MS / 1000)
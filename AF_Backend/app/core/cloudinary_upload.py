@@ -1,6 +1,7 @@
 import cloudinary
 import cloudinary.uploader
 from app.core.config import settings
+from app.core.instrumentation import outbound
 
 
 def configure_cloudinary():
@@ -33,5 +34,6 @@ def upload_image(file_bytes: bytes, folder: str, public_id: str = None) -> str:
     if public_id:
         upload_options["public_id"] = public_id
 
-    result = cloudinary.uploader.upload(file_bytes, **upload_options)
+    with outbound("cloudinary"):
+        result = cloudinary.uploader.upload(file_bytes, **upload_options)
     return result["secure_url"]
@@ -0,0 +1,185 @@
+"""
+Negotiated response compression and payload size metrics.
+
+Mobile clients fetch campaign lists, pending votes and wallet ledgers over
+cellular links, so JSON (and other text) bodies of at least
+COMPRESSION_MINIMUM_BYTES are compressed with brotli when the client accepts
+it and the brotli package is installed, otherwise with gzip. Images and other
+already-compressed uploads are passed through untouched.
+
+Every response's body size is recorded per route, before and after
+compression, in the histograms in app.core.metrics.
+"""
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RESPONSE_BODY_BYTES, RESPONSE_WIRE_BYTES
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into {coding: q}.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The coding to use for a request, preferring brotli when q values tie.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route's path with its parameters put back, e.g.
+    /api/v1/campaigns/{campaign_id}/timeline, to keep metric labels bounded.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    app_root_path = scope.get("app_root_path")
+    if app_root_path is not None and scope.get("root_path", "") != app_root_path:
+        # Inside a Mount (static files): one label per mount
+        return scope["root_path"][len(app_root_path):] + "/{path}"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        value = str(value)
+        if value:
+            path = path.replace(value, "{" + name + "}", 1)
+    return path
+
+
+class _Encoder:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress = self._compressor.process
+            self.finish = self._compressor.finish
+        else:
+            # wbits 31: gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress = self._compressor.compress
+            self.finish = self._compressor.flush
+
+
+class CompressionMiddleware:
+    """
+    Same shape as Starlette's GZipMiddleware, with brotli negotiation,
+    a content-type filter and size metrics.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Message = {}
+        self.started = False
+        self.encoder: Optional[_Encoder] = None
+        self.body_bytes = 0
+        self.wire_bytes = 0
+
+    @staticmethod
+    def _compressible(headers: Headers) -> bool:
+        return "content-encoding" not in headers and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+    async def _send_body(self, message: Message):
+        self.wire_bytes += len(message.get("body", b""))
+        await self._send(message)
+        if not message.get("more_body", False):
+            endpoint = route_template(self.scope)
+            RESPONSE_BODY_BYTES.labels(self.scope["method"], endpoint).observe(self.body_bytes)
+            RESPONSE_WIRE_BYTES.labels(self.scope["method"], endpoint, self.encoder.encoding if self.encoder else "identity").observe(self.wire_bytes)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Held until the first body chunk decides the headers
+            self.initial_message = message
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.body_bytes += len(body)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            if self._compressible(headers):
+                # Whether or not this one is compressed, caches must key on Accept-Encoding
+                headers.add_vary_header("Accept-Encoding")
+                if self.encoding is not None and (more_body or len(body) >= self.middleware.minimum_size):
+                    self.encoder = _Encoder(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+                    headers["Content-Encoding"] = self.encoding
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        # Different bytes than the identity body: only weakly equal
+                        headers["ETag"] = "W/" + etag
+                    body = self.encoder.compress(body)
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        body += self.encoder.finish()
+                        headers["Content-Length"] = str(len(body))
+                    message["body"] = body
+            await self._send(self.initial_message)
+            await self._send_body(message)
+            return
+
+        if self.encoder is not None:
+            body = self.encoder.compress(body)
+            if not more_body:
+                body += self.encoder.finish()
+            message["body"] = body
+        await self._send_body(message)
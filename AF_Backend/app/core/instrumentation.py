@@ -0,0 +1,117 @@
+"""
+Per-request performance instrumentation.
+
+RequestInstrumentationMiddleware gives every HTTP request a RequestStats in
+a context variable. The database engines (app.db.session.instrument_engine)
+add each statement's count and time to it; outbound calls to Daraja, FCM
+and Cloudinary are timed with outbound(). Sync endpoints run in the thread
+pool with a copy of the context, so they update the same object.
+
+When the request finishes, its latency, query count and DB time are observed
+per route in the histograms in app.core.metrics (response sizes are recorded
+by app.core.compression). A request that runs more than
+REQUEST_QUERY_WARN_THRESHOLD statements is counted and logged, which makes
+N+1 regressions show up as soon as they ship.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.compression import route_template
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "outbound_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.outbound_seconds: Dict[str, float] = {}
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """
+    Stats of the request being handled, or None outside a request
+    (scheduler jobs, callback workers).
+    """
+    return _current.get()
+
+
+def record_query(elapsed_seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed_seconds
+
+
+@contextmanager
+def outbound(service: str):
+    """
+    Time a call to an external service:
+
+        with outbound("daraja"):
+            response = requests.post(...)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.OUTBOUND_CALL_SECONDS.labels(service).observe(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.outbound_seconds[service] = stats.outbound_seconds.get(service, 0.0) + elapsed
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Outermost middleware, so its latency covers every other layer.
+    """
+
+    def __init__(self, app: ASGIApp, query_warn_threshold: int = 20) -> None:
+        self.app = app
+        self.query_warn_threshold = query_warn_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            self._observe(scope, stats, status_code, time.perf_counter() - start)
+
+    def _observe(self, scope: Scope, stats: RequestStats, status_code: int, elapsed: float):
+        method, endpoint = scope["method"], route_template(scope)
+        metrics.HTTP_REQUEST_SECONDS.labels(method, endpoint, str(status_code)).observe(elapsed)
+        metrics.HTTP_REQUEST_DB_QUERIES.labels(method, endpoint).observe(stats.queries)
+        metrics.HTTP_REQUEST_DB_SECONDS.labels(method, endpoint).observe(stats.db_seconds)
+        if stats.queries > self.query_warn_threshold:
+            metrics.HTTP_QUERY_HEAVY_REQUESTS.labels(method, endpoint).inc()
+            logger.warning(
+                f"{method} {endpoint} ran {stats.queries} queries "
+                f"({stats.db_seconds * 1000:.0f}ms DB, {elapsed * 1000:.0f}ms total)"
+            )
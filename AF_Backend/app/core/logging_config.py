@@ -0,0 +1,146 @@
+"""
+Application logging.
+
+Every logger writes through one QueueHandler on the root logger: the calling
+thread (often a request) only formats the message and puts the record on an
+in-memory queue, and a QueueListener thread does the stream and file I/O.
+Records are written one JSON object per line (LOG_FORMAT="text" for the
+human-readable format), with any `extra=` fields as keys:
+
+    logger.info("Vote submitted", extra={"milestone_id": str(milestone_id)})
+
+LOG_LEVEL sets the root level and LOG_LEVELS overrides it per module, e.g.
+"app.services.voting_service=DEBUG,httpx=WARNING". Scheduler and callback
+worker logs ("automation.*") also go to AUTOMATION_LOG_FILE.
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return orjson.dumps(entry, default=str).decode()
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    Queues records with the message merged and the traceback rendered, but
+    keeps the traceback out of the message so JsonFormatter can put it in its
+    own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _NamePrefixFilter(logging.Filter):
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.name == self.prefix or record.name.startswith(self.prefix + ".")
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    "app.services=DEBUG, httpx=WARNING" -> {"app.services": 10, "httpx": 30}
+    """
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def configure_logging(
+    level: str = None, levels: str = None, log_format: str = None, automation_log_file: str = None,
+):
+    """
+    Install the queue handler and start the listener thread. Safe to call more
+    than once; later calls replace the previous configuration.
+    """
+    global _listener
+    level = level if level is not None else settings.LOG_LEVEL
+    levels = levels if levels is not None else settings.LOG_LEVELS
+    log_format = log_format if log_format is not None else settings.LOG_FORMAT
+    automation_log_file = automation_log_file if automation_log_file is not None else settings.AUTOMATION_LOG_FILE
+
+    stop_logging()
+    formatter = JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers = []
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    handlers.append(stream_handler)
+    if automation_log_file:
+        os.makedirs(os.path.dirname(automation_log_file) or ".", exist_ok=True)
+        file_handler = logging.FileHandler(automation_log_file)
+        file_handler.setFormatter(formatter)
+        file_handler.addFilter(_NamePrefixFilter("automation"))
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, _RecordQueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(_RecordQueueHandler(log_queue))
+    root.setLevel(level.upper())
+    for name, module_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """
+    Write out queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,105 @@
+"""
+Prometheus metrics shared across the application.
+Scraped from the /metrics endpoint registered in app.main.
+"""
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+# Database connection pool
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured pool size plus max overflow",
+    ["pool"],
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Statements slower than DB_SLOW_QUERY_MS",
+    ["pool"],
+)
+
+# M-Pesa callback ingestion
+MPESA_CALLBACK_QUEUE_LAG = Histogram(
+    "mpesa_callback_queue_lag_seconds",
+    "Time from a callback being enqueued to a worker picking it up",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+MPESA_CALLBACK_BATCH_SIZE = Histogram(
+    "mpesa_callback_batch_size",
+    "Callbacks processed per worker batch",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250),
+)
+MPESA_CALLBACK_PENDING = Gauge(
+    "mpesa_callback_pending",
+    "Callbacks delivered to a worker but not yet acknowledged",
+)
+MPESA_CALLBACKS_PROCESSED = Counter(
+    "mpesa_callbacks_processed_total",
+    "Callbacks processed by the ingestion workers",
+    ["outcome"],
+)
+
+# Per-request instrumentation (app/core/instrumentation.py)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency per route, including every middleware",
+    ["method", "endpoint", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    ["method", "endpoint"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request",
+    ["method", "endpoint"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+HTTP_QUERY_HEAVY_REQUESTS = Counter(
+    "http_query_heavy_requests_total",
+    "Requests that ran more than REQUEST_QUERY_WARN_THRESHOLD statements",
+    ["method", "endpoint"],
+)
+OUTBOUND_CALL_SECONDS = Histogram(
+    "outbound_call_duration_seconds",
+    "Calls to external services (Daraja, FCM, Cloudinary)",
+    ["service"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# HTTP response payloads (app/core/compression.py)
+_PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+RESPONSE_BODY_BYTES = Histogram(
+    "http_response_body_bytes",
+    "Response body size before compression",
+    ["method", "endpoint"],
+    buckets=_PAYLOAD_BUCKETS,
+)
+RESPONSE_WIRE_BYTES = Histogram(
+    "http_response_wire_bytes",
+    "Response body size as sent, after any compression",
+    ["method", "endpoint", "encoding"],
+    buckets=_PAYLOAD_BUCKETS,
+)
+
+
+def render_latest():
+    """Return the current metrics payload and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
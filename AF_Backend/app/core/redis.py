@@ -1,17 +1,36 @@
 import redis
+from redis import asyncio as aioredis
 from app.core.config import settings
 import json
-from typing import Optional, Dict, Any
+from functools import lru_cache
+import time
+from typing import Optional, Dict, Any, List, Tuple, Union
+import uuid
+import logging
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
 def get_redis_client() -> redis.Redis:
     """
-    Get a Redis client instance connected to the configured Redis server.
+    Get the shared Redis client connected to the configured Redis server.
+    The client owns a connection pool, so it is created once per process.
     """
     return redis.from_url(
         settings.REDIS_URL,
         decode_responses=True  # Automatically decode bytes to strings
     )
 
+@lru_cache(maxsize=1)
+def get_async_redis_client() -> aioredis.Redis:
+    """
+    Shared asyncio Redis client for async endpoints and dependencies.
+    """
+    return aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# STK prompts time out on the handset well before this
+STK_SESSION_TTL_SECONDS = 600
+
 def save_stk_session(checkout_id: str, session_data: Dict[str, Any]) -> bool:
     """
     Save STK Push session data to Redis with a 10-minute TTL.
@@ -28,10 +47,10 @@ def save_stk_session(checkout_id: str, session_data: Dict[str, Any]) -> bool:
         key = f"stk:{checkout_id}"
         value = json.dumps(session_data)
         # Set with 600 second (10 minute) expiration
-        client.setex(key, 600, value)
+        client.setex(key, STK_SESSION_TTL_SECONDS, value)
         return True
     except Exception as e:
-        print(f"Error saving STK session: {e}")
+        logger.warning(f"Error saving STK session: {e}")
         return False
 
 def get_stk_session(checkout_id: str) -> Optional[Dict[str, Any]]:
@@ -52,7 +71,7 @@ def get_stk_session(checkout_id: str) -> Optional[Dict[str, Any]]:
             return json.loads(value)
         return None
     except Exception as e:
-        print(f"Error retrieving STK session: {e}")
+        logger.warning(f"Error retrieving STK session: {e}")
         return None
 
 def delete_stk_session(checkout_id: str) -> bool:
@@ -71,5 +90,402 @@ def delete_stk_session(checkout_id: str) -> bool:
         client.delete(key)
         return True
     except Exception as e:
-        print(f"Error deleting STK session: {e}")
+        logger.warning(f"Error deleting STK session: {e}")
+        return False
+
+def get_stk_sessions(checkout_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Retrieve several STK Push sessions in one round trip.
+    
+    Returns:
+        Mapping of checkout id to session data (None if expired or not found)
+    """
+    if not checkout_ids:
+        return {}
+    try:
+        values = get_redis_client().mget([f"stk:{checkout_id}" for checkout_id in checkout_ids])
+        return {
+            checkout_id: json.loads(value) if value else None
+            for checkout_id, value in zip(checkout_ids, values)
+        }
+    except Exception as e:
+        logger.warning(f"Error retrieving STK sessions: {e}")
+        return {checkout_id: None for checkout_id in checkout_ids}
+
+# pending -> success | failed | expired; terminal states are never overwritten
+_SET_PAYMENT_STATUS_LUA = """
+local current = redis.call('GET', KEYS[1])
+local record = {}
+if current then
+    record = cjson.decode(current)
+    if record['status'] ~= 'pending' then
+        return 0
+    end
+end
+for k, v in pairs(cjson.decode(ARGV[1])) do
+    record[k] = v
+end
+redis.call('SET', KEYS[1], cjson.encode(record), 'EX', ARGV[2])
+return 1
+"""
+
+def _payment_status_key(checkout_id: str) -> str:
+    return f"stk_status:{checkout_id}"
+
+def set_payment_status(checkout_id: str, status: str, **fields: Any) -> bool:
+    """
+    Record the state of an STK push for GET /payments/{checkout_request_id}.
+    
+    Args:
+        checkout_id: The CheckoutRequestID from Safaricom
+        status: pending, success, failed or expired
+        fields: Extra JSON-serialisable details merged into the record
+    
+    Returns:
+        True if the record changed, False if it was already final or Redis failed
+    """
+    try:
+        client = get_redis_client()
+        update = {"status": status, "updated_at": time.time(), **fields}
+        changed = client.eval(
+            _SET_PAYMENT_STATUS_LUA, 1, _payment_status_key(checkout_id),
+            json.dumps(update, default=str), settings.PAYMENT_STATUS_TTL_SECONDS
+        )
+        return bool(changed)
+    except Exception as e:
+        logger.warning(f"Error saving payment status: {e}")
+        return False
+
+async def get_payment_status_async(checkout_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Current STK push status record. A pending record older than the STK
+    session is reported as expired.
+    """
+    try:
+        value = await get_async_redis_client().get(_payment_status_key(checkout_id))
+    except Exception as e:
+        logger.warning(f"Error retrieving payment status: {e}")
+        return None
+    if not value:
+        return None
+
+    record = json.loads(value)
+    if record["status"] == "pending" and time.time() - record.get("created_at", 0) > STK_SESSION_TTL_SECONDS:
+        record["status"] = "expired"
+    return record
+
+async def enqueue_mpesa_callback(payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Append a raw M-Pesa callback to the ingestion stream.
+    
+    Returns:
+        The stream entry id, or None if Redis is unavailable
+    """
+    try:
+        return await get_async_redis_client().xadd(
+            settings.MPESA_CALLBACK_STREAM,
+            {"payload": json.dumps(payload)},
+            maxlen=settings.MPESA_CALLBACK_STREAM_MAXLEN,
+            approximate=True
+        )
+    except Exception as e:
+        logger.warning(f"Error enqueueing M-Pesa callback: {e}")
+        return None
+
+def _primary_pin_key(account_id: Union[str, uuid.UUID]) -> str:
+    return f"rw_pin:{account_id}"
+
+def pin_to_primary(account_id: Union[str, uuid.UUID]) -> bool:
+    """
+    Route this account's reads to the primary for READ_YOUR_WRITES_SECONDS
+    after it wrote, so replica lag never hides its own changes.
+    """
+    try:
+        client = get_redis_client()
+        client.setex(_primary_pin_key(account_id), settings.READ_YOUR_WRITES_SECONDS, 1)
+        return True
+    except Exception as e:
+        logger.warning(f"Error pinning {account_id} to primary: {e}")
+        return False
+
+async def pin_to_primary_async(account_id: Union[str, uuid.UUID]) -> bool:
+    """
+    Async variant of pin_to_primary.
+    """
+    try:
+        await get_async_redis_client().setex(_primary_pin_key(account_id), settings.READ_YOUR_WRITES_SECONDS, 1)
+        return True
+    except Exception as e:
+        logger.warning(f"Error pinning {account_id} to primary: {e}")
+        return False
+
+def is_pinned_to_primary(account_id: Union[str, uuid.UUID]) -> bool:
+    """
+    Check the read-your-writes pin. Fails safe (pinned) if Redis is unavailable.
+    """
+    try:
+        return bool(get_redis_client().exists(_primary_pin_key(account_id)))
+    except Exception:
+        return True
+
+async def is_pinned_to_primary_async(account_id: Union[str, uuid.UUID]) -> bool:
+    """
+    Async variant of is_pinned_to_primary.
+    """
+    try:
+        return bool(await get_async_redis_client().exists(_primary_pin_key(account_id)))
+    except Exception:
+        return True
+
+REFERENCE_DATA_VERSION_KEY = "reference_data:version"
+
+def get_reference_data_version() -> Optional[str]:
+    """
+    Current version of the industry reference data, bumped on every change.
+
+    Returns:
+        The version string ("0" if never bumped), or None if Redis is unavailable
+    """
+    try:
+        return get_redis_client().get(REFERENCE_DATA_VERSION_KEY) or "0"
+    except Exception as e:
+        logger.warning(f"Error reading reference data version: {e}")
+        return None
+
+def bump_reference_data_version() -> Optional[str]:
+    """
+    Tell every process that the industry reference data changed.
+    """
+    try:
+        return str(get_redis_client().incr(REFERENCE_DATA_VERSION_KEY))
+    except Exception as e:
+        logger.warning(f"Error bumping reference data version: {e}")
+        return None
+
+def _login_attempts_key(identifier: str) -> str:
+    return f"login_attempts:{identifier.strip().lower()}"
+
+# INCR and the window's TTL in one step, so a counter can never outlive the
+# window and lock an identifier out for good
+_REGISTER_LOGIN_ATTEMPT_LUA = """
+local attempts = redis.call('INCR', KEYS[1])
+if redis.call('TTL', KEYS[1]) < 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return attempts
+"""
+
+async def register_login_attempt_async(identifier: str) -> Optional[int]:
+    """
+    Count a login attempt for an account identifier (email, username or phone)
+    in the current LOGIN_RATE_LIMIT_WINDOW_SECONDS window.
+
+    Returns:
+        Attempts in the window including this one, or None if Redis is unavailable
+    """
+    try:
+        return await get_async_redis_client().eval(
+            _REGISTER_LOGIN_ATTEMPT_LUA, 1, _login_attempts_key(identifier), settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Error counting login attempt: {e}")
+        return None
+
+async def clear_login_attempts_async(identifier: str) -> bool:
+    """
+    Reset the attempt counter after a successful login.
+    """
+    try:
+        await get_async_redis_client().delete(_login_attempts_key(identifier))
+        return True
+    except Exception as e:
+        logger.warning(f"Error clearing login attempts: {e}")
+        return False
+
+# Refresh tokens are stored by hash. Each login starts a family; rotating a
+# token moves the family to the new one and remembers the old hash, so
+# presenting an already rotated token (a stolen copy) ends the whole family.
+def _refresh_key(token_hash: str) -> str:
+    return f"refresh:{token_hash}"
+
+def _refresh_used_key(token_hash: str) -> str:
+    return f"refresh_used:{token_hash}"
+
+def _refresh_family_key(family: str) -> str:
+    return f"refresh_family:{family}"
+
+def _refresh_ttl_seconds() -> int:
+    return settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+
+async def store_refresh_token_async(token_hash: str, account_id: Union[str, uuid.UUID], family: Optional[str] = None) -> bool:
+    """
+    Save a refresh token (by hash) as the current token of its family.
+
+    Args:
+        token_hash: hash_refresh_token() of the token handed to the client
+        account_id: Owner of the token
+        family: Family to continue; None starts a new one (login)
+
+    Returns:
+        True if saved successfully, False otherwise
+    """
+    try:
+        family = family or uuid.uuid4().hex
+        ttl = _refresh_ttl_seconds()
+        value = json.dumps({"account_id": str(account_id), "family": family})
+        async with get_async_redis_client().pipeline(transaction=True) as pipe:
+            pipe.set(_refresh_key(token_hash), value, ex=ttl)
+            pipe.set(_refresh_family_key(family), token_hash, ex=ttl)
+            await pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error saving refresh token: {e}")
+        return False
+
+async def consume_refresh_token_async(token_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Use up a refresh token so it can be rotated.
+
+    Returns:
+        {"account_id", "family", "reused": False} for a current token, which
+        is deleted; {"account_id", "family", "reused": True} for a token that
+        was already rotated, in which case its family is ended; None for
+        unknown or expired tokens or if Redis is unavailable
+    """
+    try:
+        client = get_async_redis_client()
+        value = await client.getdel(_refresh_key(token_hash))
+        if value:
+            data = json.loads(value)
+            await client.set(_refresh_used_key(token_hash), value, ex=_refresh_ttl_seconds())
+            return {**data, "reused": False}
+
+        value = await client.get(_refresh_used_key(token_hash))
+        if not value:
+            return None
+        data = json.loads(value)
+        await revoke_refresh_family_async(data["family"])
+        return {**data, "reused": True}
+    except Exception as e:
+        logger.warning(f"Error consuming refresh token: {e}")
+        return None
+
+async def revoke_refresh_family_async(family: str) -> bool:
+    """
+    End a refresh token family: its current token stops working.
+    """
+    try:
+        client = get_async_redis_client()
+        current = await client.getdel(_refresh_family_key(family))
+        if current:
+            await client.delete(_refresh_key(current))
+        return True
+    except Exception as e:
+        logger.warning(f"Error revoking refresh token family: {e}")
+        return False
+
+async def revoke_refresh_token_async(token_hash: str) -> bool:
+    """
+    Sign-out: end the family of a refresh token.
+    """
+    try:
+        value = await get_async_redis_client().get(_refresh_key(token_hash))
+        if not value:
+            return True
+        return await revoke_refresh_family_async(json.loads(value)["family"])
+    except Exception as e:
+        logger.warning(f"Error revoking refresh token: {e}")
+        return False
+
+# Revoked access tokens, scored by when the entry stops mattering (the
+# revoked token's expiry). New entries are also published on the channel so
+# every process can update its in-memory list (app.core.revocation).
+REVOKED_ACCESS_KEY = "revoked_access"
+REVOCATION_CHANNEL = "revocations"
+
+async def publish_revocation_async(entry: str, expires_at: float) -> bool:
+    """
+    Store and broadcast a revocation entry until expires_at (unix time).
+    """
+    try:
+        async with get_async_redis_client().pipeline(transaction=True) as pipe:
+            pipe.zadd(REVOKED_ACCESS_KEY, {entry: expires_at})
+            pipe.zremrangebyscore(REVOKED_ACCESS_KEY, "-inf", time.time())
+            pipe.publish(REVOCATION_CHANNEL, json.dumps({"entry": entry, "expires_at": expires_at}))
+            await pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error publishing revocation: {e}")
+        return False
+
+async def get_revocations_async() -> Optional[List[Tuple[str, float]]]:
+    """
+    All revocation entries that have not expired yet, as (entry, expires_at).
+
+    Returns:
+        The entries, or None if Redis is unavailable
+    """
+    try:
+        return await get_async_redis_client().zrangebyscore(
+            REVOKED_ACCESS_KEY, time.time(), "+inf", withscores=True
+        )
+    except Exception as e:
+        logger.warning(f"Error reading revocations: {e}")
+        return None
+
+# Public campaign responses are cached per campaign version; services bump
+# the version after committing a change (app.core.response_cache), which
+# leaves the old entries to expire unused.
+def _campaign_version_key(campaign_id: Union[str, uuid.UUID]) -> str:
+    return f"campaign_version:{campaign_id}"
+
+def get_campaign_cache_version(campaign_id: Union[str, uuid.UUID]) -> Optional[str]:
+    """
+    Current cache version of a campaign's public responses.
+
+    Returns:
+        The version string ("0" if never bumped), or None if Redis is unavailable
+    """
+    try:
+        return get_redis_client().get(_campaign_version_key(campaign_id)) or "0"
+    except Exception as e:
+        logger.warning(f"Error reading campaign cache version: {e}")
+        return None
+
+def bump_campaign_cache_versions(campaign_ids: List[Union[str, uuid.UUID]]) -> bool:
+    """
+    Invalidate the cached responses of the given campaigns.
+    """
+    try:
+        with get_redis_client().pipeline(transaction=False) as pipe:
+            for campaign_id in campaign_ids:
+                pipe.incr(_campaign_version_key(campaign_id))
+            pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error bumping campaign cache versions: {e}")
+        return False
+
+def get_cached_response(key: str) -> Optional[Dict[str, str]]:
+    """
+    Cached response {"etag", "body"}, or None on a miss or if Redis is unavailable.
+    """
+    try:
+        return get_redis_client().hgetall(f"response:{key}") or None
+    except Exception as e:
+        logger.warning(f"Error reading cached response: {e}")
+        return None
+
+def set_cached_response(key: str, etag: str, body: str) -> bool:
+    """
+    Cache a response body for RESPONSE_CACHE_TTL_SECONDS.
+    """
+    try:
+        with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.hset(f"response:{key}", mapping={"etag": etag, "body": body})
+            pipe.expire(f"response:{key}", settings.RESPONSE_CACHE_TTL_SECONDS)
+            pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error caching response: {e}")
         return False
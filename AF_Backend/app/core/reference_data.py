@@ -0,0 +1,226 @@
+"""
+In-process cache of the industry reference tables.
+
+company_category_l1, company_category_l2 and company_risk_mapping are small
+and only change through migrations or admin edits, so every process keeps a
+copy (loaded at startup) and risk weight / category name lookups never query
+the database. A commit that touches one of these tables bumps a version key
+in Redis; each process compares it at most every REFERENCE_DATA_CHECK_SECONDS
+and reloads when it moved. Changes made outside the ORM (migrations, raw SQL)
+are picked up on restart or after calling bump_reference_data_version().
+Lookups on the event loop never load: they serve the current snapshot and
+refresh it on a background thread.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_reference_data_version, bump_reference_data_version
+from app.models.user import CompanyCategoryL1, CompanyCategoryL2, CompanyRiskMapping
+
+logger = logging.getLogger("reference_data")
+
+# Risk weight used when a fundraiser has no industry (or it has no weight)
+DEFAULT_RISK_WEIGHT = 0.5
+
+REFERENCE_MODELS = (CompanyCategoryL1, CompanyCategoryL2, CompanyRiskMapping)
+
+
+class ReferenceSnapshot(NamedTuple):
+    """
+    One consistent, read-only copy of the tables. Reloads swap in a new
+    snapshot, so a reader holding this one is never affected by them.
+    """
+    l1: Mapping[uuid.UUID, Mapping[str, Any]]
+    l2: Mapping[uuid.UUID, Mapping[str, Any]]
+    risk_mapping: Optional[Mapping[str, Any]]
+    version: Optional[str]
+
+
+EMPTY_SNAPSHOT = ReferenceSnapshot(MappingProxyType({}), MappingProxyType({}), None, None)
+
+
+def _weight(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class ReferenceDataCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ReferenceSnapshot] = None  # None = not loaded
+        self._stale = False
+        self._generation = 0  # bumped by invalidate()
+        self._checked_at = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def load(self, db: Optional[Session] = None) -> ReferenceSnapshot:
+        """
+        (Re)load all three tables. Uses a fresh SessionLocal unless db is given.
+        """
+        generation = self._generation
+        own_session = db is None
+        if own_session:
+            from app.db.session import SessionLocal
+            db = SessionLocal()
+        try:
+            # Read the version first: a change committed meanwhile bumps it past
+            # this value and triggers another reload on the next check
+            version = get_reference_data_version()
+            l1 = {
+                row.l1_id: MappingProxyType({"name": row.l1_name, "risk_weight": _weight(row.l1_risk_weight)})
+                for row in db.query(CompanyCategoryL1)
+            }
+            l2 = {
+                row.l2_id: MappingProxyType({
+                    "l1_id": row.l1_id, "name": row.l2_name, "risk_weight": _weight(row.l2_risk_weight)
+                })
+                for row in db.query(CompanyCategoryL2)
+            }
+            mapping = db.query(CompanyRiskMapping).first()
+        finally:
+            if own_session:
+                db.close()
+
+        snapshot = ReferenceSnapshot(
+            l1=MappingProxyType(l1),
+            l2=MappingProxyType(l2),
+            risk_mapping=MappingProxyType({
+                "l1_weight": _weight(mapping.l1_weight),
+                "l2_weight": _weight(mapping.l2_weight),
+                "default_l2_adjust": _weight(mapping.default_l2_adjust),
+                "min_risk": _weight(mapping.min_risk),
+                "max_risk": _weight(mapping.max_risk)
+            }) if mapping else None,
+            version=version
+        )
+        with self._lock:
+            self._snapshot = snapshot
+            # An invalidate() that landed while we were reading keeps it stale
+            self._stale = self._generation != generation
+            self._checked_at = time.monotonic()
+        logger.info(f"Loaded reference data: {len(l1)} L1 and {len(l2)} L2 categories (version {version})")
+        return snapshot
+
+    def invalidate(self):
+        """
+        Mark the cache stale; the next lookup reloads. Readers keep using the
+        snapshot they already hold.
+        """
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def _ensure_fresh(self, db: Optional[Session] = None) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if (
+            snapshot is not None and not self._stale
+            and time.monotonic() - self._checked_at < settings.REFERENCE_DATA_CHECK_SECONDS
+        ):
+            return snapshot
+        if _on_event_loop():
+            # Lookups also run on the event loop (Campaign.category_name while an
+            # async endpoint serializes); never block it on the database or
+            # Redis. Serve what we have and refresh in the background.
+            self._refresh_in_background()
+            return snapshot if snapshot is not None else EMPTY_SNAPSHOT
+        return self._refresh(db)
+
+    def _refresh(self, db: Optional[Session] = None) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or self._stale:
+            return self.load(db)
+
+        version = get_reference_data_version()
+        self._checked_at = time.monotonic()
+        # Without Redis there is no version to compare; reload on every check
+        if version is None or version != snapshot.version:
+            return self.load(db)
+        return snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._background_refresh, name="reference-data-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _background_refresh(self):
+        try:
+            self._refresh()
+        except Exception:
+            logger.exception("Reference data refresh failed")
+
+    def risk_weights(
+        self,
+        l1_id: Optional[uuid.UUID],
+        l2_id: Optional[uuid.UUID],
+        db: Optional[Session] = None
+    ) -> Tuple[float, float]:
+        """
+        (l1_risk, l2_risk) for a fundraiser's industry, DEFAULT_RISK_WEIGHT for
+        a missing category or weight.
+        """
+        if l1_id is None and l2_id is None:
+            return DEFAULT_RISK_WEIGHT, DEFAULT_RISK_WEIGHT
+        snapshot = self._ensure_fresh(db)
+        l1 = snapshot.l1.get(l1_id) or {}
+        l2 = snapshot.l2.get(l2_id) or {}
+        l1_risk = l1.get("risk_weight")
+        l2_risk = l2.get("risk_weight")
+        return (
+            l1_risk if l1_risk is not None else DEFAULT_RISK_WEIGHT,
+            l2_risk if l2_risk is not None else DEFAULT_RISK_WEIGHT
+        )
+
+    def l1_name(self, l1_id: Optional[uuid.UUID], db: Optional[Session] = None) -> Optional[str]:
+        if l1_id is None:
+            return None
+        return (self._ensure_fresh(db).l1.get(l1_id) or {}).get("name")
+
+    def has_l1(self, l1_id: uuid.UUID, db: Optional[Session] = None) -> bool:
+        return l1_id in self._ensure_fresh(db).l1
+
+    def has_l2(self, l2_id: uuid.UUID, db: Optional[Session] = None) -> bool:
+        return l2_id in self._ensure_fresh(db).l2
+
+    def risk_mapping(self, db: Optional[Session] = None) -> Optional[Mapping[str, Any]]:
+        return self._ensure_fresh(db).risk_mapping
+
+
+reference_data = ReferenceDataCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_reference_changes(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    if any(isinstance(obj, REFERENCE_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["reference_data_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_reference_changes(session):
+    if session.info.pop("reference_data_changed", False):
+        reference_data.invalidate()
+        bump_reference_data_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reference_changes(session):
+    session.info.pop("reference_data_changed", None)
@@ -0,0 +1,122 @@
+"""
+Redis cache for the public, read-mostly campaign endpoints.
+
+Campaign detail, timeline, progress and milestone evidence are polled by
+everyone viewing a campaign but only change when a service commits a
+contribution, state transition, evidence upload, tally or release. Those
+services call mark_campaign_changed() before committing; once the commit
+succeeds the campaign's version in Redis is bumped, so responses are cached
+under (campaign id, version, resource) and never need to be deleted.
+
+Every response carries an ETag (hash of the body), and a matching
+If-None-Match is answered with 304 and no body.
+"""
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.redis import (
+    get_campaign_cache_version,
+    bump_campaign_cache_versions,
+    get_cached_response,
+    set_cached_response,
+)
+from app.core.serialization import type_adapter, dump_json
+
+CACHE_CONTROL = "no-cache"  # clients may keep a copy but must revalidate it
+
+
+def mark_campaign_changed(db: Session, campaign_id: uuid.UUID):
+    """
+    Invalidate the campaign's cached responses when db next commits.
+    """
+    db.info.setdefault("changed_campaigns", set()).add(campaign_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_campaign_changes(session):
+    changed = session.info.pop("changed_campaigns", None)
+    if changed:
+        bump_campaign_cache_versions(list(changed))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_campaign_changes(session):
+    session.info.pop("changed_campaigns", None)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class CachedCampaignRead:
+    """
+    One cacheable GET of a campaign-scoped resource:
+
+        read = CachedCampaignRead(request, campaign_id, "timeline")
+        cached = read.cached()
+        if cached:
+            return cached
+        ...
+        return read.respond(campaign.milestones, List[MilestoneOut])
+    """
+
+    def __init__(self, request: Request, campaign_id: uuid.UUID, resource: str):
+        self.request = request
+        # Read once: if the campaign changes while this request builds its
+        # response, the result is stored under the old version and not served
+        self.version = get_campaign_cache_version(campaign_id)
+        self.key = f"{resource}:{campaign_id}:{self.version}"
+
+    def _response(self, etag: str, body: str) -> Response:
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if _etag_matches(self.request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def cached(self) -> Optional[Response]:
+        if self.version is None:
+            return None
+        entry = get_cached_response(self.key)
+        if entry is None:
+            return None
+        return self._response(entry["etag"], entry["body"])
+
+    def respond(self, payload: Any, response_model) -> Response:
+        """
+        Serialize payload as response_model (like FastAPI would) and cache it.
+        """
+        body = dump_json(type_adapter(response_model), payload).decode()
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        if self.version is not None:
+            set_cached_response(self.key, etag, body)
+        return self._response(etag, body)
+
+
+# milestone -> campaign never changes, so evidence reads can find their
+# campaign's cache version without a query after the first one
+_MILESTONE_CAMPAIGNS_MAX = 10000
+_milestone_campaigns: "OrderedDict[uuid.UUID, uuid.UUID]" = OrderedDict()
+_milestone_campaigns_lock = threading.Lock()
+
+
+def remember_milestone_campaign(milestone_id: uuid.UUID, campaign_id: uuid.UUID):
+    with _milestone_campaigns_lock:
+        _milestone_campaigns[milestone_id] = campaign_id
+        _milestone_campaigns.move_to_end(milestone_id)
+        if len(_milestone_campaigns) > _MILESTONE_CAMPAIGNS_MAX:
+            _milestone_campaigns.popitem(last=False)
+
+
+def milestone_campaign(milestone_id: uuid.UUID) -> Optional[uuid.UUID]:
+    with _milestone_campaigns_lock:
+        return _milestone_campaigns.get(milestone_id)
@@ -0,0 +1,143 @@
+"""
+In-memory revocation list for access tokens.
+
+Access tokens are verified from their signature and claims alone, so a token
+that must stop working before it expires (sign-out, a stolen refresh token)
+is listed here. Entries are either a single token (its jti) or every token of
+an account issued up to a point in time, and only need to be kept until the
+tokens they cover expire, i.e. at most ACCESS_TOKEN_EXPIRE_MINUTES.
+
+Each process holds the whole list. It is loaded from Redis when the listener
+starts and kept current through Redis pub/sub; without Redis, revocations
+only apply in the process that made them.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Union
+import uuid
+
+from app.core.config import settings
+from app.core.redis import (
+    get_async_redis_client,
+    get_revocations_async,
+    publish_revocation_async,
+    REVOCATION_CHANNEL,
+)
+
+logger = logging.getLogger("auth.revocation")
+
+
+class RevocationList:
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}  # jti -> expires_at
+        self._accounts: Dict[str, Dict[str, float]] = {}  # account_id -> {"before", "expires_at"}
+
+    def apply(self, entry: str, expires_at: float):
+        """
+        Add an entry: "jti:<jti>" or "account:<account_id>:<issued_before>".
+        """
+        kind, _, value = entry.partition(":")
+        if kind == "jti":
+            self._tokens[value] = expires_at
+        elif kind == "account":
+            account_id, _, before = value.rpartition(":")
+            current = self._accounts.get(account_id)
+            if current is None or float(before) > current["before"]:
+                self._accounts[account_id] = {"before": float(before), "expires_at": expires_at}
+        else:
+            logger.error(f"Ignoring malformed revocation entry {entry}")
+
+    def replace(self, entries: List[tuple]):
+        self._tokens, self._accounts = {}, {}
+        for entry, expires_at in entries:
+            self.apply(entry, expires_at)
+
+    def prune(self):
+        now = time.time()
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._accounts = {acct: data for acct, data in self._accounts.items() if data["expires_at"] > now}
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        if claims.get("jti") in self._tokens:
+            return True
+        account = self._accounts.get(str(claims.get("sub")))
+        # Tokens without iat predate revocable tokens and count as oldest
+        return account is not None and claims.get("iat", 0) <= account["before"]
+
+    def __len__(self):
+        return len(self._tokens) + len(self._accounts)
+
+
+revocation_list = RevocationList()
+
+
+def _access_token_lifetime() -> float:
+    return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+async def revoke_access_token(claims: Dict[str, Any]):
+    """
+    Revoke one access token until it expires.
+    """
+    jti = claims.get("jti")
+    if not jti:
+        return
+    expires_at = float(claims.get("exp") or time.time() + _access_token_lifetime())
+    entry = f"jti:{jti}"
+    revocation_list.apply(entry, expires_at)
+    await publish_revocation_async(entry, expires_at)
+
+
+async def revoke_account_tokens(account_id: Union[str, uuid.UUID]):
+    """
+    Revoke every access token issued to an account up to now.
+    """
+    now = time.time()
+    entry = f"account:{account_id}:{int(now)}"
+    expires_at = now + _access_token_lifetime()
+    revocation_list.apply(entry, expires_at)
+    await publish_revocation_async(entry, expires_at)
+
+
+async def _listen():
+    while True:
+        pubsub = get_async_redis_client().pubsub()
+        try:
+            await pubsub.subscribe(REVOCATION_CHANNEL)
+            # Load after subscribing so nothing published in between is missed
+            entries = await get_revocations_async()
+            if entries is not None:
+                revocation_list.replace(entries)
+            logger.info(f"Revocation listener started with {len(revocation_list)} entries")
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = json.loads(message["data"])
+                revocation_list.apply(data["entry"], float(data["expires_at"]))
+                revocation_list.prune()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Revocation listener error: {str(e)}")
+            await asyncio.sleep(5)
+        finally:
+            await pubsub.reset()
+
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+def start_revocation_listener():
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen())
+
+
+async def stop_revocation_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        await asyncio.gather(_listener_task, return_exceptions=True)
+        _listener_task = None
@@ -2,18 +2,8 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.tasks.campaign_monitor import check_funding_deadlines, check_voting_deadlines
 from app.db.session import SessionLocal
 import logging
-import os
 
-os.makedirs("logs", exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler("logs/automation.log"),
-        logging.StreamHandler()
-    ]
-)
+# Handlers (including logs/automation.log) are set up by app.core.logging_config
 logger = logging.getLogger("automation")
 
 scheduler = AsyncIOScheduler()
@@ -1,10 +1,17 @@
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Dict, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds are flagged by needs_update / verify_and_update
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,12 +19,105 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (valid, new_hash); new_hash is set when the stored hash should be
+    replaced because the hashing parameters changed.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    More than PASSWORD_HASH_MAX_PENDING hashes are already queued.
+    """
+
+
+# Bcrypt costs ~250ms of CPU per call at the default rounds. Running it in a
+# small process pool keeps the event loop and the request thread pool free
+# for everything else during a login storm; the pending cap sheds load
+# instead of letting the queue grow without bound.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_pending_hashes = 0
+
+def _get_hash_executor() -> Optional[ProcessPoolExecutor]:
+    global _hash_executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _hash_executor is None:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_executor
+
+def shutdown_password_hasher():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+async def _run_hasher(fn, *args):
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy()
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), fn, *args)
+    finally:
+        _pending_hashes -= 1
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password off the event loop. Raises PasswordHasherBusy.
+    """
+    return await _run_hasher(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    get_password_hash off the event loop. Raises PasswordHasherBusy.
+    """
+    return await _run_hasher(get_password_hash, password)
+
+def create_access_token(
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Signed access token. Extra claims (role, email, name) let most requests
+    authenticate from the token alone; jti and iat make it revocable.
+    """
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode = {"exp": expire, "sub": str(subject)}
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+    to_encode = dict(claims or {})
+    to_encode.update({
+        "exp": expire,
+        "iat": now,
+        "sub": str(subject),
+        "jti": uuid.uuid4().hex,
+        "type": "access"
+    })
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Verified claims of an access token. Raises jose.JWTError.
+    """
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+def create_refresh_token() -> str:
+    """
+    Opaque refresh token; only its hash is stored server side.
+    """
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    # The token is 256 random bits, so a fast unsalted hash is enough
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,47 @@
+"""
+JSON serialization for the large list responses.
+
+For a response_model FastAPI validates the return value, dumps it to a tree
+of Python dicts and strings, then hands that tree to json.dumps. For lists
+of campaigns with nested milestones and evidence most of the request's CPU
+goes there. json_response() validates with a TypeAdapter built once at
+import and lets pydantic-core write the JSON bytes directly, skipping the
+intermediate tree and the second encoding pass.
+
+Endpoints keep their response_model, so the OpenAPI schema is unchanged.
+"""
+from functools import lru_cache
+from typing import Any, List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.campaign import CampaignOut, CampaignListDelta, MilestoneOut, MilestoneEvidenceOut
+from app.schemas.contribution import UserContributionOut
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_model) -> TypeAdapter:
+    """
+    TypeAdapter for response_model; built on first use, then reused.
+    """
+    return TypeAdapter(response_model)
+
+
+# Built at import so the first request doesn't pay for schema construction
+CAMPAIGN_LIST = type_adapter(List[CampaignOut])
+CAMPAIGN_LIST_DELTA = type_adapter(CampaignListDelta)
+MILESTONE_LIST = type_adapter(List[MilestoneOut])
+EVIDENCE_LIST = type_adapter(List[MilestoneEvidenceOut])
+CONTRIBUTION_LIST = type_adapter(List[UserContributionOut])
+
+
+def dump_json(adapter: TypeAdapter, payload: Any) -> bytes:
+    """
+    Validate payload (ORM objects or dicts) and encode it as FastAPI would.
+    """
+    return adapter.dump_json(adapter.validate_python(payload, from_attributes=True), by_alias=True)
+
+
+def json_response(adapter: TypeAdapter, payload: Any) -> Response:
+    return Response(content=dump_json(adapter, payload), media_type="application/json")
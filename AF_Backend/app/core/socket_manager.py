@@ -1,41 +1,124 @@
+import asyncio
+import logging
 import socketio
-from typing import Any
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _build_client_manager() -> Optional[socketio.AsyncManager]:
+    """
+    Share rooms across uvicorn workers and nodes through Redis pub/sub.
+    Every worker keeps its own local room membership and receives every emit
+    from the channel, so a client can join a room on whichever worker accepted
+    its connection. Set SOCKETIO_MESSAGE_QUEUE="" for a single in-process worker.
+    """
+    url = settings.SOCKETIO_MESSAGE_QUEUE
+    if url is None:
+        url = settings.REDIS_URL
+    if url:
+        return socketio.AsyncRedisManager(url, channel=settings.SOCKETIO_CHANNEL)
+    return None
 
 # Create Socket.io server instance
-# async_mode='asgi' is important for FastAPI integration
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+# async_mode='asgi' is important for FastAPI integration.
+# Websocket-only transport keeps every connection on a single worker, so no
+# sticky sessions are needed in front of a multi-worker deployment.
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    cors_allowed_origins='*',
+    client_manager=_build_client_manager(),
+    transports=[t.strip() for t in settings.SOCKETIO_TRANSPORTS.split(",") if t.strip()]
+)
 
 # Create ASGI application
 socket_app = socketio.ASGIApp(sio)
 
+
+class CampaignEventCoalescer:
+    """
+    Collapses bursts of the same event for the same campaign room into one emit.
+
+    The first event for an (event, campaign) pair opens a short window; events
+    arriving inside that window replace the pending payload, and only the latest
+    one is sent to the room when the window closes.
+    """
+
+    def __init__(self, server: socketio.AsyncServer, window_ms: int):
+        self.server = server
+        self.window_seconds = max(window_ms, 0) / 1000.0
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def emit(self, event: str, campaign_id: str, data: Any):
+        if self.window_seconds == 0:
+            await self.server.emit(event, data, room=campaign_id)
+            return
+
+        key = (event, campaign_id)
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending["data"] = data
+            pending["count"] += 1
+            return
+
+        self._pending[key] = {"data": data, "count": 1}
+        task = asyncio.create_task(self._flush_later(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, key: Tuple[str, str]):
+        await asyncio.sleep(self.window_seconds)
+        await self.flush(key)
+
+    async def flush(self, key: Tuple[str, str]):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        event, campaign_id = key
+        data = pending["data"]
+        if pending["count"] > 1 and isinstance(data, dict):
+            data = {**data, "coalesced": pending["count"]}
+        try:
+            await self.server.emit(event, data, room=campaign_id)
+        except Exception as e:
+            logger.error(f"Failed to emit {event} to room {campaign_id}: {e}")
+
+    async def flush_all(self):
+        for key in list(self._pending):
+            await self.flush(key)
+
+
+coalescer = CampaignEventCoalescer(sio, settings.SOCKETIO_COALESCE_WINDOW_MS)
+
 @sio.event
 async def connect(sid, environ):
-    print(f"[SOCKET] Client connected: {sid}")
+    logger.debug(f"Client connected: {sid}")
 
 @sio.event
 async def disconnect(sid):
-    print(f"[SOCKET] Client disconnected: {sid}")
+    logger.debug(f"Client disconnected: {sid}")
 
 @sio.event
 async def join_campaign(sid, campaign_id: str):
-    print(f"[SOCKET] Client {sid} joining campaign: {campaign_id}")
+    logger.debug(f"Client {sid} joining campaign: {campaign_id}")
     await sio.enter_room(sid, campaign_id)
 
 @sio.event
 async def leave_campaign(sid, campaign_id: str):
-    print(f"[SOCKET] Client {sid} leaving campaign: {campaign_id}")
+    logger.debug(f"Client {sid} leaving campaign: {campaign_id}")
     await sio.leave_room(sid, campaign_id)
 
 async def emit_milestone_update(campaign_id: str, data: Any):
     """
-    Helper to broadcast milestone updates to all users following a campaign.
-    """
-    # Debug: Check who is in the room
-    participants = sio.manager.get_participants("/", campaign_id)
-    print(f"[SOCKET] Room {campaign_id} has {len(list(participants))} participants")
-    
-    await sio.emit("milestone_update", data, room=campaign_id)
-    print(f"[SOCKET] Broadcast update for {campaign_id}: {data}")
-    
-    # Debug: Also broadcast globally to ensure connectivity
-    await sio.emit("milestone_update", data) 
+    Broadcast milestone updates to the users following a campaign.
+    Bursts for the same campaign are coalesced into a single emit.
+    """
+    await coalescer.emit("milestone_update", str(campaign_id), data)
+
+async def emit_payment_received(campaign_id: str, data: Any):
+    """
+    Notify the users viewing a campaign that a payment landed.
+    """
+    await coalescer.emit("payment_received", str(campaign_id), data)
@@ -0,0 +1,17 @@
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.session import build_engine_options, instrument_engine, to_async_url
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **build_engine_options(ASYNC_DATABASE_URL, is_async=True))
+instrument_engine(async_engine.sync_engine, label="primary_async")
+
+# expire_on_commit=False so objects stay readable after commit without
+# triggering implicit IO, which is not allowed on an AsyncSession
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -9,3 +9,4 @@ from app.models.escrow import EscrowAccount  # noqa
 from app.models.transaction import TransactionLedger, Contribution  # noqa
 from app.models.refund_event import RefundEvent  # noqa
 from app.models.fund_release import FundRelease  # noqa
+from app.models.change_tombstone import ChangeTombstone  # noqa
@@ -0,0 +1,68 @@
+"""
+Change versions for delta sync.
+
+Synced rows (campaign, milestone, change_tombstone) carry a change_version
+stamped on every INSERT and UPDATE, ORM or Core, so a client holding the
+cursor from its last delta can ask for just the rows that changed after it.
+
+On Postgres the stamp is the writing transaction's id (plus a fixed offset,
+see the migration). Ids are handed out when a transaction first writes, not
+when it commits, so the cursor is not the highest version seen but
+commit_horizon(): one below the oldest transaction still running, below
+which nothing new can become visible. Rows above the horizon are sent again
+on the next call; clients merge them by id.
+"""
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+CHANGE_VERSION_STAMP = "change_version_stamp"
+CHANGE_VERSION_HORIZON = "change_version_horizon"
+
+
+def postgres_function_ddl(offset: int = 0) -> List[str]:
+    """
+    CREATE statements for the Postgres stamp and horizon functions.
+    """
+    return [
+        f"CREATE OR REPLACE FUNCTION {CHANGE_VERSION_STAMP}() RETURNS bigint LANGUAGE sql VOLATILE AS "
+        f"$$ SELECT pg_current_xact_id()::text::bigint + {offset} $$",
+        f"CREATE OR REPLACE FUNCTION {CHANGE_VERSION_HORIZON}() RETURNS bigint LANGUAGE sql VOLATILE AS "
+        f"$$ SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint + {offset} - 1 $$",
+    ]
+
+
+class next_change_version(FunctionElement):
+    """
+    SQL expression for the next change version; use as a column default and onupdate.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(next_change_version, "postgresql")
+def _next_change_version_postgresql(element, compiler, **kw):
+    return f"{CHANGE_VERSION_STAMP}()"
+
+
+@compiles(next_change_version)
+def _next_change_version_default(element, compiler, **kw):
+    # No transaction ids (SQLite in tests and local runs): microseconds since
+    # the epoch, which only increases between writes at least 1ms apart
+    return "CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER)"
+
+
+def commit_horizon(db: Session) -> Optional[int]:
+    """
+    Highest version no running transaction can still commit at or below.
+
+    Read it before the rows it covers. None on SQLite: writers hold the
+    database lock from their first write to commit, so every visible
+    version is already final and the highest one seen is a safe cursor.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text(f"SELECT {CHANGE_VERSION_HORIZON}()")).scalar_one()
@@ -0,0 +1,29 @@
+"""
+Read-replica engines for read-only endpoints.
+When READ_REPLICA_URL is not set every factory here points at the primary.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.db.session import SessionLocal, build_engine_options, instrument_engine, to_async_url
+from app.db.async_session import AsyncSessionLocal
+
+if settings.READ_REPLICA_URL:
+    replica_engine = instrument_engine(
+        create_engine(settings.READ_REPLICA_URL, **build_engine_options(settings.READ_REPLICA_URL)),
+        label="replica"
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+    ASYNC_READ_REPLICA_URL = to_async_url(settings.READ_REPLICA_URL)
+    async_replica_engine = create_async_engine(
+        ASYNC_READ_REPLICA_URL, **build_engine_options(ASYNC_READ_REPLICA_URL, is_async=True)
+    )
+    instrument_engine(async_replica_engine.sync_engine, label="replica_async")
+    AsyncReplicaSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+else:
+    ReplicaSessionLocal = SessionLocal
+    AsyncReplicaSessionLocal = AsyncSessionLocal
+
+HAS_REPLICA = bool(settings.READ_REPLICA_URL)
@@ -1,8 +1,125 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core import metrics
+from app.core.instrumentation import record_query
 
-engine = create_engine(settings.DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+
+class _CheckoutTimingMixin:
+    """
+    Records how long each checkout waited for a free connection.
+    """
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.DB_POOL_CHECKOUT_TIMEOUTS.labels(self.metrics_label).inc()
+            raise
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a sync driver URL to its asyncio driver (asyncpg / aiosqlite).
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def build_engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Pool and connection options for the configured database.
+    SQLite (tests) keeps SQLAlchemy defaults.
+    """
+    if url.startswith("sqlite"):
+        return {}
+
+    if is_async:
+        # asyncpg takes server settings instead of libpq options
+        server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        connect_args = {"server_settings": server_settings}
+    else:
+        connect_args = {"application_name": settings.DB_APPLICATION_NAME}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def instrument_engine(engine, label: str = "primary"):
+    """
+    Attach pool occupancy and slow-query metrics to an engine.
+    """
+    pool = engine.pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        pool.metrics_label = label
+        metrics.DB_POOL_SIZE.labels(label).set(pool.size() + pool._max_overflow)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        if hasattr(pool, "checkedout"):
+            metrics.DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):
+        if hasattr(pool, "checkedout"):
+            metrics.DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        record_query(elapsed)
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+            metrics.DB_SLOW_QUERIES.labels(label).inc()
+            logger.warning(f"Slow query ({elapsed_ms:.0f}ms): {statement[:200]}")
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+    return engine
+
+
+engine = instrument_engine(create_engine(settings.DATABASE_URL, **build_engine_options(settings.DATABASE_URL)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -2,31 +2,64 @@
 Main FastAPI application entry point.
 """
 
-from fastapi import FastAPI
+import logging
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.socket_manager import sio
+from app.core.logging_config import configure_logging
+
+# Before anything below gets a chance to log
+configure_logging()
+
+from app.core.socket_manager import sio, coalescer
+from app.core.metrics import render_latest
+from app.core.compression import CompressionMiddleware
+from app.core.instrumentation import RequestInstrumentationMiddleware
+from app.core.redis import pin_to_primary_async
+from app.db.replica import HAS_REPLICA
+from app.api.dependencies.deps import account_id_from_request
 import socketio
 from app.api.endpoints import auth, campaigns, votes, contributions, milestones, simulation
 from app.api.v1.endpoints import payments
 
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app instance
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Crowdfunding platform for Kenyan startups with milestone-based fund release",
     debug=settings.DEBUG,
+    # Responses not written by app.core.serialization are encoded with orjson
+    default_response_class=ORJSONResponse,
 )
 
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.tasks.callback_ingestion import start_callback_workers, stop_callback_workers
+from app.core.reference_data import reference_data
+from app.core.security import shutdown_password_hasher
+from app.core.revocation import start_revocation_listener, stop_revocation_listener
 
 @app.on_event("startup")
 async def startup_event():
     start_scheduler()
+    start_callback_workers()
+    start_revocation_listener()
+    try:
+        await run_in_threadpool(reference_data.load)
+    except Exception as e:
+        # Loaded on first lookup instead
+        logger.warning(f"Reference data preload failed: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     stop_scheduler()
+    await stop_callback_workers()
+    await stop_revocation_listener()
+    shutdown_password_hasher()
+    await coalescer.flush_all()
 
 # Mount static files for uploads
 from fastapi.staticfiles import StaticFiles
@@ -46,6 +79,36 @@ app.add_middleware(
     allow_headers=[settings.ALLOWED_HEADERS] if settings.ALLOWED_HEADERS != "*" else ["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_BYTES,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+
+# POST endpoints that compute a response without writing anything
+STATELESS_POST_PATHS = ("/campaigns/plan",)
+
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """
+    After a successful write, keep that user's replica-routed reads on the
+    primary for READ_YOUR_WRITES_SECONDS.
+    """
+    response = await call_next(request)
+    is_write = request.method in ("POST", "PUT", "PATCH", "DELETE") and not request.url.path.endswith(STATELESS_POST_PATHS)
+    if HAS_REPLICA and is_write and response.status_code < 400:
+        account_id = account_id_from_request(request)
+        if account_id:
+            await pin_to_primary_async(account_id)
+    return response
+
+
+# Added last so it is outermost and its latency covers every layer above
+app.add_middleware(RequestInstrumentationMiddleware, query_warn_threshold=settings.REQUEST_QUERY_WARN_THRESHOLD)
+
 
 @app.get("/")
 async def root():
@@ -68,6 +131,13 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
+
+
 # API Routes
 
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["Authentication"])
@@ -8,3 +8,4 @@ from .fund_release import FundRelease
 from .refund_event import RefundEvent
 from .campaign_rating import CampaignRating
 from .milestone_evidence import MilestoneEvidence
+from .change_tombstone import ChangeTombstone
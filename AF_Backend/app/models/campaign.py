@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum, Text, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Numeric, Enum, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import GUID
 import uuid
 from datetime import datetime
 from app.db.base_class import Base
+from app.db.change_version import next_change_version
 
 class Campaign(Base):
     __tablename__ = "campaign"
@@ -55,6 +56,11 @@ class Campaign(Base):
         name='campaign_status'
     ), default='draft')
     
+    # Bumped by every status transition (CampaignStateService compare-and-set)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    # Bumped by every write, for ?since_version= delta sync (app/db/change_version.py)
+    change_version = Column(BigInteger, nullable=False, default=next_change_version(), onupdate=next_change_version())
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -64,6 +70,10 @@ class Campaign(Base):
     escrow_account = relationship("EscrowAccount", back_populates="campaign", uselist=False)
     vote_tokens = relationship("VoteToken", back_populates="campaign")
 
+    __table_args__ = (
+        Index('ix_campaign_fundraiser_change_version', 'fundraiser_id', 'change_version'),
+    )
+
     @property
     def fundraiser_name(self) -> str:
         if self.fundraiser:
@@ -72,6 +82,10 @@ class Campaign(Base):
 
     @property
     def backers_count(self) -> int:
+        # List endpoints preload this in one grouped query (CampaignService.attach_backers_counts)
+        if "_backers_count" in self.__dict__:
+            return self.__dict__["_backers_count"]
+
         from app.models.transaction import Contribution
         from sqlalchemy import select, func
         from app.db.session import SessionLocal
@@ -109,7 +123,8 @@ class Campaign(Base):
     def category_name(self) -> str:
         if self.category:
             return self.category
-        if self.fundraiser and self.fundraiser.industry_l1:
-            return self.fundraiser.industry_l1.l1_name
+        if self.fundraiser and self.fundraiser.industry_l1_id:
+            from app.core.reference_data import reference_data
+            return reference_data.l1_name(self.fundraiser.industry_l1_id) or "General"
         return "General"
 
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, Index, event
+from sqlalchemy.orm import Session
+from app.db.base_class import GUID
+import uuid
+from datetime import datetime
+from app.db.base_class import Base
+from app.db.change_version import next_change_version
+
+class ChangeTombstone(Base):
+    """
+    Record of a deleted synced row, so ?since_version= deltas can tell
+    clients to drop it. scope_id is what the delta is filtered by: the
+    fundraiser for a campaign, the campaign for a milestone.
+    """
+    __tablename__ = "change_tombstone"
+
+    tombstone_id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    entity = Column(String(20), nullable=False)  # 'campaign' | 'milestone'
+    entity_id = Column(GUID(), nullable=False)
+    scope_id = Column(GUID(), nullable=True)
+    change_version = Column(BigInteger, nullable=False, default=next_change_version())
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_change_tombstone_scope', 'entity', 'scope_id', 'change_version'),
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _record_deletions(session, flush_context, instances):
+    from app.models.campaign import Campaign
+    from app.models.milestone import Milestone
+
+    for obj in list(session.deleted):
+        if isinstance(obj, Campaign):
+            session.add(ChangeTombstone(entity='campaign', entity_id=obj.campaign_id, scope_id=obj.fundraiser_id))
+        elif isinstance(obj, Milestone):
+            session.add(ChangeTombstone(entity='milestone', entity_id=obj.milestone_id, scope_id=obj.campaign_id))
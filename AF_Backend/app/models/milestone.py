@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum, Text
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Numeric, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import GUID
 import uuid
 from datetime import datetime
 from app.db.base_class import Base
+from app.db.change_version import next_change_version
 
 class Milestone(Base):
     __tablename__ = "milestone"
@@ -45,9 +46,15 @@ class Milestone(Base):
         name='milestone_status'
     ), default='pending')
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped by every write, for ?since_version= delta sync (app/db/change_version.py)
+    change_version = Column(BigInteger, nullable=False, default=next_change_version(), onupdate=next_change_version())
     
     # Relationships
     campaign = relationship("Campaign", back_populates="milestones")
     vote_result = relationship("VoteResult", back_populates="milestone", uselist=False)
     vote_submissions = relationship("VoteSubmission", back_populates="milestone")
     evidence = relationship("MilestoneEvidence", back_populates="milestone")
+
+    __table_args__ = (
+        Index('ix_milestone_campaign_change_version', 'campaign_id', 'change_version'),
+    )
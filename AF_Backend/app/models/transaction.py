@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Enum, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import GUID
 import uuid
@@ -18,7 +18,7 @@ class TransactionLedger(Base):
     
     transaction_type = Column(Enum('contribution', 'disbursement', 'refund', name='transaction_type'))
     amount = Column(Numeric(12, 2))
-    reference_code = Column(String(100)) # External payment reference (e.g., M-Pesa code)
+    reference_code = Column(String(100)) # External payment reference (e.g., M-Pesa code), unique per contribution
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -28,6 +28,16 @@ class TransactionLedger(Base):
     fund_release = relationship("FundRelease")
     refund_event = relationship("RefundEvent")
 
+    # Only contribution receipts come from outside; release and refund codes
+    # are generated here and don't need to be unique
+    __table_args__ = (
+        Index(
+            'uq_transaction_ledger_contribution_reference', 'reference_code', unique=True,
+            postgresql_where=text("transaction_type = 'contribution'"),
+            sqlite_where=text("transaction_type = 'contribution'")
+        ),
+    )
+
 class Contribution(Base):
     __tablename__ = "contribution"
     
@@ -37,7 +47,13 @@ class Contribution(Base):
     
     amount = Column(Numeric(12, 2))
     status = Column(Enum('pending', 'completed', 'failed', 'refunded', name='contribution_status'), default='pending')
+    # CheckoutRequestID or client Idempotency-Key; retries of the same payment hit this constraint
+    idempotency_key = Column(String(100), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     campaign = relationship("Campaign")
     contributor = relationship("User")
+
+    __table_args__ = (
+        UniqueConstraint('idempotency_key', name='uq_contribution_idempotency_key'),
+    )
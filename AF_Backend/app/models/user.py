@@ -29,6 +29,7 @@ class ContributorProfile(Base):
     contributor_id = Column(GUID(), ForeignKey("account.account_id"), primary_key=True)
     uname = Column(String(120), unique=True, index=True)
     phone_number = Column(String(20), unique=True, index=True)
+    phone_normalized = Column(String(12), unique=True, index=True)  # 254XXXXXXXXX, see app.utils.phone
     public_key = Column(String(66), nullable=True) # For digital signatures
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -34,6 +34,11 @@ class VoteToken(Base):
     campaign = relationship("Campaign", back_populates="vote_tokens")
     contributor = relationship("User")
 
+    # One token per contributor per campaign (lets contributions upsert it)
+    __table_args__ = (
+        UniqueConstraint('campaign_id', 'contributor_id', name='uq_vote_token_campaign_contributor'),
+    )
+
 class VoteSubmission(Base):
     __tablename__ = "vote_submission"
     
@@ -1,9 +1,18 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
 
+# Campaign length in months; the app's creation form allows the same range
+DURATION_MONTHS_MIN = 1
+DURATION_MONTHS_MAX = 24
+DurationMonths = Annotated[int, Field(ge=DURATION_MONTHS_MIN, le=DURATION_MONTHS_MAX)]
+
+# Plans one /campaigns/plan request may ask for (categories x goals x durations)
+MAX_PLAN_COMBINATIONS = 1000
+
 class MilestoneBase(BaseModel):
     campaign_id: UUID
     milestone_number: int
@@ -39,6 +48,7 @@ class MilestoneEvidenceOut(BaseModel):
 class MilestoneOut(MilestoneBase):
     milestone_id: UUID
     evidence: List[MilestoneEvidenceOut] = []
+    change_version: Optional[int] = None
     
     class Config:
         from_attributes = True
@@ -47,7 +57,7 @@ class CampaignBase(BaseModel):
     title: str
     description: str
     funding_goal_f: Decimal = Field(..., alias="funding_goal")
-    duration_d: int = Field(..., alias="duration_months")
+    duration_d: int = Field(..., alias="duration_months", ge=DURATION_MONTHS_MIN, le=DURATION_MONTHS_MAX)
     category: str = "General"
     campaign_type_ct: str = Field("donation", alias="campaign_type")
     budget_data: Optional[str] = None # JSON string
@@ -55,6 +65,50 @@ class CampaignBase(BaseModel):
 class CampaignCreate(CampaignBase):
     pass
 
+class CampaignBulkCreate(BaseModel):
+    campaigns: List[CampaignCreate] = Field(..., min_length=1, max_length=5000)
+
+class CampaignBulkCreateResult(BaseModel):
+    created: int
+    campaign_ids: List[UUID]
+
+class CampaignPlanCategory(BaseModel):
+    industry_l1_id: UUID
+    industry_l2_id: Optional[UUID] = None
+
+class CampaignPlanRequest(BaseModel):
+    funding_goals: List[Decimal] = Field(..., min_length=1, max_length=50)
+    duration_months: List[DurationMonths] = Field(..., min_length=1, max_length=50)
+    # Defaults to the current fundraiser's own industry
+    categories: Optional[List[CampaignPlanCategory]] = Field(None, min_length=1, max_length=20)
+
+    @model_validator(mode="after")
+    def limit_combinations(self):
+        combinations = len(self.categories or [None]) * len(self.funding_goals) * len(self.duration_months)
+        if combinations > MAX_PLAN_COMBINATIONS:
+            raise ValueError(f"At most {MAX_PLAN_COMBINATIONS} plans per request, got {combinations}")
+        return self
+
+class PlannedMilestone(BaseModel):
+    milestone_number: int
+    phase_weight_wi: float
+    release_amount: float
+    deadline_days: float
+    target_deadline: datetime
+
+class CampaignPlan(BaseModel):
+    industry_l1_id: Optional[UUID] = None
+    industry_l2_id: Optional[UUID] = None
+    funding_goal: float
+    duration_months: int
+    risk_factor_c: float
+    alpha: float
+    phase_count: int
+    milestones: List[PlannedMilestone]
+
+class CampaignPlanResponse(BaseModel):
+    plans: List[CampaignPlan]
+
 class CampaignUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -95,6 +149,7 @@ class CampaignOut(BaseModel):
     
     created_at: datetime
     updated_at: datetime
+    change_version: Optional[int] = None
     
     milestones: List[MilestoneOut] = []
 
@@ -102,6 +157,19 @@ class CampaignOut(BaseModel):
         from_attributes = True
         populate_by_name = True
 
+class MilestoneTimelineDelta(BaseModel):
+    """
+    Response to ?since_version=: rows written after it and ids of deleted rows.
+    """
+    version: int  # since_version for the next request
+    changed: List[MilestoneOut]
+    deleted: List[UUID]
+
+class CampaignListDelta(BaseModel):
+    version: int
+    changed: List[CampaignOut]
+    deleted: List[UUID]
+
 class CampaignProgress(BaseModel):
     status: str
     funding_percentage: float
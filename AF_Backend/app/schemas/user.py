@@ -55,6 +55,8 @@ class UserOut(User):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    expires_in: int  # seconds until access_token expires
+    refresh_token: Optional[str] = None  # None when the token store is unavailable
     role: str
     account_id: UUID
     email: str
@@ -63,6 +65,21 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     account_id: Optional[str] = None
 
+class TokenUser(BaseModel):
+    """
+    The caller as described by their access token claims.
+    """
+    account_id: UUID
+    role: str
+    email: Optional[str] = None
+    display_name: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
 class FCMTokenUpdate(BaseModel):
     fcm_token: str
 
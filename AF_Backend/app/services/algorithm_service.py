@@ -1,7 +1,74 @@
 import math
 from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Tuple
+import numpy as np
+
+# Model constants
+ALPHA_MAX = 2.0
+ALPHA_MIN = 1.5
+D_REF = 12
+F_PRIME = 1000000.0  # Prototype ceiling
+P_MIN = 3
+P_MAX = 12
+C_REF = 0.6  # Baseline risk (midpoint of 0.3-0.9)
+
+# Cache keys. Risk weights are stored as Numeric(4, 3), so C has at most four
+# decimals; goals are Numeric(12, 2) and every goal at or above F' behaves the
+# same. Keys at these resolutions are exact for anything read from the database.
+RISK_KEY_DIGITS = 4
+GOAL_KEY_DIGITS = 2
+ALPHA_KEY_DIGITS = 12
+
+
+def _risk_key(risk_factor_c: float) -> float:
+    return round(float(risk_factor_c), RISK_KEY_DIGITS)
+
+
+def _goal_key(funding_goal: float) -> float:
+    return round(min(float(funding_goal), F_PRIME), GOAL_KEY_DIGITS)
+
+
+def _alpha_key(alpha: float) -> float:
+    return round(float(alpha), ALPHA_KEY_DIGITS)
+
+
+@lru_cache(maxsize=256)
+def _alpha(duration_months) -> float:
+    return ALPHA_MIN + ((ALPHA_MAX - ALPHA_MIN) * (D_REF / (duration_months + D_REF)))
+
+
+@lru_cache(maxsize=65536)
+def _phase_count(risk_key: float, duration_months, goal_key: float, campaign_type_adj: int) -> int:
+    # Non-Financial Risk Term (NFRT)
+    nfrt = 3 + (duration_months / (duration_months + D_REF)) + (risk_key / (risk_key + C_REF)) + campaign_type_adj
+
+    # Financial Risk Factor (FRF)
+    frf_max = P_MAX - nfrt
+    f_ratio = min(1.0, goal_key / F_PRIME)
+    frf = f_ratio * frf_max
+
+    p = round(nfrt + frf)
+    return max(P_MIN, min(P_MAX, int(p)))
+
+
+@lru_cache(maxsize=4096)
+def _weights(num_phases: int, alpha_key: float) -> Tuple[float, ...]:
+    weights = [math.pow(i, alpha_key) for i in range(1, num_phases + 1)]
+    total_weight = math.fsum(weights)
+    return tuple(w / total_weight for w in weights)
+
 
 class AlgorithmService:
+    """
+    Campaign parameter formulas.
+
+    Results are memoized: alpha by duration, P by (risk bucket, duration,
+    goal bucket) and weight vectors by (P, rounded alpha). P only takes the
+    values 3-12 and durations are whole months, so the weight cache stays
+    small and repeated what-if evaluations are dictionary lookups.
+    """
+
     @staticmethod
     def calculate_risk_factor_c(l1_risk: float, l2_risk: float, l1_weight: float = 0.7, l2_weight: float = 0.3) -> float:
         """
@@ -18,10 +85,7 @@ class AlgorithmService:
         alpha = alpha_min + ((alpha_max - alpha_min) * (D_ref / (D + D_ref)))
         alpha_max = 2.0, alpha_min = 1.5, D_ref = 12
         """
-        ALPHA_MAX = 2.0
-        ALPHA_MIN = 1.5
-        D_REF = 12
-        return ALPHA_MIN + ((ALPHA_MAX - ALPHA_MIN) * (D_REF / (duration_months + D_REF)))
+        return _alpha(duration_months)
 
     @staticmethod
     def calculate_phase_count(risk_factor_c: float, funding_goal: float, duration_months: int, campaign_type_adj: int = -1) -> int:
@@ -31,23 +95,7 @@ class AlgorithmService:
         FRF = (F / F') * (P_max - NFRT)
         P = round(NFRT + FRF)
         """
-        # Constants
-        F_PRIME = 1000000.0  # Prototype ceiling
-        P_MAX = 12
-        D_REF = 12
-        C_REF = 0.6  # Baseline risk (midpoint of 0.3-0.9)
-        
-        # Non-Financial Risk Term (NFRT)
-        nfrt = 3 + (duration_months / (duration_months + D_REF)) + (risk_factor_c / (risk_factor_c + C_REF)) + campaign_type_adj
-        
-        # Financial Risk Factor (FRF)
-        frf_max = P_MAX - nfrt
-        f_ratio = min(1.0, funding_goal / F_PRIME)
-        frf = f_ratio * frf_max
-        
-        p_raw = nfrt + frf
-        p = round(p_raw)
-        return max(3, min(12, int(p)))
+        return _phase_count(_risk_key(risk_factor_c), duration_months, _goal_key(funding_goal), campaign_type_adj)
 
     @staticmethod
     def calculate_milestone_weights(num_phases: int, alpha: float) -> list[float]:
@@ -55,15 +103,89 @@ class AlgorithmService:
         Calculate weights for each phase based on alpha.
         Wi = i^alpha / sum(j^alpha)
         """
-        weights = []
-        total_weight = 0
-        
-        for i in range(1, num_phases + 1):
-            w = math.pow(i, alpha)
-            weights.append(w)
-            total_weight += w
-            
-        # Normalize
-        normalized_weights = [w / total_weight for w in weights]
-        return normalized_weights
+        return list(_weights(int(num_phases), _alpha_key(alpha)))
+
+    @staticmethod
+    def cache_info() -> Dict[str, Tuple]:
+        return {
+            "alpha": _alpha.cache_info(),
+            "phase_count": _phase_count.cache_info(),
+            "weights": _weights.cache_info()
+        }
+
+    @staticmethod
+    def clear_caches():
+        _alpha.cache_clear()
+        _phase_count.cache_clear()
+        _weights.cache_clear()
+
+    # Vectorized variants for bulk creation and what-if planning. Each mirrors
+    # the scalar method above element-wise (np.rint rounds half to even like round()).
+
+    @staticmethod
+    def calculate_risk_factor_c_batch(l1_risk: np.ndarray, l2_risk: np.ndarray, l1_weight: float = 0.7, l2_weight: float = 0.3) -> np.ndarray:
+        return np.clip((l1_weight * l1_risk) + (l2_weight * l2_risk), 0.30, 0.90)
+
+    @staticmethod
+    def calculate_alpha_batch(duration_months: np.ndarray) -> np.ndarray:
+        return ALPHA_MIN + ((ALPHA_MAX - ALPHA_MIN) * (D_REF / (duration_months + D_REF)))
+
+    @staticmethod
+    def calculate_phase_count_batch(risk_factor_c: np.ndarray, funding_goal: np.ndarray, duration_months: np.ndarray, campaign_type_adj: int = -1) -> np.ndarray:
+        risk_factor_c = np.round(risk_factor_c, RISK_KEY_DIGITS)
+        funding_goal = np.round(np.minimum(funding_goal, F_PRIME), GOAL_KEY_DIGITS)
+
+        nfrt = 3 + (duration_months / (duration_months + D_REF)) + (risk_factor_c / (risk_factor_c + C_REF)) + campaign_type_adj
+        f_ratio = np.minimum(1.0, funding_goal / F_PRIME)
+        p = np.rint(nfrt + f_ratio * (P_MAX - nfrt))
+        return np.clip(p, P_MIN, P_MAX).astype(int)
+
+    @staticmethod
+    def calculate_milestone_weights_batch(num_phases: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+        """
+        Weights for many campaigns at once.
+        Returns an (N, max(num_phases)) matrix; row k holds Wi for i <= num_phases[k], zeros after.
+
+        Rows are filled from the (P, rounded alpha) weight cache, so the work
+        scales with the number of distinct pairs rather than with N.
+        """
+        num_phases = np.asarray(num_phases, dtype=int)
+        alpha = np.round(np.asarray(alpha, dtype=float), ALPHA_KEY_DIGITS)
+        matrix = np.zeros((len(num_phases), int(num_phases.max()) if len(num_phases) else 0))
+
+        pairs, inverse = np.unique(np.column_stack((num_phases, alpha)), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for k, (p, a) in enumerate(pairs):
+            p = int(p)
+            matrix[inverse == k, :p] = _weights(p, float(a))
+        return matrix
+
+    @staticmethod
+    def calculate_milestone_plan_batch(
+        l1_risk: np.ndarray,
+        l2_risk: np.ndarray,
+        funding_goal: np.ndarray,
+        duration_months: np.ndarray,
+        campaign_type_adj: int = -1
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate many parameter sets in one call.
+
+        Returns arrays keyed risk_factor_c, alpha and phase_count (length N),
+        and weights / release_amounts ((N, max P) matrices, zero-padded).
+        """
+        funding_goal = np.asarray(funding_goal, dtype=float)
+        duration_months = np.asarray(duration_months, dtype=float)
+
+        risk_c = AlgorithmService.calculate_risk_factor_c_batch(np.asarray(l1_risk, dtype=float), np.asarray(l2_risk, dtype=float))
+        alpha = AlgorithmService.calculate_alpha_batch(duration_months)
+        phase_counts = AlgorithmService.calculate_phase_count_batch(risk_c, funding_goal, duration_months, campaign_type_adj)
+        weights = AlgorithmService.calculate_milestone_weights_batch(phase_counts, alpha)
 
+        return {
+            "risk_factor_c": risk_c,
+            "alpha": alpha,
+            "phase_count": phase_counts,
+            "weights": weights,
+            "release_amounts": funding_goal[:, np.newaxis] * weights
+        }
@@ -1,13 +1,36 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.campaign import Campaign
 from app.models.milestone import Milestone
 from app.models.escrow import EscrowAccount
+from app.models.transaction import Contribution
 from app.models.user import FundraiserProfile
-from app.services.algorithm_service import AlgorithmService
+from app.models.change_tombstone import ChangeTombstone
+from app.db.change_version import commit_horizon
+from app.services.algorithm_service import AlgorithmService, _risk_key, _goal_key
+from app.core.reference_data import reference_data
 from datetime import datetime, timedelta
-from typing import List, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Tuple, Optional
+from functools import lru_cache
+import numpy as np
 import uuid
 
+# One plan cell per (risk key, goal key, duration), the rounded keys
+# AlgorithmService memoizes on, so arbitrary goals from clients still land on
+# a bounded set of entries. Release amounts scale with the exact goal and are
+# filled in per request; see CampaignService.plan_milestones
+@lru_cache(maxsize=4096)
+def _plan_cell(risk_key: float, goal_key: float, duration_months: int) -> Tuple[float, int, Tuple[Tuple[float, float, timedelta], ...]]:
+    alpha = AlgorithmService.calculate_alpha(duration_months)
+    phase_count = AlgorithmService.calculate_phase_count(risk_key, goal_key, duration_months)
+    weights = AlgorithmService.calculate_milestone_weights(phase_count, alpha)
+    # Same schedule as CampaignService.milestone_deadline_days, for one campaign
+    seeding = max(0.1 * duration_months, 0.1)
+    interval = (duration_months - seeding) / (phase_count - 1) if phase_count > 1 else 0.0
+    offsets = [(seeding + i * interval) * 30 for i in range(phase_count)]
+    return alpha, phase_count, tuple((weight, days, timedelta(days=days)) for weight, days in zip(weights, offsets))
+
+
 class CampaignService:
     @staticmethod
     def create_campaign(
@@ -32,8 +55,7 @@ class CampaignService:
         # Calculate Algorithmic Parameters
         # Risk Factor C
         # Using L1/L2 weights from profile if available, else defaults
-        l1_risk = float(profile.industry_l1.l1_risk_weight) if profile.industry_l1 else 0.5
-        l2_risk = float(profile.industry_l2.l2_risk_weight) if profile.industry_l2 else 0.5
+        l1_risk, l2_risk = reference_data.risk_weights(profile.industry_l1_id, profile.industry_l2_id, db)
         risk_c = AlgorithmService.calculate_risk_factor_c(l1_risk, l2_risk)
         
         # Alpha
@@ -107,3 +129,235 @@ class CampaignService:
         db.refresh(campaign)
         return campaign
 
+    @staticmethod
+    def bulk_create_campaigns(db: Session, campaigns: List[Dict[str, Any]]) -> List[uuid.UUID]:
+        """
+        Create many campaigns with their escrows and milestones in one transaction.
+
+        Each item takes the create_campaign arguments (fundraiser_id, title,
+        description, funding_goal, duration_months and optionally category,
+        campaign_type, budget_data). Risk, alpha, phase counts and milestone
+        weights are computed for the whole batch with NumPy and the rows are
+        written as three multi-row INSERTs. Returns the new campaign ids in
+        input order.
+        """
+        if not campaigns:
+            return []
+
+        fundraiser_ids = {item["fundraiser_id"] for item in campaigns}
+        profiles = {
+            p.fundraiser_id: p for p in db.query(FundraiserProfile)
+            .filter(FundraiserProfile.fundraiser_id.in_(fundraiser_ids))
+        }
+        missing = fundraiser_ids - profiles.keys()
+        if missing:
+            raise ValueError(f"Fundraiser profile not found: {', '.join(str(m) for m in missing)}")
+
+        l1_risk, l2_risk = np.array([
+            reference_data.risk_weights(profile.industry_l1_id, profile.industry_l2_id, db)
+            for profile in (profiles[item["fundraiser_id"]] for item in campaigns)
+        ]).T
+        goals = np.array([float(item["funding_goal"]) for item in campaigns])
+        durations = np.array([item["duration_months"] for item in campaigns], dtype=float)
+
+        plan = AlgorithmService.calculate_milestone_plan_batch(l1_risk, l2_risk, goals, durations)
+        risk_c, alpha, phase_counts = plan["risk_factor_c"], plan["alpha"], plan["phase_count"]
+        weights, release_amounts = plan["weights"], plan["release_amounts"]
+
+        deadline_days = CampaignService.milestone_deadline_days(durations, phase_counts, weights.shape[1])
+
+        start_time = datetime.utcnow()
+        campaign_rows, escrow_rows, milestone_rows = [], [], []
+        for k, item in enumerate(campaigns):
+            campaign_id = uuid.uuid4()
+            campaign_rows.append({
+                "campaign_id": campaign_id,
+                "fundraiser_id": item["fundraiser_id"],
+                "title": item["title"],
+                "description": item["description"],
+                "funding_goal_f": item["funding_goal"],
+                "duration_d": item["duration_months"],
+                "campaign_type_ct": item.get("campaign_type", 'donation'),
+                "category": item.get("category", 'General'),
+                "category_c": float(risk_c[k]),
+                "num_phases_p": int(phase_counts[k]),
+                "alpha_value": float(alpha[k]),
+                "budget_data": item.get("budget_data"),
+                "status": 'draft',
+                "created_at": start_time,
+                "updated_at": start_time
+            })
+            escrow_rows.append({"escrow_id": uuid.uuid4(), "campaign_id": campaign_id})
+            for i in range(int(phase_counts[k])):
+                milestone_rows.append({
+                    "milestone_id": uuid.uuid4(),
+                    "campaign_id": campaign_id,
+                    "milestone_number": i + 1,
+                    "phase_weight_wi": float(weights[k, i]),
+                    "disbursement_percentage_di": float(weights[k, i]),
+                    "release_amount": float(release_amounts[k, i]),
+                    "target_deadline": start_time + timedelta(days=float(deadline_days[k, i])),
+                    "status": 'pending',
+                    "created_at": start_time
+                })
+
+        db.execute(insert(Campaign), campaign_rows)
+        db.execute(insert(EscrowAccount), escrow_rows)
+        db.execute(insert(Milestone), milestone_rows)
+        db.commit()
+        return [row["campaign_id"] for row in campaign_rows]
+
+    @staticmethod
+    def milestone_deadline_days(durations: np.ndarray, phase_counts: np.ndarray, max_phases: int) -> np.ndarray:
+        """
+        Deadline offsets in days from launch: seeding phase, then even
+        intervals (same schedule as create_campaign). Returns (N, max_phases).
+        """
+        seeding = np.maximum(0.1 * durations, 0.1)
+        interval = np.where(phase_counts > 1, (durations - seeding) / np.maximum(phase_counts - 1, 1), 0.0)
+        phase_offsets = np.arange(max_phases)
+        return (seeding[:, np.newaxis] + phase_offsets[np.newaxis, :] * interval[:, np.newaxis]) * 30
+
+    @staticmethod
+    def plan_milestones(
+        risk_weights: List[Tuple[float, float]],
+        funding_goals: List[float],
+        durations: List[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        What-if milestone plans, computed in memory without touching the database.
+
+        Evaluates every (risk_weights, funding_goal, duration) combination, in
+        that nesting order. risk_weights holds (l1_risk, l2_risk) pairs, one
+        per industry category compared. Phase counts, weights and deadline
+        offsets are cached per cell; deadlines are counted from now.
+        """
+        now = datetime.utcnow()
+        plans = []
+        durations = [int(months) for months in durations]
+        goals = [(float(goal), _goal_key(goal)) for goal in funding_goals]
+        for l1_risk, l2_risk in risk_weights:
+            risk_c = AlgorithmService.calculate_risk_factor_c(float(l1_risk), float(l2_risk))
+            risk_key = _risk_key(risk_c)
+            for goal, goal_key in goals:
+                for months in durations:
+                    alpha, phase_count, cells = _plan_cell(risk_key, goal_key, months)
+                    plans.append({
+                        "funding_goal": goal,
+                        "duration_months": months,
+                        "risk_factor_c": risk_c,
+                        "alpha": alpha,
+                        "phase_count": phase_count,
+                        "milestones": [
+                            {
+                                "milestone_number": i + 1,
+                                "phase_weight_wi": weight,
+                                "release_amount": round(goal * weight, 2),
+                                "deadline_days": days,
+                                "target_deadline": now + deadline
+                            }
+                            for i, (weight, days, deadline) in enumerate(cells)
+                        ]
+                    })
+        return plans
+
+    @staticmethod
+    def _tombstones(db: Session, entity: str, scope_id: uuid.UUID, since_version: int) -> List[Tuple[uuid.UUID, int]]:
+        return db.query(ChangeTombstone.entity_id, ChangeTombstone.change_version).filter(
+            ChangeTombstone.entity == entity,
+            ChangeTombstone.scope_id == scope_id,
+            ChangeTombstone.change_version > since_version
+        ).all()
+
+    @staticmethod
+    def _next_version(since_version: int, horizon: Optional[int], versions: List[int]) -> int:
+        # Without a horizon (SQLite) every visible version is final
+        if horizon is None:
+            return max([since_version] + versions)
+        return max(since_version, horizon)
+
+    @staticmethod
+    def timeline_delta(db: Session, campaign_id: uuid.UUID, since_version: int) -> Dict[str, Any]:
+        """
+        Milestones of a campaign written after since_version, plus the ids of
+        deleted ones. "version" is the since_version for the next call; rows
+        a still-running transaction commits later land above it.
+        """
+        horizon = commit_horizon(db)
+        changed = db.query(Milestone).options(selectinload(Milestone.evidence)).filter(
+            Milestone.campaign_id == campaign_id,
+            Milestone.change_version > since_version
+        ).order_by(Milestone.milestone_number).all()
+        deleted = CampaignService._tombstones(db, 'milestone', campaign_id, since_version)
+        return {
+            "version": CampaignService._next_version(
+                since_version, horizon, [m.change_version for m in changed] + [v for _, v in deleted]
+            ),
+            "changed": changed,
+            "deleted": [entity_id for entity_id, _ in deleted]
+        }
+
+    @staticmethod
+    def fundraiser_campaigns_delta(db: Session, fundraiser_id: uuid.UUID, since_version: int) -> Dict[str, Any]:
+        """
+        A fundraiser's campaigns that were written, or had a milestone
+        written, after since_version (CampaignOut embeds the milestones),
+        plus the ids of deleted ones, with the same cursor as timeline_delta.
+        """
+        horizon = commit_horizon(db)
+        milestone_changed = select(Milestone.campaign_id).where(
+            Milestone.campaign_id == Campaign.campaign_id,
+            Milestone.change_version > since_version
+        ).exists()
+        changed = db.query(Campaign).options(*CampaignService.campaign_out_options()).filter(
+            Campaign.fundraiser_id == fundraiser_id,
+            (Campaign.change_version > since_version) | milestone_changed
+        ).all()
+        if changed:
+            CampaignService.attach_backers_counts(
+                changed, db.execute(CampaignService.backers_count_statement(c.campaign_id for c in changed)).all()
+            )
+        deleted = CampaignService._tombstones(db, 'campaign', fundraiser_id, since_version)
+        versions = [v for _, v in deleted]
+        for campaign in changed:
+            versions.append(campaign.change_version)
+            versions.extend(m.change_version for m in campaign.milestones)
+        return {
+            "version": CampaignService._next_version(since_version, horizon, versions),
+            "changed": changed,
+            "deleted": [entity_id for entity_id, _ in deleted]
+        }
+
+    @staticmethod
+    def campaign_out_options() -> list:
+        """
+        Loader options that populate everything CampaignOut reads, so a list of
+        campaigns serializes without lazy loads (required on an AsyncSession).
+        """
+        return [
+            joinedload(Campaign.fundraiser),
+            selectinload(Campaign.milestones).selectinload(Milestone.evidence),
+        ]
+
+    @staticmethod
+    def backers_count_statement(campaign_ids: Iterable[uuid.UUID]):
+        """
+        One grouped query for the distinct backers of many campaigns.
+        """
+        return select(
+            Contribution.campaign_id,
+            func.count(func.distinct(Contribution.contributor_id))
+        ).where(
+            Contribution.campaign_id.in_(list(campaign_ids)),
+            Contribution.status == 'completed'
+        ).group_by(Contribution.campaign_id)
+
+    @staticmethod
+    def attach_backers_counts(campaigns: List[Campaign], rows: Iterable[Tuple[uuid.UUID, int]]) -> List[Campaign]:
+        """
+        Store preloaded backer counts on the instances read by Campaign.backers_count.
+        """
+        counts = {campaign_id: count for campaign_id, count in rows}
+        for campaign in campaigns:
+            campaign._backers_count = counts.get(campaign.campaign_id, 0)
+        return campaigns
@@ -1,8 +1,10 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from app.models.campaign import Campaign
 from datetime import datetime, timedelta
 from uuid import UUID
 from typing import List
+from app.core.response_cache import mark_campaign_changed
 
 class CampaignStateService:
     # Define valid status transitions
@@ -25,41 +27,87 @@ class CampaignStateService:
         return next_status in allowed_next
 
     @staticmethod
-    def transition_status(db: Session, campaign_id: UUID, next_status: str) -> Campaign:
+    def allowed_sources(next_status: str) -> List[str]:
         """
-        Transitions a campaign to a new status with validation and timestamp markers.
+        Statuses from which next_status may be entered.
         """
-        campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).first()
-        if not campaign:
-            raise ValueError("Campaign not found")
+        return [status for status, allowed_next in CampaignStateService.VALID_TRANSITIONS.items()
+                if next_status in allowed_next]
+
+    @staticmethod
+    def transition_status(db: Session, campaign_id: UUID, next_status: str, expected_version: int = None) -> Campaign:
+        """
+        Transitions a campaign to a new status with validation and timestamp markers.
 
-        if not CampaignStateService.validate_transition(campaign.status, next_status):
-            raise ValueError(f"Invalid transition from {campaign.status} to {next_status}")
+        Done as one compare-and-set UPDATE guarded on the current status (and
+        expected_version if given) that bumps campaign.version, so concurrent
+        transitions cannot overwrite each other; the loser gets a ValueError.
+        """
+        now = datetime.utcnow()
+        values = {"status": next_status, "version": Campaign.version + 1}
+        guards = [
+            Campaign.campaign_id == campaign_id,
+            Campaign.status.in_(CampaignStateService.allowed_sources(next_status))
+        ]
 
-        campaign.status = next_status
-        
         # Apply timestamp markers based on status
-        now = datetime.utcnow()
         if next_status == 'pending_review':
-            campaign.submitted_for_review_at = now
+            values["submitted_for_review_at"] = now
         elif next_status == 'active':
-            campaign.launched_at = now
-            campaign.funding_start_date = now
+            # The end date depends on duration_d, so read it and pin the version it came from
+            row = db.query(Campaign.duration_d, Campaign.version).filter(Campaign.campaign_id == campaign_id).first()
+            if not row:
+                raise ValueError("Campaign not found")
+            duration_d, read_version = row
+            if expected_version is None:
+                expected_version = read_version
+            values["launched_at"] = now
+            values["funding_start_date"] = now
             # Assume 30 days per month for duration_d calculation
-            campaign.funding_end_date = now + (timedelta(days=int(campaign.duration_d) * 30) if campaign.duration_d else timedelta(days=30))
+            values["funding_end_date"] = now + (timedelta(days=int(duration_d) * 30) if duration_d else timedelta(days=30))
         elif next_status == 'funded':
-            campaign.funded_at = now
+            values["funded_at"] = now
         elif next_status == 'in_phases':
-            campaign.phases_started_at = now
-            campaign.current_milestone_number = 1
+            values["phases_started_at"] = now
+            values["current_milestone_number"] = 1
         elif next_status == 'completed':
-            campaign.completed_at = now
+            values["completed_at"] = now
         elif next_status == 'failed':
-            campaign.failed_at = now
+            values["failed_at"] = now
 
+        if expected_version is not None:
+            guards.append(Campaign.version == expected_version)
+
+        new_version = db.execute(
+            update(Campaign)
+            .where(*guards)
+            .values(**values)
+            .returning(Campaign.version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+
+        if new_version is None:
+            CampaignStateService._raise_lost_transition(db, campaign_id, next_status, expected_version)
+
+        mark_campaign_changed(db, campaign_id)
         db.commit()
-        db.refresh(campaign)
-        return campaign
+        return db.get(Campaign, campaign_id, populate_existing=True)
+
+    @staticmethod
+    def _raise_lost_transition(db: Session, campaign_id: UUID, next_status: str, expected_version: int = None):
+        """
+        The guarded UPDATE matched nothing; report why.
+        """
+        row = db.query(Campaign.status, Campaign.version).filter(Campaign.campaign_id == campaign_id).first()
+        if not row:
+            raise ValueError("Campaign not found")
+
+        status, version = row
+        if not CampaignStateService.validate_transition(status, next_status):
+            raise ValueError(f"Invalid transition from {status} to {next_status}")
+        raise ValueError(
+            f"Campaign was modified concurrently (expected version {expected_version}, found {version})"
+        )
 
     @staticmethod
     def launch_campaign(db: Session, campaign_id: UUID) -> Campaign:
@@ -1,110 +1,220 @@
+from sqlalchemy import update, select, case, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.transaction import Contribution, TransactionLedger
 from app.models.campaign import Campaign
 from app.models.escrow import EscrowAccount
 from app.models.vote import VoteToken
 from app.models.user import User
+from app.core.response_cache import mark_campaign_changed
 from datetime import datetime
+from decimal import Decimal
 import uuid
 import hashlib
 
 class ContributionService:
+    ALLOWED_STATUSES = ['active', 'draft', 'funded', 'in_phases']
+
     @staticmethod
     def create_contribution(
         db: Session,
         campaign_id: uuid.UUID,
         contributor_id: uuid.UUID,
         amount: float,
-        reference_code: str = None
+        reference_code: str = None,
+        idempotency_key: str = None
     ):
         """
         Process a contribution:
-        1. Verify campaign is active
-        2. Create Contribution record
-        3. Update Campaign totals
-        4. Update Escrow balance
-        5. Create Transaction Ledger entry
-        6. Generate Vote Token if not exists
+        1. Insert Contribution record, or stop if idempotency_key was already used
+        2. Atomically add to campaign totals if the campaign accepts funds and
+           the pledge fits in the remaining goal (conditional UPDATE ... RETURNING)
+        3. Update Escrow balance and create Transaction Ledger entry
+        4. Upsert Vote Token
+
+        No row is read-locked; the campaign row is only held by its own UPDATE
+        until commit, so concurrent pledges to one campaign queue for a single
+        statement rather than for the whole call. A retry with the same
+        idempotency_key waits on the unique index at most, then returns the
+        original contribution with "duplicate": True.
         """
-        # Verify Campaign
-        campaign = db.query(Campaign).filter(Campaign.campaign_id == campaign_id).with_for_update().first()
-        if not campaign:
-            raise ValueError("Campaign not found")
-        
-        allowed_statuses = ['active', 'draft', 'funded', 'in_phases']
-        if campaign.status not in allowed_statuses:
-             raise ValueError(f"Campaign is not accepting funds. Current status: {campaign.status}")
-
-        from decimal import Decimal
-        remaining = Decimal(str(campaign.funding_goal_f)) - (campaign.total_contributions or Decimal('0'))
-        if Decimal(str(amount)) > remaining:
-            raise ValueError(f"Transaction failed. This project only requires KES {remaining} to be fully funded.")
-
-        #Create Contribution
-        contribution = Contribution(
-            campaign_id=campaign_id,
-            contributor_id=contributor_id,
-            amount=amount,
-            status='completed' 
-        )
-        db.add(contribution)
-        db.flush() 
-
-        #Update Campaign
-        campaign.total_contributions = (campaign.total_contributions or Decimal('0')) + Decimal(str(amount))
-        
-        if campaign.total_contributions >= campaign.funding_goal_f and campaign.status != 'in_phases':
-            from app.services.campaign_state_service import CampaignStateService
-            CampaignStateService.start_phases(db, campaign_id)
-            campaign.funded_at = datetime.utcnow()
-        
-        #Update Escrow & Transaction Ledger
-        escrow = db.query(EscrowAccount).filter(EscrowAccount.campaign_id == campaign_id).first()
-        if not escrow:
-            escrow = EscrowAccount(campaign_id=campaign_id)
-            db.add(escrow)
-            db.flush()
-            
-        from app.services.transaction_service import TransactionService
-        from decimal import Decimal
-        TransactionService.record_contribution(
-            db=db,
-            contribution_id=contribution.contribution_id,
-            escrow_id=escrow.escrow_id,
-            amount=Decimal(str(amount)),
-            reference_code=reference_code
-        )
+        amount = Decimal(str(amount))
+        now = datetime.utcnow()
+        insert = ContributionService._dialect_insert(db)
 
-        #Generate Vote Token and Check if contributor already has a token for this campaign
-        existing_token = db.query(VoteToken).filter(
-            VoteToken.campaign_id == campaign_id,
-            VoteToken.contributor_id == contributor_id
-        ).first()
-        
-        vote_token_id = None
-        if not existing_token:
-            token_raw = f"{campaign_id}-{contributor_id}-{datetime.utcnow().timestamp()}"
-            token_hash = hashlib.sha256(token_raw.encode()).hexdigest()
-            
-            new_token = VoteToken(
-                campaign_id=campaign_id,
-                contributor_id=contributor_id,
-                token_hash=token_hash
-            )
-            db.add(new_token)
+        try:
+            #Create Contribution
+            try:
+                contribution_id = db.execute(
+                    insert(Contribution).values(
+                        contribution_id=uuid.uuid4(),
+                        campaign_id=campaign_id,
+                        contributor_id=contributor_id,
+                        amount=amount,
+                        status='completed',
+                        idempotency_key=idempotency_key,
+                        created_at=now
+                    )
+                    .on_conflict_do_nothing(index_elements=[Contribution.idempotency_key])
+                    .returning(Contribution.contribution_id)
+                ).scalar()
+            except IntegrityError:
+                db.rollback()
+                if db.query(Campaign.campaign_id).filter(Campaign.campaign_id == campaign_id).first() is None:
+                    raise ValueError("Campaign not found")
+                raise
+
+            if contribution_id is None:
+                db.rollback()
+                return ContributionService._existing_result(db, idempotency_key)
+
+            new_total = func.coalesce(Campaign.total_contributions, 0) + amount
+            campaign_row = db.execute(
+                update(Campaign)
+                .where(
+                    Campaign.campaign_id == campaign_id,
+                    Campaign.status.in_(ContributionService.ALLOWED_STATUSES),
+                    new_total <= Campaign.funding_goal_f
+                )
+                .values(
+                    total_contributions=new_total,
+                    funded_at=case((new_total >= Campaign.funding_goal_f, now), else_=Campaign.funded_at)
+                )
+                .returning(Campaign.total_contributions, Campaign.funding_goal_f, Campaign.status)
+                .execution_options(synchronize_session=False)
+            ).first()
+
+            if campaign_row is None:
+                ContributionService._raise_rejected(db, campaign_id)
+            total_raised, funding_goal, status = campaign_row
+
+            #Update Escrow & Transaction Ledger
+            escrow_row = db.execute(
+                update(EscrowAccount)
+                .where(EscrowAccount.campaign_id == campaign_id)
+                .values(
+                    total_contributions=EscrowAccount.total_contributions + amount,
+                    balance=EscrowAccount.balance + amount
+                )
+                .returning(EscrowAccount.escrow_id, EscrowAccount.balance)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if escrow_row is None:
+                escrow = EscrowAccount(
+                    escrow_id=uuid.uuid4(),
+                    campaign_id=campaign_id,
+                    total_contributions=amount,
+                    balance=amount
+                )
+                db.add(escrow)
+                escrow_id, escrow_balance = escrow.escrow_id, amount
+            else:
+                escrow_id, escrow_balance = escrow_row
+
+            db.add(TransactionLedger(
+                escrow_id=escrow_id,
+                contribution_id=contribution_id,
+                transaction_type='contribution',
+                amount=amount,
+                reference_code=reference_code
+            ))
             db.flush()
-            vote_token_id = new_token.token_id
-        else:
-            vote_token_id = existing_token.token_id
 
-        db.commit()
-        db.refresh(contribution)
-        db.refresh(campaign)
-        db.refresh(escrow)
-        
+            #Generate Vote Token unless the contributor already holds one for this campaign
+            vote_token_id = ContributionService._upsert_vote_token(db, insert, campaign_id, contributor_id, now)
+
+            # Totals and backer count changed
+            mark_campaign_changed(db, campaign_id)
+
+            # Only the pledge that fills the goal can get here (later ones fail the cap)
+            if total_raised >= funding_goal and status != 'in_phases':
+                from app.services.campaign_state_service import CampaignStateService
+                CampaignStateService.start_phases(db, campaign_id)
+            else:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        contribution = db.get(Contribution, contribution_id)
+
         return {
             "contribution": contribution,
-            "campaign_total_raised": campaign.total_contributions,
-            "escrow_balance": escrow.balance,
+            "campaign_total_raised": total_raised,
+            "escrow_balance": escrow_balance,
             "vote_token_id": vote_token_id
         }
+
+    @staticmethod
+    def _raise_rejected(db: Session, campaign_id: uuid.UUID):
+        """
+        The conditional UPDATE matched nothing; work out which check failed.
+        """
+        row = db.execute(
+            select(Campaign.status, Campaign.funding_goal_f, Campaign.total_contributions)
+            .where(Campaign.campaign_id == campaign_id)
+        ).first()
+        if row is None:
+            raise ValueError("Campaign not found")
+
+        status, funding_goal, total = row
+        if status not in ContributionService.ALLOWED_STATUSES:
+            raise ValueError(f"Campaign is not accepting funds. Current status: {status}")
+
+        remaining = Decimal(str(funding_goal)) - (total or Decimal('0'))
+        raise ValueError(f"Transaction failed. This project only requires KES {remaining} to be fully funded.")
+
+    @staticmethod
+    def _existing_result(db: Session, idempotency_key: str):
+        """
+        Result for a contribution that was already recorded under idempotency_key.
+        """
+        contribution = db.query(Contribution).filter(Contribution.idempotency_key == idempotency_key).one()
+        total_raised = db.query(Campaign.total_contributions)\
+            .filter(Campaign.campaign_id == contribution.campaign_id).scalar()
+        escrow_balance = db.query(EscrowAccount.balance)\
+            .filter(EscrowAccount.campaign_id == contribution.campaign_id).scalar()
+        vote_token_id = db.query(VoteToken.token_id).filter(
+            VoteToken.campaign_id == contribution.campaign_id,
+            VoteToken.contributor_id == contribution.contributor_id
+        ).scalar()
+
+        return {
+            "contribution": contribution,
+            "campaign_total_raised": total_raised,
+            "escrow_balance": escrow_balance,
+            "vote_token_id": vote_token_id,
+            "duplicate": True
+        }
+
+    @staticmethod
+    def _dialect_insert(db: Session):
+        """
+        INSERT construct with ON CONFLICT support for the session's database.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert
+
+    @staticmethod
+    def _upsert_vote_token(db: Session, insert, campaign_id: uuid.UUID, contributor_id: uuid.UUID, now: datetime) -> uuid.UUID:
+        """
+        INSERT ... ON CONFLICT on (campaign_id, contributor_id) returning the
+        existing or new token id in one statement.
+        """
+        token_raw = f"{campaign_id}-{contributor_id}-{now.timestamp()}"
+        stmt = insert(VoteToken).values(
+            token_id=uuid.uuid4(),
+            campaign_id=campaign_id,
+            contributor_id=contributor_id,
+            token_hash=hashlib.sha256(token_raw.encode()).hexdigest(),
+            created_at=now
+        )
+        # No-op update so RETURNING also yields the id of an existing token
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[VoteToken.campaign_id, VoteToken.contributor_id],
+            set_={"token_hash": VoteToken.token_hash}
+        ).returning(VoteToken.token_id)
+        return db.execute(stmt).scalar_one()
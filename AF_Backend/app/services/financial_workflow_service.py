@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy.orm import Session
 from app.models.milestone import Milestone
 from app.models.campaign import Campaign
@@ -9,6 +10,9 @@ from datetime import datetime
 from uuid import UUID, uuid4
 from decimal import Decimal
 from app.services.campaign_state_service import CampaignStateService
+from app.core.response_cache import mark_campaign_changed
+
+logger = logging.getLogger(__name__)
 
 class FinancialWorkflowService:
 
@@ -82,10 +86,11 @@ class FinancialWorkflowService:
         if released_milestones == total_milestones:
             CampaignStateService.complete_campaign(db, campaign.campaign_id)
             
-            print(f"[FINANCIAL] Campaign {campaign.campaign_id} transitioned to COMPLETED status.")
+            logger.info(f"Campaign {campaign.campaign_id} transitioned to COMPLETED status.")
         else:
             pass
             
+        mark_campaign_changed(db, campaign.campaign_id)
         db.commit()
         return True
 
@@ -154,5 +159,6 @@ class FinancialWorkflowService:
         campaign.status = 'failed'
         campaign.failed_at = datetime.utcnow()
 
+        mark_campaign_changed(db, campaign_id)
         db.commit()
         return refund_stats
@@ -6,6 +6,7 @@ from app.models.vote import VoteSubmission, VoteResult
 from datetime import datetime, timedelta
 from uuid import UUID
 from typing import Optional, List
+from app.core.response_cache import mark_campaign_changed
 
 class MilestoneWorkflowService:
     
@@ -35,6 +36,7 @@ class MilestoneWorkflowService:
             db, campaign.fundraiser_id, campaign.title, milestone.milestone_number
         )
         
+        mark_campaign_changed(db, milestone.campaign_id)
         db.commit()
         db.refresh(milestone)
         return milestone
@@ -90,6 +92,7 @@ class MilestoneWorkflowService:
             milestone.campaign_id, milestone.campaign.title, milestone.milestone_number
         )
         
+        mark_campaign_changed(db, milestone.campaign_id)
         db.commit()
         db.refresh(milestone)
         return milestone
@@ -117,6 +120,7 @@ class MilestoneWorkflowService:
             milestone.campaign_id, milestone.campaign.title, milestone.milestone_number
         )
         
+        mark_campaign_changed(db, milestone.campaign_id)
         db.commit()
         db.refresh(milestone)
         return milestone
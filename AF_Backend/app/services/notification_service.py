@@ -1,6 +1,7 @@
 import firebase_admin
 from firebase_admin import credentials, messaging
 from app.core.config import settings
+from app.core.instrumentation import outbound
 import os
 import logging
 import uuid
@@ -62,7 +63,8 @@ class NotificationService:
                 data=data or {},
                 token=user.fcm_token,
             )
-            messaging.send(message)
+            with outbound("fcm"):
+                messaging.send(message)
         except Exception as e:
             logger.error(f"Failed to send push to user {user_id}: {e}")
 
@@ -79,7 +81,8 @@ class NotificationService:
                 data=data or {},
                 topic=topic,
             )
-            messaging.send(message)
+            with outbound("fcm"):
+                messaging.send(message)
         except Exception as e:
             logger.error(f"Failed to send topic broadcast to {topic}: {e}")
 
@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy.orm import Session
 import requests
 import base64
@@ -8,11 +9,16 @@ from typing import Dict, Any, Optional
 from app.models.campaign import Campaign
 from app.models.user import User
 from app.services.contribution_service import ContributionService
-from app.core.redis import save_stk_session, get_stk_session, delete_stk_session
+from app.core.redis import save_stk_session, get_stk_session, delete_stk_session, pin_to_primary, set_payment_status
+import time
+from app.db.replica import HAS_REPLICA
 from app.core.config import settings
+from app.core.instrumentation import outbound
 import re
 from app.services.notification_service import NotificationService
 
+logger = logging.getLogger(__name__)
+
 class PaymentService:
     @staticmethod
     def _get_mpesa_access_token() -> Optional[str]:
@@ -22,14 +28,15 @@ class PaymentService:
             url = "https://api.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
             
         try:
-            response = requests.get(
-                url, 
-                auth=(settings.MPESA_CONSUMER_KEY, settings.MPESA_CONSUMER_SECRET)
-            )
+            with outbound("daraja"):
+                response = requests.get(
+                    url, 
+                    auth=(settings.MPESA_CONSUMER_KEY, settings.MPESA_CONSUMER_SECRET)
+                )
             response.raise_for_status()
             return response.json().get("access_token")
         except Exception as e:
-            print(f"Failed to get M-Pesa token: {e}")
+            logger.error(f"Failed to get M-Pesa token: {e}")
             return None
 
     @staticmethod
@@ -81,7 +88,8 @@ class PaymentService:
         headers = {"Authorization": f"Bearer {access_token}"}
         
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            with outbound("daraja"):
+                response = requests.post(url, json=payload, headers=headers)
             response_data = response.json()
             
             if response.status_code == 200 and response_data.get("ResponseCode") == "0":
@@ -95,6 +103,13 @@ class PaymentService:
                     "phone_number": phone_number
                 }
                 save_stk_session(checkout_request_id, session_data)
+                set_payment_status(
+                    checkout_request_id, "pending",
+                    campaign_id=str(campaign_id),
+                    contributor_id=str(contributor_id),
+                    amount=float(amount),
+                    created_at=time.time()
+                )
                 
                 return {
                     "status": "pending",
@@ -102,89 +117,135 @@ class PaymentService:
                     "message": "STK Push sent. Please check your phone for the M-Pesa prompt."
                 }
             else:
-                print(f"DEBUG: Safaricom Raw Error Response: {response_data}")
+                logger.warning(f"Safaricom rejected STK push: {response_data}")
                 error_msg = response_data.get("errorMessage") or response_data.get("ResponseDescription") or "Unknown Daraja error"
                 raise Exception(f"Safaricom rejected request: {error_msg}")
                 
         except Exception as e:
-            print(f"STK Push Error: {e}")
+            logger.error(f"STK Push Error: {e}")
             raise e
     
+    @staticmethod
+    def parse_stk_callback(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pull the fields we use out of a raw Safaricom STK callback payload.
+        """
+        stk_callback = data.get("Body", {}).get("stkCallback", {})
+        mpesa_receipt = next(
+            (item.get("Value") for item in stk_callback.get("CallbackMetadata", {}).get("Item", [])
+             if item.get("Name") == "MpesaReceiptNumber"),
+            None
+        )
+        return {
+            "checkout_request_id": stk_callback.get("CheckoutRequestID"),
+            "result_code": stk_callback.get("ResultCode", -1),
+            "result_desc": stk_callback.get("ResultDesc", "Unknown error"),
+            "mpesa_receipt": mpesa_receipt
+        }
+
     @staticmethod
     def process_stk_callback(
         db: Session,
         checkout_request_id: str,
         result_code: int,
-        result_desc: str
+        result_desc: str,
+        mpesa_receipt: Optional[str] = None,
+        session_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Process the callback from M-Pesa.
+        Safe to call more than once per CheckoutRequestID: the contribution is
+        keyed on it, so retries and concurrent deliveries credit escrow once.
         
         Args:
             db: Database session
             checkout_request_id: The CheckoutRequestID from the original request
             result_code: 0 for success, non-zero for failure
             result_desc: Description of the result
+            mpesa_receipt: MpesaReceiptNumber from CallbackMetadata, stored as the ledger reference
+            session_data: STK session if the caller already fetched it (batch workers)
         
         Returns:
             Dictionary with processing status
         """
         # Retrieve session from Redis
-        session_data = get_stk_session(checkout_request_id)
+        if session_data is None:
+            session_data = get_stk_session(checkout_request_id)
         
         if not session_data:
+            set_payment_status(checkout_request_id, "expired", message="Session not found or expired")
             return {
-                "status": "error",
+                "status": "expired",
                 "message": "Session not found or expired"
             }
         
-        try:
-            if result_code == 0:
-                #Create the contribution
-                campaign_id = uuid.UUID(session_data["campaign_id"])
-                contributor_id = uuid.UUID(session_data["contributor_id"])
-                amount = session_data["amount"]
-                
-                
-                result = ContributionService.create_contribution(
-                    db=db,
-                    campaign_id=campaign_id,
-                    contributor_id=contributor_id,
-                    amount=amount
-                )
-                
-                # Trigger Push Notifications
-                contribution = result.get("contribution")
-                if contribution:
-                    NotificationService.notify_investment_confirmed(
-                        db, contributor_id, contribution.campaign.title, amount
-                    )
-                    
-                    if contribution.campaign.total_contributions >= contribution.campaign.funding_goal_f:
-                        NotificationService.notify_campaign_funded(
-                            db, 
-                            contribution.campaign.fundraiser_id, 
-                            campaign_id, 
-                            contribution.campaign.title
-                        )
-                
-                # Clean up Redis session
+        # Unexpected errors (DB, Redis) leave the session and status alone, so
+        # a redelivered callback can still credit the payment
+        if result_code == 0:
+            #Create the contribution
+            campaign_id = uuid.UUID(session_data["campaign_id"])
+            contributor_id = uuid.UUID(session_data["contributor_id"])
+            amount = session_data["amount"]
+            
+            
+            result = ContributionService.create_contribution(
+                db=db,
+                campaign_id=campaign_id,
+                contributor_id=contributor_id,
+                amount=amount,
+                reference_code=mpesa_receipt or checkout_request_id,
+                idempotency_key=checkout_request_id
+            )
+
+            set_payment_status(
+                checkout_request_id, "success",
+                contribution_id=str(result["contribution"].contribution_id),
+                message="Payment processed successfully"
+            )
+
+            if result.get("duplicate"):
                 delete_stk_session(checkout_request_id)
-                
                 return {
-                    "status": "success",
-                    "message": "Payment processed successfully",
+                    "status": "duplicate",
+                    "message": "Payment already processed",
                     "campaign_id": str(campaign_id),
                     "amount": amount
                 }
-            else:
-                print(f"Payment failed: {result_desc}")
-                delete_stk_session(checkout_request_id)
+            
+            # The contributor's next reads must see this pledge even if the replica lags
+            if HAS_REPLICA:
+                pin_to_primary(contributor_id)
+
+            # Trigger Push Notifications
+            contribution = result.get("contribution")
+            if contribution:
+                NotificationService.notify_investment_confirmed(
+                    db, contributor_id, contribution.campaign.title, amount
+                )
                 
-                return {
-                    "status": "failed",
-                    "message": f"Payment failed: {result_desc}"
-                }
-        except Exception as e:
+                if contribution.campaign.total_contributions >= contribution.campaign.funding_goal_f:
+                    NotificationService.notify_campaign_funded(
+                        db, 
+                        contribution.campaign.fundraiser_id, 
+                        campaign_id, 
+                        contribution.campaign.title
+                    )
+            
+            # Clean up Redis session
             delete_stk_session(checkout_request_id)
-            raise e
+            
+            return {
+                "status": "success",
+                "message": "Payment processed successfully",
+                "campaign_id": str(campaign_id),
+                "amount": amount
+            }
+        else:
+            logger.info(f"Payment failed: {result_desc}")
+            set_payment_status(checkout_request_id, "failed", message=result_desc)
+            delete_stk_session(checkout_request_id)
+            
+            return {
+                "status": "failed",
+                "message": f"Payment failed: {result_desc}"
+            }
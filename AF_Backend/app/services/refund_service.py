@@ -1,3 +1,4 @@
+import logging
 from sqlalchemy.orm import Session
 from app.models.transaction import Contribution
 from app.models.escrow import EscrowAccount
@@ -6,6 +7,8 @@ from app.services.transaction_service import TransactionService
 from decimal import Decimal
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class RefundService:
     @staticmethod
     def process_campaign_refunds(db: Session, campaign_id: uuid.UUID, reason: str = "Milestone failure"):
@@ -16,7 +19,7 @@ class RefundService:
         # 1. Get Escrow Account
         escrow = db.query(EscrowAccount).filter(EscrowAccount.campaign_id == campaign_id).first()
         if not escrow or escrow.balance <= 0:
-            print(f"[REFUND] No balance to refund for campaign {campaign_id}")
+            logger.info(f"No balance to refund for campaign {campaign_id}")
             return []
 
         # 2. Get all successful contributions
@@ -26,7 +29,7 @@ class RefundService:
         ).all()
 
         if not contributions:
-            print(f"[REFUND] No completed contributions found for campaign {campaign_id}")
+            logger.info(f"No completed contributions found for campaign {campaign_id}")
             return []
 
         total_contributions = escrow.total_contributions
@@ -45,29 +48,29 @@ class RefundService:
             if refund_amount <= 0:
                 continue
 
-            # Create RefundEvent
+            # Create RefundEvent; the id is set here so the events, ledger
+            # entries and status updates all go out in one flush at commit
             refund_event = RefundEvent(
+                refund_id=uuid.uuid4(),
                 campaign_id=campaign_id,
                 contributor_id=contribution.contributor_id,
                 amount_refunded=refund_amount,
                 refund_reason=reason
             )
             db.add(refund_event)
-            db.flush() # Get refund_id
-
-            # Record in Ledger and update Escrow balance
-            TransactionService.record_refund(
-                db=db,
-                refund_event_id=refund_event.refund_id,
-                escrow_id=escrow.escrow_id,
-                amount=refund_amount
-            )
 
             # Update contribution status
             contribution.status = 'refunded'
             
             refund_events.append(refund_event)
-            print(f"[SIMULATION] Refunded {refund_amount} to contributor {contribution.contributor_id}")
+            logger.debug("Refunded %s to contributor %s", refund_amount, contribution.contributor_id)
+
+        # Record in Ledger and update Escrow balance
+        TransactionService.record_refunds(
+            db=db,
+            escrow_id=escrow.escrow_id,
+            refunds=[(event.refund_id, event.amount_refunded) for event in refund_events]
+        )
 
         db.commit()
         return refund_events
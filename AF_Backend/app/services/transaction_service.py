@@ -1,3 +1,4 @@
+from typing import List, Tuple
 from sqlalchemy.orm import Session
 from app.models.transaction import TransactionLedger, Contribution
 from app.models.escrow import EscrowAccount
@@ -125,3 +126,37 @@ class TransactionService:
         
         db.commit()
         return ledger_entry
+
+    @staticmethod
+    def record_refunds(
+        db: Session,
+        escrow_id: uuid.UUID,
+        refunds: List[Tuple[uuid.UUID, Decimal]]
+    ):
+        """
+        Record a batch of refunds as (refund_event_id, amount) pairs.
+        Same ledger entries as record_refund, but the escrow balance is
+        decreased once by the total and the caller commits.
+        """
+        ledger_entries = [
+            TransactionLedger(
+                escrow_id=escrow_id,
+                refund_event_id=refund_event_id,
+                transaction_type='refund',
+                amount=amount
+            )
+            for refund_event_id, amount in refunds
+        ]
+        db.add_all(ledger_entries)
+
+        total = sum((amount for _, amount in refunds), Decimal('0'))
+        if total:
+            from sqlalchemy import update
+            db.execute(
+                update(EscrowAccount)
+                .where(EscrowAccount.escrow_id == escrow_id)
+                .values(
+                    balance=EscrowAccount.balance - total  # SUBTRACT
+                )
+            )
+        return ledger_entries
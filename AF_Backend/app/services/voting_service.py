@@ -1,10 +1,14 @@
+import logging
 from sqlalchemy.orm import Session
 import uuid
 from app.models.vote import VoteResult, VoteSubmission, VoteToken
 from app.models.milestone import Milestone
 from app.models.user import ContributorProfile
+from app.core.response_cache import mark_campaign_changed
 from app.utils.crypto import verify_vote_signature, verify_waiver_signature, generate_keccak_hash
 
+logger = logging.getLogger(__name__)
+
 class VotingService:
     @staticmethod
     def generate_vote_token(db: Session, campaign_id: uuid.UUID, contributor_id: uuid.UUID) -> VoteToken:
@@ -33,12 +37,10 @@ class VotingService:
         """
         Submit a vote with digital signature verification.
         """
-        import sys
-        
         # Verify Milestone exists
         milestone = db.query(Milestone).filter(Milestone.milestone_id == milestone_id).first()
         if not milestone:
-            print(f"[VOTING] Milestone {milestone_id} not found", file=sys.stderr, flush=True)
+            logger.warning(f"Vote rejected: milestone {milestone_id} not found")
             raise ValueError("Milestone not found")
 
         #Verify Contributor is authorized
@@ -48,7 +50,7 @@ class VotingService:
         ).first()
 
         if not token:
-            print(f"[VOTING] Unauthorized: no token for contributor {contributor_id} on campaign {milestone.campaign_id}", file=sys.stderr, flush=True)
+            logger.warning(f"Vote rejected: no token for contributor {contributor_id} on campaign {milestone.campaign_id}")
             raise ValueError("Unauthorized to vote on this campaign")
 
         # Get Contributor's Public Key
@@ -68,7 +70,7 @@ class VotingService:
             from app.utils.crypto import get_vote_message, encode_defunct, Account
             msg = get_vote_message(str(milestone.campaign_id), str(milestone_id), vote_value, nonce)
             recovered = Account.recover_message(encode_defunct(text=msg), signature=signature)
-            print(f"[VOTING] Invalid signature from {contributor_id}. Expected: {profile.public_key if profile else 'N/A'}, Recovered: {recovered}", file=sys.stderr, flush=True)
+            logger.warning(f"Vote rejected: invalid signature from {contributor_id}. Expected: {profile.public_key if profile else 'N/A'}, Recovered: {recovered}")
             raise ValueError("Invalid cryptographic signature. Vote rejected.")
 
         #Check if already voted
@@ -99,7 +101,7 @@ class VotingService:
         total_votes = db.query(VoteSubmission).filter(VoteSubmission.milestone_id == milestone_id).count()
 
         if total_votes >= total_tokens and total_tokens > 0:
-            print(f"[VOTING] 100% participation reached for milestone {milestone_id}. Auto-tallying...")
+            logger.info(f"100% participation reached for milestone {milestone_id}. Auto-tallying...")
             VotingService.tally_votes(db, milestone_id)
 
         return vote
@@ -172,9 +174,11 @@ class VotingService:
                 from app.services.financial_workflow_service import FinancialWorkflowService
                 try:
                     FinancialWorkflowService.release_milestone_funds(db, milestone_id)
-                    print(f"[FINANCIAL] Funds released for approved milestone {milestone_id}")
+                    logger.info(f"Funds released for approved milestone {milestone_id}")
                 except Exception as e:
-                    print(f"[FINANCIAL_ERROR] Failed to release funds for milestone {milestone_id}: {str(e)}")
+                    logger.exception(f"Failed to release funds for milestone {milestone_id}: {str(e)}")
+
+            mark_campaign_changed(db, milestone.campaign_id)
         
         db.commit()
         db.refresh(result)
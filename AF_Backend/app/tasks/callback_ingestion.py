@@ -0,0 +1,180 @@
+"""
+M-Pesa callback ingestion workers.
+
+The /payments/callback endpoint only appends the raw payload to a Redis
+stream and answers Safaricom. Workers here read the stream through a
+consumer group, process each batch grouped by campaign (one DB session per
+campaign) and acknowledge the entries that reached a final outcome. Entries
+that raised stay pending for XAUTOCLAIM to redeliver; contributions are keyed
+on the CheckoutRequestID, so redelivery is harmless.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.redis import get_async_redis_client, get_stk_sessions
+from app.db.session import SessionLocal
+from app.services.payment_service import PaymentService
+
+logger = logging.getLogger("automation.callbacks")
+
+_worker_tasks: List[asyncio.Task] = []
+
+# Results that are final; anything else (an exception) is retried
+FINAL_STATUSES = frozenset({"success", "duplicate", "failed", "expired"})
+
+
+def _enqueued_at(entry_id: str) -> float:
+    # Stream ids are "<unix ms>-<seq>"
+    return int(entry_id.split("-", 1)[0]) / 1000
+
+
+def process_callback_batch(entries: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Process a batch of parsed callbacks.
+
+    Args:
+        entries: (stream entry id, parsed callback from PaymentService.parse_stk_callback)
+
+    Returns:
+        One result dict per entry, in no particular order
+    """
+    sessions = get_stk_sessions([callback["checkout_request_id"] for _, callback in entries])
+
+    by_campaign = defaultdict(list)
+    for entry_id, callback in entries:
+        session_data = sessions.get(callback["checkout_request_id"])
+        campaign_id = session_data["campaign_id"] if session_data else None
+        by_campaign[campaign_id].append((entry_id, callback, session_data))
+
+    results = []
+    for campaign_id, items in by_campaign.items():
+        db = SessionLocal()
+        try:
+            for entry_id, callback, session_data in items:
+                try:
+                    result = PaymentService.process_stk_callback(
+                        db=db,
+                        checkout_request_id=callback["checkout_request_id"],
+                        result_code=callback["result_code"],
+                        result_desc=callback["result_desc"],
+                        mpesa_receipt=callback["mpesa_receipt"],
+                        session_data=session_data
+                    )
+                except Exception as e:
+                    logger.error(f"Callback {callback['checkout_request_id']} failed: {str(e)}")
+                    db.rollback()
+                    result = {"status": "error", "message": str(e)}
+                results.append({"entry_id": entry_id, **result})
+        finally:
+            db.close()
+    return results
+
+
+class CallbackIngestionWorker:
+    """
+    One consumer in the callback consumer group.
+    """
+
+    def __init__(self, consumer_name: str):
+        self.consumer_name = consumer_name
+        self.redis = get_async_redis_client()
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(
+                settings.MPESA_CALLBACK_STREAM, settings.MPESA_CALLBACK_GROUP, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read_batch(self) -> List[Tuple[str, Dict[str, str]]]:
+        # Entries a crashed consumer never acknowledged come first
+        _, claimed, *_ = await self.redis.xautoclaim(
+            settings.MPESA_CALLBACK_STREAM, settings.MPESA_CALLBACK_GROUP, self.consumer_name,
+            min_idle_time=settings.MPESA_CALLBACK_CLAIM_IDLE_MS, count=settings.MPESA_CALLBACK_BATCH_SIZE
+        )
+        claimed = [(entry_id, fields) for entry_id, fields in claimed if fields]
+        if claimed:
+            return claimed
+
+        response = await self.redis.xreadgroup(
+            settings.MPESA_CALLBACK_GROUP, self.consumer_name,
+            {settings.MPESA_CALLBACK_STREAM: ">"},
+            count=settings.MPESA_CALLBACK_BATCH_SIZE, block=settings.MPESA_CALLBACK_BLOCK_MS
+        )
+        return response[0][1] if response else []
+
+    async def handle(self, raw_entries: List[Tuple[str, Dict[str, str]]]):
+        now = time.time()
+        entries = []
+        done = []
+        for entry_id, fields in raw_entries:
+            metrics.MPESA_CALLBACK_QUEUE_LAG.observe(max(0.0, now - _enqueued_at(entry_id)))
+            try:
+                entries.append((entry_id, PaymentService.parse_stk_callback(json.loads(fields["payload"]))))
+            except (KeyError, ValueError) as e:
+                logger.error(f"Dropping malformed callback entry {entry_id}: {str(e)}")
+                metrics.MPESA_CALLBACKS_PROCESSED.labels("malformed").inc()
+                done.append(entry_id)
+
+        results = await asyncio.to_thread(process_callback_batch, entries) if entries else []
+        metrics.MPESA_CALLBACK_BATCH_SIZE.observe(len(raw_entries))
+
+        from app.core.socket_manager import emit_payment_received
+        for result in results:
+            metrics.MPESA_CALLBACKS_PROCESSED.labels(result.get("status", "unknown")).inc()
+            if result.get("status") in FINAL_STATUSES:
+                done.append(result["entry_id"])
+            if result.get("status") == "success":
+                campaign_id = result.get("campaign_id")
+                await emit_payment_received(campaign_id, {"campaign_id": campaign_id, "amount": result.get("amount")})
+
+        if done:
+            await self.redis.xack(settings.MPESA_CALLBACK_STREAM, settings.MPESA_CALLBACK_GROUP, *done)
+
+    async def update_pending_gauge(self):
+        summary = await self.redis.xpending(settings.MPESA_CALLBACK_STREAM, settings.MPESA_CALLBACK_GROUP)
+        metrics.MPESA_CALLBACK_PENDING.set(summary.get("pending", 0))
+
+    async def run(self):
+        logger.info(f"Callback worker {self.consumer_name} started")
+        group_ready = False
+        while True:
+            try:
+                if not group_ready:
+                    await self.ensure_group()
+                    group_ready = True
+                raw_entries = await self.read_batch()
+                if raw_entries:
+                    await self.handle(raw_entries)
+                await self.update_pending_gauge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Callback worker {self.consumer_name} error: {str(e)}")
+                await asyncio.sleep(1)
+
+
+def start_callback_workers():
+    if settings.MPESA_CALLBACK_WORKERS <= 0:
+        return
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    for i in range(settings.MPESA_CALLBACK_WORKERS):
+        worker = CallbackIngestionWorker(f"{prefix}-{i}")
+        _worker_tasks.append(asyncio.create_task(worker.run()))
+
+
+async def stop_callback_workers():
+    for task in _worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+    _worker_tasks.clear()
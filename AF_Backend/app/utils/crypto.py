@@ -1,8 +1,11 @@
+import logging
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from eth_utils import keccak
 import json
 
+logger = logging.getLogger(__name__)
+
 def get_vote_message(campaign_id: str, milestone_id: str, vote_value: str, nonce: str) -> str:
     """
     Generate the standardized message string for voting.
@@ -42,7 +45,7 @@ def verify_vote_signature(
     Verify that a vote signature is valid and matches the expected public key.
     """
     message = get_vote_message(campaign_id, milestone_id, vote_value, nonce)
-    print(f"[CRYPTO] Verifying message: '{message}'", flush=True)
+    logger.debug("Verifying message: %r", message)
     signable_message = encode_defunct(text=message)
     
     try:
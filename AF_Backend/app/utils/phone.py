@@ -0,0 +1,18 @@
+import re
+from typing import Optional
+
+def normalize_phone(phone: str) -> Optional[str]:
+    """
+    Canonical Kenyan MSISDN (254XXXXXXXXX) for a phone number typed as
+    +254..., 254..., 07... or 7...; None if it is not a 9-digit subscriber number.
+    """
+    digits = re.sub(r"[\s\-()]", "", phone or "").lstrip("+")
+    if not digits.isdigit():
+        return None
+    if digits.startswith("254"):
+        digits = digits[3:]
+    if digits.startswith("0"):
+        digits = digits[1:]
+    if len(digits) != 9:
+        return None
+    return "254" + digits
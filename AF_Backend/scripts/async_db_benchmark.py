@@ -0,0 +1,90 @@
+"""
+Throughput benchmark: sync SessionLocal (threadpool) vs AsyncSession (asyncpg).
+
+Runs the same read workload as GET /campaigns/ both ways at a given concurrency.
+The sync path goes through anyio's threadpool exactly like a sync FastAPI
+endpoint does, so it is capped by the ~40 worker threads; the async path only
+waits on the connection pool.
+
+Usage:
+    python scripts/async_db_benchmark.py --concurrency 200 --requests 4000
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+
+from anyio.to_thread import run_sync
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.db.async_session import AsyncSessionLocal, async_engine
+from app.models.campaign import Campaign
+from app.services.campaign_service import CampaignService
+
+
+def sync_read(limit: int):
+    db = SessionLocal()
+    try:
+        campaigns = db.query(Campaign).options(*CampaignService.campaign_out_options())\
+            .filter(Campaign.status == 'active').limit(limit).all()
+        rows = db.execute(CampaignService.backers_count_statement(c.campaign_id for c in campaigns)).all()
+        return len(CampaignService.attach_backers_counts(campaigns, rows))
+    finally:
+        db.close()
+
+
+async def async_read(limit: int):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Campaign).options(*CampaignService.campaign_out_options())
+            .filter(Campaign.status == 'active').limit(limit)
+        )
+        campaigns = result.unique().scalars().all()
+        rows = (await db.execute(CampaignService.backers_count_statement(c.campaign_id for c in campaigns))).all()
+        return len(CampaignService.attach_backers_counts(campaigns, rows))
+
+
+async def drive(name: str, call, total: int, concurrency: int):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{name:<6} {total / elapsed:>10.1f} req/s   p50 {p50:>8.1f}ms   p99 {p99:>8.1f}ms")
+
+
+async def main(args):
+    print(f"Concurrency: {args.concurrency} | Requests: {args.requests} | Page size: {args.limit}")
+    # Warm both pools
+    await run_sync(sync_read, args.limit)
+    await async_read(args.limit)
+
+    await drive("sync", lambda: run_sync(sync_read, args.limit), args.requests, args.concurrency)
+    await drive("async", lambda: async_read(args.limit), args.requests, args.concurrency)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async DB stacks under concurrency.")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Contention benchmark for ContributionService.create_contribution.
+
+Creates one active campaign and N contributors, then has --concurrency
+threads (each with its own session) pledge to that single campaign as fast
+as they can. Reports pledges/s and latency percentiles, and checks that the
+campaign total, escrow balance and ledger all agree afterwards.
+
+Run against Postgres (DATABASE_URL); SQLite serialises writers globally and
+says nothing about row-lock contention.
+
+Usage:
+    python scripts/contribution_concurrency_benchmark.py --concurrency 64 --pledges 5000
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from sqlalchemy import func
+
+from app.db.session import SessionLocal, engine
+from app.models.user import User, FundraiserProfile
+from app.models.campaign import Campaign
+from app.models.escrow import EscrowAccount
+from app.models.transaction import Contribution, TransactionLedger
+from app.services.campaign_service import CampaignService
+from app.services.campaign_state_service import CampaignStateService
+from app.services.contribution_service import ContributionService
+
+
+def setup(contributors: int, pledges: int, amount: float):
+    db = SessionLocal()
+    try:
+        fundraiser = User(email=f"bench_fr_{uuid.uuid4().hex[:8]}@example.com", password_hash="pw", role='fundraiser')
+        db.add(fundraiser)
+        db.flush()
+        db.add(FundraiserProfile(fundraiser_id=fundraiser.account_id, company_name="Bench Corp"))
+        db.flush()
+
+        # Goal comfortably above what the run pledges so no request hits the cap
+        campaign = CampaignService.create_campaign(
+            db=db, fundraiser_id=fundraiser.account_id,
+            title="Contention Benchmark", description="Single hot campaign.",
+            funding_goal=amount * pledges * 2, duration_months=3, campaign_type='donation'
+        )
+        CampaignStateService.transition_status(db, campaign.campaign_id, 'active')
+
+        users = [
+            User(email=f"bench_c{i}_{uuid.uuid4().hex[:6]}@example.com", password_hash="pw", role='contributor')
+            for i in range(contributors)
+        ]
+        db.add_all(users)
+        db.commit()
+        return campaign.campaign_id, [u.account_id for u in users]
+    finally:
+        db.close()
+
+
+def pledge(campaign_id, contributor_id, amount: float):
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        ContributionService.create_contribution(db, campaign_id, contributor_id, amount)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def verify(campaign_id, expected_total: Decimal):
+    db = SessionLocal()
+    try:
+        campaign_total = db.query(Campaign.total_contributions).filter(Campaign.campaign_id == campaign_id).scalar()
+        escrow_balance = db.query(EscrowAccount.balance).filter(EscrowAccount.campaign_id == campaign_id).scalar()
+        ledger_total = db.query(func.sum(TransactionLedger.amount))\
+            .join(Contribution, TransactionLedger.contribution_id == Contribution.contribution_id)\
+            .filter(Contribution.campaign_id == campaign_id).scalar()
+        ok = campaign_total == escrow_balance == ledger_total == expected_total
+        print(f"Totals: campaign={campaign_total} escrow={escrow_balance} ledger={ledger_total} "
+              f"expected={expected_total} -> {'OK' if ok else 'MISMATCH'}")
+        return ok
+    finally:
+        db.close()
+
+
+def main(args):
+    campaign_id, contributor_ids = setup(args.contributors, args.pledges, args.amount)
+    print(f"Concurrency: {args.concurrency} | Pledges: {args.pledges} | Contributors: {args.contributors} | "
+          f"Pool: {engine.pool.status()}")
+
+    jobs = [contributor_ids[i % len(contributor_ids)] for i in range(args.pledges)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(lambda cid: pledge(campaign_id, cid, args.amount), jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{args.pledges / elapsed:.1f} pledges/s   p50 {p50:.1f}ms   p99 {p99:.1f}ms")
+
+    ok = verify(campaign_id, Decimal(str(args.amount)) * args.pledges)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pledge throughput on a single hot campaign.")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pledges", type=int, default=5000)
+    parser.add_argument("--contributors", type=int, default=500)
+    parser.add_argument("--amount", type=float, default=100.0)
+    main(parser.parse_args())
@@ -5,15 +5,15 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.db.session import SessionLocal
 from app.models.user import User, FundraiserProfile
 from app.services.campaign_service import CampaignService
+import argparse
 import time
 import uuid
 
-def load_test():
+def load_test(count: int, sequential: bool):
     db = SessionLocal()
-    print("Starting Batch Load Test (50 Campaigns)...")
-    
-    start_time = time.time()
-    
+    mode = "sequential" if sequential else "bulk"
+    print(f"Starting Batch Load Test ({count} Campaigns, {mode})...")
+
     try:
         # Create a fundraiser
         email = f"loadtest_{uuid.uuid4().hex[:6]}@example.com"
@@ -22,23 +22,33 @@ def load_test():
         db.flush()
         profile = FundraiserProfile(fundraiser_id=user.account_id, company_name="LoadTest Corp")
         db.add(profile)
-        db.flush()
-
-        for i in range(50):
-            CampaignService.create_campaign(
-                db=db, fundraiser_id=user.account_id,
-                title=f"Bulk Project {i+1}", description="Load testing campaign creation.",
-                funding_goal=1000 * (i+1), duration_months=12, campaign_type='donation'
-            )
-            if (i+1) % 10 == 0:
-                print(f"Created {i+1} projects...")
-        
         db.commit()
+
+        specs = [
+            {
+                "fundraiser_id": user.account_id,
+                "title": f"Bulk Project {i+1}",
+                "description": "Load testing campaign creation.",
+                "funding_goal": 1000 * (i+1),
+                "duration_months": 12,
+                "campaign_type": 'donation'
+            }
+            for i in range(count)
+        ]
+
+        start_time = time.time()
+        if sequential:
+            for i, spec in enumerate(specs):
+                CampaignService.create_campaign(db=db, **spec)
+                if (i+1) % 10 == 0:
+                    print(f"Created {i+1} projects...")
+        else:
+            CampaignService.bulk_create_campaigns(db, specs)
         end_time = time.time()
-        
+
         print("\nLoad Test Finished!")
-        print(f"Total Time for 50 campaigns: {end_time - start_time:.2f}s")
-        print(f"Average time per campaign: {(end_time - start_time)/50:.4f}s")
+        print(f"Total Time for {count} campaigns: {end_time - start_time:.2f}s")
+        print(f"Average time per campaign: {(end_time - start_time)/count:.4f}s")
 
     except Exception as e:
         print(f" Load Test Failed: {e}")
@@ -47,4 +57,8 @@ def load_test():
         db.close()
 
 if __name__ == "__main__":
-    load_test()
+    parser = argparse.ArgumentParser(description="Seed campaigns and time it.")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--sequential", action="store_true", help="One create_campaign call per campaign (old path)")
+    args = parser.parse_args()
+    load_test(args.count, args.sequential)
@@ -0,0 +1,114 @@
+"""
+Login storm benchmark.
+
+Registers --accounts contributors through the API, then has --concurrency
+clients log in as fast as they can for --duration seconds while a probe hits
+an unrelated endpoint at a fixed interval. Reports login throughput and
+status codes, and the probe's p50/p99 latency before and during the storm;
+with bcrypt off the request path the two should stay close.
+
+Run against a server started the way it runs in production, e.g.
+    uvicorn app.main:app --workers 1
+    python scripts/login_storm_benchmark.py --base-url http://localhost:8000 --concurrency 50 --duration 30
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+PASSWORD = "StormPassw0rd!"
+
+
+def percentile(samples, q):
+    if not samples:
+        return float("nan")
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+
+
+async def register_accounts(client: httpx.AsyncClient, count: int):
+    run_id = uuid.uuid4().hex[:6]
+    usernames = []
+    for i in range(count):
+        uname = f"storm_{run_id}_{i}"
+        response = await client.post("/api/v1/auth/register/contributor", json={
+            "email": f"{uname}@example.com",
+            "password": PASSWORD,
+            "uname": uname,
+            "phone_number": f"07{int(run_id, 16) % 100:02d}{i:06d}"
+        })
+        response.raise_for_status()
+        usernames.append(uname)
+    return usernames
+
+
+async def probe(client: httpx.AsyncClient, path: str, interval: float, stop: asyncio.Event):
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_loop(client: httpx.AsyncClient, usernames, offset: int, stop: asyncio.Event, statuses: Counter, latencies):
+    i = offset
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.post("/api/v1/auth/login", data={"username": usernames[i % len(usernames)], "password": PASSWORD})
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] += 1
+        i += 1
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        print(f"Registering {args.accounts} accounts...")
+        usernames = await register_accounts(client, args.accounts)
+
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe_path, args.probe_interval_ms / 1000, stop))
+        await asyncio.sleep(args.baseline)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        statuses, login_latencies = Counter(), []
+        probe_task = asyncio.create_task(probe(client, args.probe_path, args.probe_interval_ms / 1000, stop))
+        loops = [
+            asyncio.create_task(login_loop(client, usernames, i, stop, statuses, login_latencies))
+            for i in range(args.concurrency)
+        ]
+        start = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        stop.set()
+        during = await probe_task
+        await asyncio.gather(*loops)
+        elapsed = time.perf_counter() - start
+
+    total = sum(statuses.values())
+    print(f"Logins: {total} in {elapsed:.1f}s ({total / elapsed:.1f}/s)   statuses {dict(statuses)}")
+    print(f"Login latency         p50 {percentile(login_latencies, 0.5):.0f}ms   p99 {percentile(login_latencies, 0.99):.0f}ms")
+    print(f"{args.probe_path} before storm  p50 {percentile(baseline, 0.5):.1f}ms   p99 {percentile(baseline, 0.99):.1f}ms   ({len(baseline)} samples)")
+    print(f"{args.probe_path} during storm  p50 {percentile(during, 0.5):.1f}ms   p99 {percentile(during, 0.99):.1f}ms   ({len(during)} samples)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login throughput and collateral latency for other endpoints.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--baseline", type=float, default=5.0, help="Seconds of probing before the storm")
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--probe-interval-ms", type=float, default=50.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Socket.IO fan-out benchmark against a local Redis.
+
+Starts several AsyncServer "nodes" in one process, each with its own
+AsyncRedisManager (as separate uvicorn workers would have), spreads N simulated
+clients across them and campaign rooms, then emits from a single node and
+measures how long it takes for every client in the room to receive the packet.
+
+Clients are registered directly with each node's manager and packet delivery
+is captured at the engine.io boundary, so the numbers cover Redis pub/sub plus
+room fan-out without the cost of 10k real websocket handshakes.
+
+Usage:
+    python scripts/socket_fanout_benchmark.py --clients 10000 --nodes 4 --rooms 10
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import socketio
+
+from app.core.config import settings
+
+
+class Node:
+    def __init__(self, redis_url: str, channel: str):
+        self.server = socketio.AsyncServer(
+            async_mode='asgi',
+            client_manager=socketio.AsyncRedisManager(redis_url, channel=channel)
+        )
+        self.received = 0
+        self.latencies = []
+        self.expected = 0
+        self.done = asyncio.Event()
+        self.server._send_eio_packet = self._record
+
+    async def _record(self, eio_sid, eio_pkt):
+        self.latencies.append(time.perf_counter() - self.sent_at)
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+
+    def reset(self, expected: int, sent_at: float):
+        self.received = 0
+        self.expected = expected
+        self.sent_at = sent_at
+        self.done = asyncio.Event()
+        if expected == 0:
+            self.done.set()
+
+
+async def run(args):
+    channel = f"bench-{uuid.uuid4().hex[:8]}"
+    nodes = [Node(args.redis_url, channel) for _ in range(args.nodes)]
+    rooms = [f"campaign-{i}" for i in range(args.rooms)]
+    members = {(n, r): 0 for n in range(args.nodes) for r in rooms}
+
+    for node in nodes:
+        node.server.manager_initialized = True
+        node.server.manager.initialize()
+
+    for i in range(args.clients):
+        node_idx = i % args.nodes
+        room = rooms[i % args.rooms]
+        manager = nodes[node_idx].server.manager
+        sid = await manager.connect(uuid.uuid4().hex, '/')
+        manager.basic_enter_room(sid, '/', room)
+        members[(node_idx, room)] += 1
+
+    # Give every node's pub/sub listener time to subscribe
+    await asyncio.sleep(1.0)
+
+    print(f"Nodes: {args.nodes} | Clients: {args.clients} | Rooms: {args.rooms} | Rounds: {args.rounds}")
+    round_times = []
+    all_latencies = []
+    for round_idx in range(args.rounds):
+        room = rooms[round_idx % args.rooms]
+        sent_at = time.perf_counter()
+        for n, node in enumerate(nodes):
+            node.latencies = []
+            node.reset(members[(n, room)], sent_at)
+
+        await nodes[0].server.emit("milestone_update", {"round": round_idx}, room=room)
+        await asyncio.wait_for(
+            asyncio.gather(*(node.done.wait() for node in nodes)), timeout=args.timeout
+        )
+        round_times.append(time.perf_counter() - sent_at)
+        for node in nodes:
+            all_latencies.extend(node.latencies)
+
+    all_latencies.sort()
+    def pct(p):
+        return all_latencies[min(len(all_latencies) - 1, int(p * len(all_latencies)))] * 1000
+
+    print(f"Deliveries: {len(all_latencies)}")
+    print(f"Per-client latency p50: {pct(0.50):.2f}ms | p99: {pct(0.99):.2f}ms | max: {all_latencies[-1] * 1000:.2f}ms")
+    print(f"Full-room fan-out mean: {statistics.mean(round_times) * 1000:.2f}ms | worst: {max(round_times) * 1000:.2f}ms")
+
+    for node in nodes:
+        node.server.manager.thread.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure Socket.IO room fan-out latency through Redis.")
+    parser.add_argument("--redis-url", default=settings.SOCKETIO_MESSAGE_QUEUE or settings.REDIS_URL)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--nodes", type=int, default=4)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
@@ -11,44 +11,54 @@ from app.services.campaign_state_service import CampaignStateService
 import uuid
 import pytest
 
-# Use an in-memory SQLite for testing logic if possible, 
-# but models use GUID which might be tricky in SQLite.
-# We'll try to connect to the actual test DB or just mock the session.
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def test_transitions():
-    from unittest.mock import MagicMock
-    db = MagicMock()
-    
-    # Mock campaign
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+def _draft_campaign(db):
     campaign = Campaign(
         campaign_id=uuid.uuid4(),
         status='draft',
         duration_d=3
     )
-    
-    db.query().filter().first.return_value = campaign
+    db.add(campaign)
+    db.commit()
+    return campaign
+
+def test_transitions(db):
+    campaign = _draft_campaign(db)
     
     # Test 1: Draft -> Active (Launch)
-    CampaignStateService.launch_campaign(db, campaign.campaign_id)
+    campaign = CampaignStateService.launch_campaign(db, campaign.campaign_id)
     assert campaign.status == 'active'
     assert campaign.launched_at is not None
     assert campaign.funding_start_date is not None
     
     # Test 2: Active -> Funded
-    CampaignStateService.mark_as_funded(db, campaign.campaign_id)
+    campaign = CampaignStateService.mark_as_funded(db, campaign.campaign_id)
     assert campaign.status == 'funded'
     assert campaign.funded_at is not None
     
     # Test 3: Funded -> In Phases
-    CampaignStateService.start_phases(db, campaign.campaign_id)
+    campaign = CampaignStateService.start_phases(db, campaign.campaign_id)
     assert campaign.status == 'in_phases'
     assert campaign.phases_started_at is not None
     assert campaign.current_milestone_number == 1
     
     # Test 4: In Phases -> Completed
-    CampaignStateService.complete_campaign(db, campaign.campaign_id)
+    campaign = CampaignStateService.complete_campaign(db, campaign.campaign_id)
     assert campaign.status == 'completed'
     assert campaign.completed_at is not None
+    assert campaign.version == 5
     
     # Test 5: Invalid transition (Completed -> Active)
     try:
@@ -57,6 +67,21 @@ def test_transitions():
     except ValueError as e:
         assert "Invalid transition" in str(e)
 
+def test_stale_version_loses_the_race(db):
+    campaign = _draft_campaign(db)
+    campaign = CampaignStateService.launch_campaign(db, campaign.campaign_id)
+    seen_version = campaign.version
+
+    # Another worker moves the campaign on first
+    CampaignStateService.mark_as_funded(db, campaign.campaign_id)
+
+    with pytest.raises(ValueError, match="Invalid transition from funded to funded"):
+        CampaignStateService.transition_status(db, campaign.campaign_id, 'funded', expected_version=seen_version)
+    with pytest.raises(ValueError, match="modified concurrently"):
+        CampaignStateService.transition_status(db, campaign.campaign_id, 'failed', expected_version=seen_version)
+
+    db.refresh(campaign)
+    assert campaign.status == 'funded'
+
 if __name__ == "__main__":
-    test_transitions()
-    print("✅ All state transition tests passed!")
+    pytest.main([__file__])
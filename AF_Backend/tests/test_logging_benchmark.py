@@ -0,0 +1,116 @@
+"""
+Logging overhead benchmark: the per-request cost of the old print() calls
+against the same lines through app.core.logging_config. Run directly to
+print the timings:
+
+    python tests/test_logging_benchmark.py
+
+Two cases, timed in the calling (request) thread:
+- wallet-stats with 100 ledger rows: a flushed stdout write per row before,
+  DEBUG records dropped by the level check now.
+- INFO lines to a slow sink (a congested log pipe): print() blocks the
+  request on every write, the queue handler hands the record to the
+  listener thread and returns.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+import tempfile
+import time
+from decimal import Decimal
+
+from app.core.logging_config import configure_logging, stop_logging
+
+ROWS = 100
+REQUESTS = 50
+SINK_LATENCY_SECONDS = 0.0002
+
+logger = logging.getLogger("app.api.endpoints.contributions")
+
+
+class SlowStream:
+    """
+    A stdout whose writes take SINK_LATENCY_SECONDS.
+    """
+
+    def write(self, text):
+        time.sleep(SINK_LATENCY_SECONDS)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _segments():
+    return [(Decimal("100.00"), Decimal("5000.00"), Decimal("10000.00"), 0.01, 50.0) for _ in range(ROWS)]
+
+
+def wallet_stats_with_print(out):
+    segments = _segments()
+    print(f"[DEBUG] Wallet Stats for acc: found {len(segments)} contribution segments", file=out, flush=True)
+    for amount, balance, total, share, user_share in segments:
+        print(f"  - Segment: Amt={amount}, EscrowBal={balance}, TotalContr={total}, Share={share}, UserShare={user_share}", file=out, flush=True)
+    print(f"[DEBUG] Wallet Stats Final: Available=5000.0, Invested=10000.00", file=out, flush=True)
+
+
+def wallet_stats_with_logging():
+    segments = _segments()
+    logger.debug("Wallet stats for %s: %s contribution segments", "acc", len(segments))
+    for amount, balance, total, share, user_share in segments:
+        logger.debug(
+            "Wallet segment: amount=%s escrow_balance=%s escrow_total=%s share=%s user_share=%s",
+            amount, balance, total, share, user_share
+        )
+    logger.debug("Wallet stats final: available=%s invested=%s", 5000.0, Decimal("10000.00"))
+
+
+def _per_request(run) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        run()
+    return (time.perf_counter() - start) / REQUESTS
+
+
+def benchmark():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    stdout = sys.stdout
+    try:
+        with tempfile.TemporaryFile("w") as out:
+            print_debug = _per_request(lambda: wallet_stats_with_print(out))
+        configure_logging(level="INFO", levels="", log_format="json", automation_log_file="")
+        logging_debug = _per_request(wallet_stats_with_logging)
+        stop_logging()
+
+        slow = SlowStream()
+        print_info = _per_request(lambda: print("Vote submitted", file=slow, flush=True))
+        sys.stdout = slow  # the listener's stream handler writes here
+        configure_logging(level="INFO", levels="", log_format="json", automation_log_file="")
+        logging_info = _per_request(lambda: logger.info("Vote submitted"))
+        stop_logging()
+    finally:
+        sys.stdout = stdout
+        root.handlers[:] = handlers
+        root.setLevel(level)
+    return {
+        "print_debug": print_debug, "logging_debug": logging_debug,
+        "print_info": print_info, "logging_info": logging_info,
+    }
+
+
+def test_logging_removes_per_request_print_overhead():
+    timings = benchmark()
+    print("\n" + ", ".join(f"{name} {seconds * 1e6:.1f}us" for name, seconds in timings.items()))
+    assert timings["logging_debug"] < timings["print_debug"]
+    assert timings["logging_info"] < timings["print_info"]
+
+
+if __name__ == "__main__":
+    timings = benchmark()
+    print(f"Per request, in the request thread (mean of {REQUESTS})")
+    print(f"  wallet-stats, {ROWS} rows, print(flush=True): {timings['print_debug'] * 1e6:.1f}us")
+    print(f"  wallet-stats, {ROWS} rows, logger.debug:      {timings['logging_debug'] * 1e6:.1f}us")
+    print(f"  one INFO line, slow sink, print(flush=True): {timings['print_info'] * 1e6:.1f}us")
+    print(f"  one INFO line, slow sink, queued logger:     {timings['logging_info'] * 1e6:.1f}us")
@@ -0,0 +1,81 @@
+"""
+Payload budgets for the list endpoints mobile clients poll.
+
+For each route in payload_budgets.json a sample response is built from the
+route's response_model: every field filled, the outer list holding "items"
+entries and lists inside it "nested_items" each. The test fails when its
+JSON or gzipped size passes the budget, so adding fields to these schemas
+is a deliberate decision: trim the schema or raise the budget in the same
+change.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import json
+import random
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Union, get_args, get_origin
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.serialization import dump_json, type_adapter
+from app.main import app
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payload_budgets.json")
+with open(BUDGETS_FILE) as f:
+    BUDGETS = json.load(f)
+
+SCALARS = {
+    datetime: lambda rng: datetime(2026, 1, 1, 12, 0, 0, rng.randrange(1000000)),
+    Decimal: lambda rng: Decimal(rng.randrange(10 ** 9)) / 100,
+    int: lambda rng: rng.randrange(10 ** 6),
+    float: lambda rng: rng.randrange(10 ** 6) / 100,
+    bool: lambda rng: True,
+    str: lambda rng: "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(24)),
+    uuid.UUID: lambda rng: uuid.UUID(int=rng.getrandbits(128)),
+}
+
+
+def _response_model(key: str):
+    method, path = key.split(" ", 1)
+    for route in app.other_asgi_app.routes:
+        if getattr(route, "path", None) == path and method in getattr(route, "methods", ()):
+            return route.response_model
+    raise LookupError(f"No route for {key}")
+
+
+def sample(annotation, items: int, nested_items: int, rng: random.Random, in_list: bool = False) -> Any:
+    """
+    A value for annotation with every field and list filled.
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        # Optional[X] -> X; Union[List[X], Delta] -> the full list
+        return sample(next(arg for arg in get_args(annotation) if arg is not type(None)), items, nested_items, rng, in_list)
+    if origin is list:
+        (item,) = get_args(annotation)
+        return [sample(item, items, nested_items, rng, True) for _ in range(nested_items if in_list else items)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {
+            field.alias or name: sample(field.annotation, items, nested_items, rng, in_list)
+            for name, field in annotation.model_fields.items()
+        }
+    return SCALARS[annotation](rng)
+
+
+@pytest.mark.parametrize("key", sorted(BUDGETS))
+def test_response_within_payload_budget(key):
+    budget = BUDGETS[key]
+    response_model = _response_model(key)
+    payload = sample(response_model, budget["items"], budget.get("nested_items", 0), random.Random(0))
+    body = dump_json(type_adapter(response_model), payload)
+    compressed = gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+    assert len(body) <= budget["max_bytes"], f"{key}: {len(body)} bytes, budget {budget['max_bytes']}"
+    assert len(compressed) <= budget["max_gzip_bytes"], f"{key}: {len(compressed)} gzipped bytes, budget {budget['max_gzip_bytes']}"
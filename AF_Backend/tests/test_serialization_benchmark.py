@@ -0,0 +1,120 @@
+"""
+Serialization benchmark: 1,000 campaigns with milestones and evidence,
+encoded the way FastAPI encodes a response_model and the way
+app.core.serialization does. Run directly to print the timings:
+
+    python tests/test_serialization_benchmark.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import gc
+import json
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.campaign import CampaignOut
+from app.core.serialization import CAMPAIGN_LIST, dump_json
+
+CAMPAIGNS = 1000
+MILESTONES = 4
+ROUNDS = 7
+
+
+def _campaigns(count=CAMPAIGNS):
+    # Attribute objects, like the ORM rows the endpoints return
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    campaigns = []
+    for i in range(count):
+        campaign_id = uuid.uuid4()
+        milestones = [
+            SimpleNamespace(
+                milestone_id=uuid.uuid4(), campaign_id=campaign_id, milestone_number=n,
+                description=f"Phase {n} deliverables", phase_weight_wi=Decimal("0.25"),
+                disbursement_percentage_di=Decimal("0.25"), release_amount=Decimal("25000.00"),
+                status="pending", activated_at=now, evidence_submitted_at=None, voting_start_date=None,
+                voting_end_date=None, approved_at=None, rejected_at=None, funds_released_at=None,
+                target_deadline=now, revision_count=0, max_revisions=1, change_version=i * MILESTONES + n,
+                evidence=[SimpleNamespace(
+                    evidence_id=uuid.uuid4(), file_path=f"uploads/{campaign_id}/{n}.jpg", file_type="image/jpeg",
+                    description="Site photo", is_verified=False, uploaded_at=now
+                )],
+            )
+            for n in range(1, MILESTONES + 1)
+        ]
+        campaigns.append(SimpleNamespace(
+            campaign_id=campaign_id, fundraiser_id=uuid.uuid4(), fundraiser_name="Farm Co",
+            title=f"Campaign {i}", description="Irrigation for smallholder farms " * 4,
+            funding_goal_f=Decimal("100000.00"), duration_d=6, campaign_type_ct="donation", status="active",
+            category_c=Decimal("0.5000"), num_phases_p=MILESTONES, alpha_value=Decimal("1.8000"),
+            cover_image_url=None, backers_count=12, days_left=30, category_name="Agriculture",
+            total_contributions=Decimal("42000.00"), total_released=Decimal("0.00"), budget_data=None,
+            submitted_for_review_at=now, approved_at=now, launched_at=now, funded_at=None,
+            phases_started_at=None, completed_at=None, failed_at=None, current_milestone_number=1,
+            milestones_approved_count=0, milestones_rejected_count=0, created_at=now, updated_at=now,
+            change_version=i, milestones=milestones,
+        ))
+    return campaigns
+
+
+def _fastapi_body(field, campaigns) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content=campaigns))
+    return JSONResponse(content).body
+
+
+def _cpu_seconds(encoders, campaigns) -> dict:
+    # Best of a few rounds in process CPU time, with GC paused as timeit does.
+    # The encoders alternate within each round so a noisy stretch of the run
+    # hits both of them, not just one.
+    best = {}
+    for _ in range(ROUNDS):
+        for name, encode in encoders.items():
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.process_time()
+                encode(campaigns)
+                elapsed = time.process_time() - start
+            finally:
+                gc.enable()
+            best[name] = min(best.get(name, elapsed), elapsed)
+    return best
+
+
+def benchmark(count=CAMPAIGNS):
+    campaigns = _campaigns(count)
+    field = create_response_field(name="Response_read_campaigns", type_=List[CampaignOut])
+    return _cpu_seconds({
+        "fastapi": lambda data: _fastapi_body(field, data),
+        "adapter": lambda data: dump_json(CAMPAIGN_LIST, data),
+    }, campaigns)
+
+
+def test_adapter_output_matches_fastapi():
+    campaigns = _campaigns(20)
+    field = create_response_field(name="Response_read_campaigns", type_=List[CampaignOut])
+    assert json.loads(dump_json(CAMPAIGN_LIST, campaigns)) == json.loads(_fastapi_body(field, campaigns))
+
+
+def test_adapter_serializes_1000_campaigns_faster():
+    timings = benchmark()
+    print(f"\n{CAMPAIGNS} campaigns: fastapi {timings['fastapi'] * 1000:.1f}ms, adapter {timings['adapter'] * 1000:.1f}ms")
+    assert timings["adapter"] < timings["fastapi"]
+
+
+if __name__ == "__main__":
+    timings = benchmark()
+    print(f"{CAMPAIGNS} campaigns, {MILESTONES} milestones each (best of {ROUNDS}, CPU time)")
+    print(f"  FastAPI response_model + json.dumps: {timings['fastapi'] * 1000:.1f}ms")
+    print(f"  Pre-built TypeAdapter dump_json:     {timings['adapter'] * 1000:.1f}ms")
+    print(f"  {timings['fastapi'] / timings['adapter']:.1f}x less CPU")
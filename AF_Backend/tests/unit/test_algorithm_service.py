@@ -47,3 +47,62 @@ if __name__ == "__main__":
     test_milestone_weights()
     print("test_milestone_weights passed")
     print("All tests passed!")
+
+def test_batch_functions_match_scalar():
+    import numpy as np
+    l1 = np.array([0.1, 0.5, 0.8, 1.0, 0.35])
+    l2 = np.array([0.1, 0.5, 0.2, 1.0, 0.9])
+    durations = np.array([1, 6, 12, 24, 36], dtype=float)
+    goals = np.array([0.0, 50000.0, 250000.0, 1000000.0, 5000000.0])
+
+    risk = AlgorithmService.calculate_risk_factor_c_batch(l1, l2)
+    alpha = AlgorithmService.calculate_alpha_batch(durations)
+    phases = AlgorithmService.calculate_phase_count_batch(risk, goals, durations)
+    weights = AlgorithmService.calculate_milestone_weights_batch(phases, alpha)
+
+    for k in range(len(l1)):
+        c = AlgorithmService.calculate_risk_factor_c(l1[k], l2[k])
+        a = AlgorithmService.calculate_alpha(int(durations[k]))
+        p = AlgorithmService.calculate_phase_count(c, goals[k], int(durations[k]))
+        assert abs(risk[k] - c) < 1e-12
+        assert abs(alpha[k] - a) < 1e-12
+        assert phases[k] == p
+        expected = AlgorithmService.calculate_milestone_weights(p, a)
+        assert np.allclose(weights[k, :p], expected)
+        assert np.all(weights[k, p:] == 0)
+
+def test_memoized_results_match_formulas():
+    import math
+    AlgorithmService.clear_caches()
+    for duration in (1, 6, 12, 36):
+        for goal in (0, 125000.5, 999999.99, 1000000, 7500000):
+            for c in (0.3, 0.4875, 0.6, 0.9):
+                nfrt = 3 + duration / (duration + 12) + c / (c + 0.6) - 1
+                expected = max(3, min(12, int(round(nfrt + min(1.0, goal / 1000000.0) * (12 - nfrt)))))
+                assert AlgorithmService.calculate_phase_count(c, goal, duration) == expected
+                assert AlgorithmService.calculate_phase_count(c, goal, duration) == expected
+
+        alpha = AlgorithmService.calculate_alpha(duration)
+        for p in range(3, 13):
+            raw = [math.pow(i, alpha) for i in range(1, p + 1)]
+            expected = [w / sum(raw) for w in raw]
+            assert all(abs(a - b) < 1e-9 for a, b in zip(AlgorithmService.calculate_milestone_weights(p, alpha), expected))
+
+    info = AlgorithmService.cache_info()
+    # Goals at or above F' share a bucket: 4 durations x 4 goal buckets x 4 risks
+    assert info["phase_count"].misses == 64
+    assert info["weights"].currsize == 4 * 10
+
+def test_milestone_plan_batch():
+    import numpy as np
+    goals = np.array([50000.0, 50000.0, 2000000.0])
+    durations = np.array([6, 6, 24])
+    plan = AlgorithmService.calculate_milestone_plan_batch([0.5, 0.5, 0.9], [0.5, 0.5, 0.9], goals, durations)
+
+    assert list(plan["phase_count"]) == [
+        AlgorithmService.calculate_phase_count(0.5, 50000.0, 6),
+        AlgorithmService.calculate_phase_count(0.5, 50000.0, 6),
+        AlgorithmService.calculate_phase_count(0.9, 2000000.0, 24)
+    ]
+    assert np.allclose(plan["release_amounts"].sum(axis=1), goals)
+    assert np.array_equal(plan["weights"][0], plan["weights"][1])
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.exc import OperationalError
+from app.services import payment_service
+from app.services.payment_service import PaymentService
+from app.tasks import callback_ingestion
+
+def _callback(checkout_id, result_code=0):
+    return {
+        "Body": {"stkCallback": {
+            "CheckoutRequestID": checkout_id,
+            "ResultCode": result_code,
+            "ResultDesc": "ok",
+            "CallbackMetadata": {"Item": [{"Name": "MpesaReceiptNumber", "Value": f"R-{checkout_id}"}]}
+        }}
+    }
+
+def test_parse_stk_callback_extracts_receipt():
+    parsed = PaymentService.parse_stk_callback(_callback("ws_CO_1"))
+    assert parsed == {
+        "checkout_request_id": "ws_CO_1",
+        "result_code": 0,
+        "result_desc": "ok",
+        "mpesa_receipt": "R-ws_CO_1"
+    }
+
+def test_batch_is_processed_with_one_session_per_campaign():
+    entries = [
+        (f"1-{i}", PaymentService.parse_stk_callback(_callback(f"ws_CO_{i}")))
+        for i in range(4)
+    ]
+    sessions = {f"ws_CO_{i}": {"campaign_id": f"camp-{i % 2}"} for i in range(4)}
+    seen = []
+
+    def fake_process(db, checkout_request_id, session_data, **kwargs):
+        seen.append((db, session_data["campaign_id"]))
+        return {"status": "success", "campaign_id": session_data["campaign_id"]}
+
+    with patch.object(callback_ingestion, "get_stk_sessions", return_value=sessions), \
+         patch.object(callback_ingestion, "SessionLocal", side_effect=lambda: MagicMock()), \
+         patch.object(callback_ingestion.PaymentService, "process_stk_callback", side_effect=fake_process):
+        results = callback_ingestion.process_callback_batch(entries)
+
+    assert sorted(r["entry_id"] for r in results) == ["1-0", "1-1", "1-2", "1-3"]
+    # Callbacks for the same campaign share a session, different campaigns do not
+    sessions_by_campaign = {}
+    for db, campaign_id in seen:
+        sessions_by_campaign.setdefault(campaign_id, set()).add(id(db))
+    assert {k: len(v) for k, v in sessions_by_campaign.items()} == {"camp-0": 1, "camp-1": 1}
+    assert len({id(db) for db, _ in seen}) == 2
+
+def test_errored_entry_is_left_pending_with_its_session():
+    session = {"campaign_id": "00000000-0000-0000-0000-000000000001",
+               "contributor_id": "00000000-0000-0000-0000-000000000002", "amount": 500.0}
+    outage = OperationalError("INSERT", {}, Exception("connection reset"))
+    with patch.object(payment_service.ContributionService, "create_contribution", side_effect=outage), \
+         patch.object(payment_service, "set_payment_status") as set_status, \
+         patch.object(payment_service, "delete_stk_session") as delete_session:
+        with pytest.raises(OperationalError):
+            PaymentService.process_stk_callback(
+                db=MagicMock(), checkout_request_id="ws_CO_1", result_code=0, result_desc="ok",
+                mpesa_receipt="R-ws_CO_1", session_data=session
+            )
+    set_status.assert_not_called()
+    delete_session.assert_not_called()
+
+    raw_entries = [(f"1-{i}", {"payload": json.dumps(_callback(f"ws_CO_{i}"))}) for i in range(3)]
+    results = [
+        {"entry_id": "1-0", "status": "success", "campaign_id": "c"},
+        {"entry_id": "1-1", "status": "error", "message": "connection reset"},
+        {"entry_id": "1-2", "status": "expired"},
+    ]
+    with patch.object(callback_ingestion, "get_async_redis_client", return_value=AsyncMock()), \
+         patch.object(callback_ingestion, "process_callback_batch", return_value=results), \
+         patch("app.core.socket_manager.emit_payment_received", new=AsyncMock()):
+        worker = callback_ingestion.CallbackIngestionWorker("test")
+        asyncio.run(worker.handle(raw_entries))
+
+    acked = worker.redis.xack.call_args.args[2:]
+    assert sorted(acked) == ["1-0", "1-2"]
@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User, FundraiserProfile
+from app.models.campaign import Campaign
+from app.models.escrow import EscrowAccount
+from app.models.milestone import Milestone
+from app.services.campaign_service import CampaignService
+import uuid
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def fundraiser_id(db):
+    user = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    db.add(user)
+    db.add(FundraiserProfile(fundraiser_id=user.account_id, company_name="Test Corp"))
+    db.commit()
+    return user.account_id
+
+def _milestones(db, campaign_id):
+    return db.query(Milestone).filter(Milestone.campaign_id == campaign_id).order_by(Milestone.milestone_number).all()
+
+def test_bulk_create_matches_single_create(db, fundraiser_id):
+    specs = [
+        {"fundraiser_id": fundraiser_id, "title": f"P{i}", "description": "d",
+         "funding_goal": goal, "duration_months": months}
+        for i, (goal, months) in enumerate([(1000.0, 1), (250000.0, 12), (2000000.0, 24)])
+    ]
+    bulk_ids = CampaignService.bulk_create_campaigns(db, specs)
+    single = [CampaignService.create_campaign(db, **spec) for spec in specs]
+
+    assert len(bulk_ids) == 3
+    assert db.query(EscrowAccount).count() == 6
+    for campaign_id, reference in zip(bulk_ids, single):
+        campaign = db.get(Campaign, campaign_id)
+        assert campaign.status == 'draft'
+        assert campaign.num_phases_p == reference.num_phases_p
+        assert float(campaign.alpha_value) == pytest.approx(float(reference.alpha_value))
+        assert float(campaign.category_c) == pytest.approx(float(reference.category_c))
+
+        bulk_ms = _milestones(db, campaign_id)
+        ref_ms = _milestones(db, reference.campaign_id)
+        assert [m.milestone_number for m in bulk_ms] == [m.milestone_number for m in ref_ms]
+        for b, r in zip(bulk_ms, ref_ms):
+            assert float(b.phase_weight_wi) == pytest.approx(float(r.phase_weight_wi))
+            assert float(b.release_amount) == pytest.approx(float(r.release_amount), abs=0.01)
+            assert abs((b.target_deadline - r.target_deadline).total_seconds()) < 60
+
+def test_bulk_create_requires_fundraiser_profile(db):
+    with pytest.raises(ValueError, match="Fundraiser profile not found"):
+        CampaignService.bulk_create_campaigns(db, [
+            {"fundraiser_id": uuid.uuid4(), "title": "x", "description": "d",
+             "funding_goal": 1000.0, "duration_months": 3}
+        ])
+
+def test_plan_matches_created_campaign_without_writing(db, fundraiser_id):
+    plans = CampaignService.plan_milestones([(0.5, 0.5), (0.9, 0.9)], [1000.0, 250000.0], [1, 12, 24])
+    assert len(plans) == 2 * 2 * 3
+    assert db.query(Campaign).count() == 0
+
+    reference = CampaignService.create_campaign(
+        db, fundraiser_id=fundraiser_id, title="Ref", description="d", funding_goal=250000.0, duration_months=12
+    )
+    plan = plans[1 * 3 + 1]  # (0.5, 0.5) risk, 250000 goal, 12 months
+    assert (plan["funding_goal"], plan["duration_months"]) == (250000.0, 12)
+    assert plan["phase_count"] == reference.num_phases_p
+    ref_ms = _milestones(db, reference.campaign_id)
+    for planned, created in zip(plan["milestones"], ref_ms):
+        assert planned["phase_weight_wi"] == pytest.approx(float(created.phase_weight_wi), abs=1e-5)
+        assert planned["release_amount"] == pytest.approx(float(created.release_amount), abs=0.01)
+        assert abs((planned["target_deadline"] - created.target_deadline).total_seconds()) < 60
+
+def test_plan_is_cached_per_cell():
+    from app.services.campaign_service import _plan_cell
+    _plan_cell.cache_clear()
+    first = CampaignService.plan_milestones([(0.5, 0.5)], [5000.0], [6])
+    second = CampaignService.plan_milestones([(0.5, 0.5)], [5000], [6])
+    assert _plan_cell.cache_info().hits == 1
+    assert first[0]["phase_count"] == second[0]["phase_count"]
+    # Returned plans are copies; the cached cell is not mutated
+    second[0]["milestones"].clear()
+    assert len(CampaignService.plan_milestones([(0.5, 0.5)], [5000.0], [6])[0]["milestones"]) == first[0]["phase_count"]
+
+def test_goals_in_the_same_bucket_share_a_cell():
+    from app.services.campaign_service import _plan_cell
+    _plan_cell.cache_clear()
+    low, high = CampaignService.plan_milestones([(0.5, 0.5)], [2_000_000.0, 3_000_000.0], [6])
+    assert _plan_cell.cache_info().currsize == 1
+    # Same split, but release amounts follow each goal
+    assert [m["phase_weight_wi"] for m in low["milestones"]] == [m["phase_weight_wi"] for m in high["milestones"]]
+    assert sum(m["release_amount"] for m in high["milestones"]) == pytest.approx(3_000_000.0, abs=0.1)
+
+def test_plan_request_is_limited_to_1000_combinations():
+    from pydantic import ValidationError
+    from app.schemas.campaign import CampaignPlanRequest
+    category = {"industry_l1_id": str(uuid.uuid4())}
+    CampaignPlanRequest(funding_goals=list(range(1, 51)), duration_months=list(range(1, 21)))
+    with pytest.raises(ValidationError, match="At most 1000 plans"):
+        CampaignPlanRequest(funding_goals=list(range(1, 51)), duration_months=list(range(1, 21)), categories=[category] * 2)
+
+@pytest.mark.parametrize("months", [0, 25, 10 ** 9])
+def test_durations_outside_the_form_range_are_rejected(months):
+    from pydantic import ValidationError
+    from app.schemas.campaign import CampaignCreate, CampaignPlanRequest
+    with pytest.raises(ValidationError):
+        CampaignCreate(title="t", description="d", funding_goal=1000, duration_months=months)
+    with pytest.raises(ValidationError):
+        CampaignPlanRequest(funding_goals=[1000], duration_months=[12, months])
@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+import json
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.metrics import RESPONSE_BODY_BYTES, RESPONSE_WIRE_BYTES
+
+ROWS = [{"campaign_id": str(i), "title": f"Campaign {i}", "status": "active"} for i in range(200)]
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+@app.get("/rows/{kind}")
+def rows(kind: str):
+    return ROWS if kind == "many" else ROWS[:1]
+
+@app.get("/tagged")
+def tagged():
+    return Response(content=json.dumps(ROWS), media_type="application/json", headers={"ETag": '"abc"'})
+
+@app.get("/image")
+def image():
+    return Response(content=b"\x89PNG" + b"\0" * 4096, media_type="image/png")
+
+def _get(path, accept_encoding):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+            # Raw bytes as sent; httpx would otherwise decode gzip
+            async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+                return response, b"".join([chunk async for chunk in response.aiter_raw()])
+    return asyncio.run(run())
+
+def test_choose_encoding_honours_q_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("br;q=1.0, gzip;q=0.5") == "gzip"
+    assert choose_encoding("gzip;q=0, identity") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("") is None
+
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+
+def test_large_json_is_gzipped_and_sizes_recorded(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    before = RESPONSE_WIRE_BYTES.labels("GET", "/rows/{kind}", "gzip")._sum.get()
+
+    response, wire = _get("/rows/many", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(wire)
+    body = gzip.decompress(wire)
+    assert json.loads(body) == ROWS
+    assert len(wire) < len(body)
+
+    assert RESPONSE_WIRE_BYTES.labels("GET", "/rows/{kind}", "gzip")._sum.get() - before == len(wire)
+    assert RESPONSE_BODY_BYTES.labels("GET", "/rows/{kind}")._sum.get() >= len(body)
+
+def test_compressed_response_weakens_etag():
+    response, _ = _get("/tagged", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+
+    response, _ = _get("/tagged", "identity")
+    assert response.headers["etag"] == '"abc"'
+
+def test_small_and_binary_responses_are_not_compressed():
+    response, _ = _get("/rows/one", "gzip")
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+
+    response, wire = _get("/image", "gzip")
+    assert "content-encoding" not in response.headers
+    assert wire.startswith(b"\x89PNG")
+
+    response, _ = _get("/rows/many", "identity")
+    assert "content-encoding" not in response.headers
+
+def test_brotli_when_available():
+    brotli = pytest.importorskip("brotli")
+    response, wire = _get("/rows/many", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(wire).startswith(b'[{"campaign_id"')
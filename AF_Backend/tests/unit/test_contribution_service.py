@@ -1,5 +1,6 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from app.db.base import Base
 from app.models.user import User
@@ -44,3 +45,87 @@ def test_create_contribution_logic(db):
     assert float(escrow.balance) == 500.0
     token = db.query(VoteToken).filter(VoteToken.contributor_id == contributor_id).first()
     assert token is not None
+
+def test_contribution_over_remaining_goal_is_rejected(db):
+    campaign_id = uuid.uuid4()
+    contributor_id = uuid.uuid4()
+
+    db.add(User(account_id=contributor_id, email="c@test.com", password_hash="h", role='contributor'))
+    campaign = Campaign(campaign_id=campaign_id, title="Test", funding_goal_f=1000.0, status='active')
+    db.add(campaign)
+    escrow = EscrowAccount(campaign_id=campaign_id)
+    db.add(escrow)
+    db.commit()
+
+    ContributionService.create_contribution(db, campaign_id, contributor_id, 800.0)
+    with pytest.raises(ValueError, match="only requires KES 200"):
+        ContributionService.create_contribution(db, campaign_id, contributor_id, 300.0)
+
+    db.refresh(campaign)
+    assert float(campaign.total_contributions) == 800.0
+    assert db.query(Contribution).count() == 1
+    assert db.query(TransactionLedger).count() == 1
+
+def test_repeat_contributor_reuses_vote_token_and_goal_starts_phases(db):
+    campaign_id = uuid.uuid4()
+    contributor_id = uuid.uuid4()
+
+    db.add(User(account_id=contributor_id, email="c@test.com", password_hash="h", role='contributor'))
+    campaign = Campaign(campaign_id=campaign_id, title="Test", funding_goal_f=1000.0, status='active')
+    db.add(campaign)
+    escrow = EscrowAccount(campaign_id=campaign_id)
+    db.add(escrow)
+    db.commit()
+
+    first = ContributionService.create_contribution(db, campaign_id, contributor_id, 400.0)
+    second = ContributionService.create_contribution(db, campaign_id, contributor_id, 600.0)
+
+    assert first["vote_token_id"] == second["vote_token_id"]
+    assert db.query(VoteToken).count() == 1
+    assert float(second["escrow_balance"]) == 1000.0
+
+    db.refresh(campaign)
+    assert campaign.status == 'in_phases'
+    assert campaign.funded_at is not None
+
+def test_retry_with_same_idempotency_key_credits_once(db):
+    campaign_id = uuid.uuid4()
+    contributor_id = uuid.uuid4()
+
+    db.add(User(account_id=contributor_id, email="c@test.com", password_hash="h", role='contributor'))
+    campaign = Campaign(campaign_id=campaign_id, title="Test", funding_goal_f=1000.0, status='active')
+    db.add(campaign)
+    escrow = EscrowAccount(campaign_id=campaign_id)
+    db.add(escrow)
+    db.commit()
+
+    first = ContributionService.create_contribution(
+        db, campaign_id, contributor_id, 250.0, reference_code="QKX1", idempotency_key="ws_CO_1"
+    )
+    retry = ContributionService.create_contribution(
+        db, campaign_id, contributor_id, 250.0, reference_code="QKX1", idempotency_key="ws_CO_1"
+    )
+
+    assert retry["duplicate"] is True
+    assert retry["contribution"].contribution_id == first["contribution"].contribution_id
+    assert float(retry["campaign_total_raised"]) == 250.0
+    assert float(retry["escrow_balance"]) == 250.0
+    assert db.query(Contribution).count() == 1
+    assert db.query(TransactionLedger).count() == 1
+
+def test_reference_codes_are_only_unique_for_contributions(db):
+    escrow = EscrowAccount(campaign_id=uuid.uuid4())
+    db.add(escrow)
+    db.flush()
+    for transaction_type in ('disbursement', 'refund', 'refund'):
+        db.add(TransactionLedger(escrow_id=escrow.escrow_id, transaction_type=transaction_type, amount=1, reference_code="REF-1A2B3C4D"))
+    db.add(TransactionLedger(escrow_id=escrow.escrow_id, transaction_type='contribution', amount=1, reference_code="QKX1"))
+    db.commit()
+
+    db.add(TransactionLedger(escrow_id=escrow.escrow_id, transaction_type='contribution', amount=1, reference_code="QKX1"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+def test_contribution_to_unknown_campaign_is_rejected(db):
+    with pytest.raises(ValueError, match="Campaign not found"):
+        ContributionService.create_contribution(db, uuid.uuid4(), uuid.uuid4(), 100.0)
@@ -0,0 +1,135 @@
+import time
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User, FundraiserProfile
+from app.models.campaign import Campaign
+from app.models.milestone import Milestone
+from app.services.campaign_service import CampaignService
+import uuid
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+def _tick():
+    # SQLite change versions have millisecond resolution
+    time.sleep(0.005)
+
+@pytest.fixture
+def campaign(db):
+    user = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    db.add(user)
+    db.add(FundraiserProfile(fundraiser_id=user.account_id, company_name="Farm Co"))
+    campaign = Campaign(
+        campaign_id=uuid.uuid4(), fundraiser_id=user.account_id, title="T", description="d",
+        funding_goal_f=1000, duration_d=6, category_c=0.5, num_phases_p=2, alpha_value=1.8,
+        status='active', total_contributions=0, total_released=0
+    )
+    db.add(campaign)
+    for number in (1, 2):
+        db.add(Milestone(
+            campaign_id=campaign.campaign_id, milestone_number=number, phase_weight_wi=0.5,
+            disbursement_percentage_di=0.5, release_amount=500, status='pending'
+        ))
+    db.commit()
+    return campaign
+
+def test_timeline_delta_returns_changed_and_deleted_milestones(db, campaign):
+    full = CampaignService.timeline_delta(db, campaign.campaign_id, 0)
+    assert [m.milestone_number for m in full["changed"]] == [1, 2]
+    since = full["version"]
+
+    assert CampaignService.timeline_delta(db, campaign.campaign_id, since)["changed"] == []
+
+    _tick()
+    first, second = full["changed"]
+    first.status = 'active'
+    db.delete(second)
+    db.commit()
+
+    delta = CampaignService.timeline_delta(db, campaign.campaign_id, since)
+    assert [m.milestone_id for m in delta["changed"]] == [first.milestone_id]
+    assert delta["deleted"] == [second.milestone_id]
+    assert delta["version"] > since
+
+def test_core_updates_bump_change_version(db, campaign):
+    since = CampaignService.fundraiser_campaigns_delta(db, campaign.fundraiser_id, 0)["version"]
+    _tick()
+    db.execute(update(Campaign).where(Campaign.campaign_id == campaign.campaign_id).values(total_contributions=10))
+    db.commit()
+
+    delta = CampaignService.fundraiser_campaigns_delta(db, campaign.fundraiser_id, since)
+    assert [c.campaign_id for c in delta["changed"]] == [campaign.campaign_id]
+    assert delta["version"] > since
+
+def test_campaign_is_resent_when_a_milestone_changes(db, campaign):
+    since = CampaignService.fundraiser_campaigns_delta(db, campaign.fundraiser_id, 0)["version"]
+    assert CampaignService.fundraiser_campaigns_delta(db, campaign.fundraiser_id, since)["changed"] == []
+
+    _tick()
+    milestone = db.query(Milestone).filter(Milestone.milestone_number == 1).one()
+    milestone.status = 'active'
+    db.commit()
+
+    delta = CampaignService.fundraiser_campaigns_delta(db, campaign.fundraiser_id, since)
+    assert [c.campaign_id for c in delta["changed"]] == [campaign.campaign_id]
+    assert delta["version"] == milestone.change_version
+
+def test_cursor_does_not_pass_a_writer_that_commits_late(perf_engines):
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=perf_engines[0])
+    setup = Session()
+    user = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    setup.add(user)
+    setup.add(FundraiserProfile(fundraiser_id=user.account_id, company_name="Farm Co"))
+    campaign_id = uuid.uuid4()
+    setup.add(Campaign(
+        campaign_id=campaign_id, fundraiser_id=user.account_id, title="T", description="d",
+        funding_goal_f=1000, duration_d=6, category_c=0.5, num_phases_p=2, alpha_value=1.8,
+        status='active', total_contributions=0, total_released=0
+    ))
+    for number in (1, 2):
+        setup.add(Milestone(
+            campaign_id=campaign_id, milestone_number=number, phase_weight_wi=0.5,
+            disbursement_percentage_di=0.5, release_amount=500, status='pending'
+        ))
+        setup.flush()
+    setup.commit()
+    setup.close()
+
+    reader, slow, fast = Session(), Session(), Session()
+    try:
+        since = CampaignService.timeline_delta(reader, campaign_id, 0)["version"]
+        reader.commit()
+        _tick()
+
+        # The slow writer takes its version first but commits last
+        slow.query(Milestone).filter(Milestone.milestone_number == 1).one().status = 'active'
+        slow.flush()
+        if perf_engines[0].dialect.name == "postgresql":
+            # SQLite blocks a second writer until the first commits, so only
+            # Postgres can interleave them
+            fast.query(Milestone).filter(Milestone.milestone_number == 2).one().status = 'active'
+            fast.commit()
+
+        delta = CampaignService.timeline_delta(reader, campaign_id, since)
+        reader.commit()
+        assert all(m.milestone_number == 2 for m in delta["changed"])
+
+        slow.commit()
+        delta = CampaignService.timeline_delta(reader, campaign_id, delta["version"])
+        assert 1 in [m.milestone_number for m in delta["changed"]]
+    finally:
+        for session in (reader, slow, fast):
+            session.close()
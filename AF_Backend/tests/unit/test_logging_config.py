@@ -0,0 +1,54 @@
+import json
+import logging
+import pytest
+from app.core.logging_config import configure_logging, stop_logging, parse_levels
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    for name in ("app.test.quiet", "app.test.loud"):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+def _lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+
+def test_records_are_written_as_json_by_the_listener(restore_logging, capsys, tmp_path):
+    configure_logging(level="INFO", levels="", log_format="json", automation_log_file="")
+    logger = logging.getLogger("app.test.loud")
+    logger.info("Vote submitted for %s", "m1", extra={"milestone_id": "m1"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Release failed")
+    stop_logging()
+
+    submitted, failed = _lines(capsys)
+    assert submitted["message"] == "Vote submitted for m1"
+    assert submitted["level"] == "INFO"
+    assert submitted["logger"] == "app.test.loud"
+    assert submitted["milestone_id"] == "m1"
+    assert failed["message"] == "Release failed"
+    assert "ValueError: boom" in failed["exc_info"]
+
+def test_per_module_levels_and_automation_file(restore_logging, capsys, tmp_path):
+    automation_log = tmp_path / "logs" / "automation.log"
+    configure_logging(
+        level="INFO", levels="app.test.quiet=WARNING, app.test.loud=DEBUG",
+        log_format="json", automation_log_file=str(automation_log)
+    )
+    logging.getLogger("app.test.quiet").info("dropped")
+    logging.getLogger("app.test.loud").debug("kept")
+    logging.getLogger("automation.tasks").info("cron ran")
+    stop_logging()
+
+    assert [line["message"] for line in _lines(capsys)] == ["kept", "cron ran"]
+    assert [json.loads(line)["message"] for line in automation_log.read_text().splitlines()] == ["cron ran"]
+
+def test_parse_levels():
+    assert parse_levels("app.services=debug, httpx=WARNING,,") == {"app.services": logging.DEBUG, "httpx": logging.WARNING}
+    assert parse_levels("") == {}
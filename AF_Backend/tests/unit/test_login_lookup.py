@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User, ContributorProfile, FundraiserProfile
+from app.api.endpoints.auth import _login_lookup, _duplicate_detail
+from app.utils.phone import normalize_phone
+import uuid
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def users(db):
+    alice = User(account_id=uuid.uuid4(), email="alice@test.com", password_hash="h", role='contributor',
+                 contributor_profile=ContributorProfile(uname="alice", phone_number="0712345678", phone_normalized="254712345678"))
+    acme = User(account_id=uuid.uuid4(), email="acme@test.com", password_hash="h", role='fundraiser',
+                fundraiser_profile=FundraiserProfile(company_name="Acme"))
+    db.add_all([alice, acme])
+    db.commit()
+    ids = alice.account_id, acme.account_id
+    db.expunge_all()
+    return ids
+
+def test_normalize_phone():
+    for typed in ("0712345678", "712345678", "254712345678", "+254 712 345 678", "+254-712-345678"):
+        assert normalize_phone(typed) == "254712345678"
+    for invalid in ("", "alice", "07123", "0712345678901"):
+        assert normalize_phone(invalid) is None
+
+def test_any_identifier_resolves_in_one_query(db, users):
+    alice_id, acme_id = users
+    for identifier in ("alice@test.com", "alice", "0712345678", "+254712345678"):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            user = db.execute(_login_lookup(identifier)).scalars().first()
+            assert user.contributor_profile.uname == "alice"
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert user.account_id == alice_id
+        assert len(statements) == 1
+        db.expunge_all()
+
+    acme = db.execute(_login_lookup("acme@test.com")).scalars().first()
+    assert acme.account_id == acme_id and acme.fundraiser_profile.company_name == "Acme"
+    assert db.execute(_login_lookup("nobody")).scalars().first() is None
+
+def test_duplicates_are_reported_from_the_unique_index(db, users):
+    cases = [
+        (User(email="alice@test.com", password_hash="h", role='contributor'), "User with this email already exists"),
+        (User(email="new1@test.com", password_hash="h", role='contributor',
+              contributor_profile=ContributorProfile(uname="alice", phone_normalized="254700000001")), "Username is already taken"),
+        (User(email="new2@test.com", password_hash="h", role='contributor',
+              contributor_profile=ContributorProfile(uname="bob", phone_number="+254712345678", phone_normalized="254712345678")),
+         "Phone number is already registered"),
+    ]
+    for user, detail in cases:
+        db.add(user)
+        with pytest.raises(IntegrityError) as exc:
+            db.commit()
+        db.rollback()
+        assert _duplicate_detail(exc.value) == detail
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from passlib.context import CryptContext
+from app.core import security
+from app.core import redis as redis_helpers
+
+@pytest.fixture(autouse=True)
+def fast_hashing():
+    # Thread pool instead of spawning processes, and cheap rounds
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+    with patch.object(security.settings, "PASSWORD_HASH_WORKERS", 0), \
+         patch.object(security, "pwd_context", context):
+        yield context
+
+def test_async_hash_and_verify_round_trip():
+    hashed = asyncio.run(security.get_password_hash_async("s3cret"))
+    assert asyncio.run(security.verify_and_update_password_async("s3cret", hashed)) == (True, None)
+    assert asyncio.run(security.verify_and_update_password_async("wrong", hashed))[0] is False
+
+def test_changed_rounds_produce_a_replacement_hash(fast_hashing):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("s3cret")
+    valid, new_hash = asyncio.run(security.verify_and_update_password_async("s3cret", old_hash))
+    assert valid
+    assert new_hash.startswith("$2b$04$")
+    assert fast_hashing.verify("s3cret", new_hash)
+
+def test_hasher_sheds_load_when_queue_is_full():
+    with patch.object(security.settings, "PASSWORD_HASH_MAX_PENDING", 0):
+        with pytest.raises(security.PasswordHasherBusy):
+            asyncio.run(security.get_password_hash_async("s3cret"))
+
+def test_login_attempts_expire_with_the_window():
+    client = MagicMock()
+    client.eval = AsyncMock(side_effect=[1, 2])
+    with patch.object(redis_helpers, "get_async_redis_client", return_value=client), \
+         patch.object(redis_helpers.settings, "LOGIN_RATE_LIMIT_WINDOW_SECONDS", 900):
+        assert asyncio.run(redis_helpers.register_login_attempt_async(" Alice ")) == 1
+        assert asyncio.run(redis_helpers.register_login_attempt_async("alice")) == 2
+    # Count and TTL go to Redis as one script, never as separate calls
+    client.eval.assert_called_with(redis_helpers._REGISTER_LOGIN_ATTEMPT_LUA, 1, "login_attempts:alice", 900)
+    client.incr.assert_not_called()
+    client.expire.assert_not_called()
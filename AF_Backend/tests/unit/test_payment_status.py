@@ -0,0 +1,27 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core import redis as redis_helpers
+
+def _client_returning(record):
+    client = MagicMock()
+    client.get = AsyncMock(return_value=json.dumps(record) if record else None)
+    return client
+
+def test_pending_status_is_reported_as_is():
+    record = {"status": "pending", "contributor_id": "u1", "created_at": time.time()}
+    with patch.object(redis_helpers, "get_async_redis_client", return_value=_client_returning(record)):
+        status = asyncio.run(redis_helpers.get_payment_status_async("ws_CO_1"))
+    assert status["status"] == "pending"
+
+def test_stale_pending_status_reads_as_expired():
+    record = {"status": "pending", "contributor_id": "u1",
+              "created_at": time.time() - redis_helpers.STK_SESSION_TTL_SECONDS - 1}
+    with patch.object(redis_helpers, "get_async_redis_client", return_value=_client_returning(record)):
+        status = asyncio.run(redis_helpers.get_payment_status_async("ws_CO_1"))
+    assert status["status"] == "expired"
+
+def test_missing_status_is_none():
+    with patch.object(redis_helpers, "get_async_redis_client", return_value=_client_returning(None)):
+        assert asyncio.run(redis_helpers.get_payment_status_async("ws_CO_1")) is None
@@ -0,0 +1,127 @@
+"""
+SQL statement budgets for hot service calls and endpoints (fixtures in
+tests/conftest.py). A budget that fails means the call now runs more
+queries, usually a lazy load inside a loop. Fix the N+1, or raise the budget
+in the same change if the extra query is intended.
+"""
+import asyncio
+import uuid
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from app.models.user import User, FundraiserProfile, ContributorProfile
+from app.models.campaign import Campaign
+from app.models.milestone import Milestone
+from app.models.escrow import EscrowAccount
+from app.models.transaction import Contribution
+from app.models.vote import VoteToken
+from app.services.voting_service import VotingService
+from app.services.refund_service import RefundService
+from app.services.campaign_service import CampaignService
+from app.utils.crypto import get_vote_message
+from app.api.endpoints.campaigns import read_campaigns
+
+def _campaign(db, fundraiser_id, milestones=3, status='in_phases'):
+    campaign = Campaign(
+        campaign_id=uuid.uuid4(), fundraiser_id=fundraiser_id, title="Solar Kiosk", description="d",
+        funding_goal_f=1000, duration_d=6, category_c=0.5, num_phases_p=milestones, alpha_value=1.8,
+        status=status, total_contributions=1000, total_released=0
+    )
+    db.add(campaign)
+    for number in range(1, milestones + 1):
+        db.add(Milestone(
+            campaign_id=campaign.campaign_id, milestone_number=number, phase_weight_wi=0.3,
+            disbursement_percentage_di=0.3, release_amount=300,
+            status='voting_open' if number == 1 else 'pending'
+        ))
+    return campaign
+
+@pytest.fixture
+def world(perf_db):
+    """
+    One campaign in voting with a funded escrow and `contributors` backers.
+    """
+    def build(contributors=3):
+        fundraiser = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+        perf_db.add(fundraiser)
+        perf_db.add(FundraiserProfile(fundraiser_id=fundraiser.account_id, company_name="Farm Co"))
+        campaign = _campaign(perf_db, fundraiser.account_id)
+        perf_db.add(EscrowAccount(campaign_id=campaign.campaign_id, total_contributions=1000, balance=1000, total_released=0))
+        accounts = []
+        for i in range(contributors):
+            account = Account.create()
+            user = User(account_id=uuid.uuid4(), email=f"c{i}@test.com", password_hash="h", role='contributor')
+            perf_db.add(user)
+            perf_db.add(ContributorProfile(contributor_id=user.account_id, public_key=account.address))
+            perf_db.add(Contribution(campaign_id=campaign.campaign_id, contributor_id=user.account_id, amount=1000 / contributors, status='completed'))
+            perf_db.add(VoteToken(campaign_id=campaign.campaign_id, contributor_id=user.account_id, token_hash="authorized"))
+            accounts.append((user.account_id, account))
+        perf_db.commit()
+        milestone = perf_db.query(Milestone).filter(Milestone.campaign_id == campaign.campaign_id, Milestone.milestone_number == 1).one()
+        return campaign.campaign_id, milestone.milestone_id, accounts
+    return build
+
+def _vote(db, campaign_id, milestone_id, contributor_id, account, value="yes"):
+    nonce = uuid.uuid4().hex
+    message = get_vote_message(str(campaign_id), str(milestone_id), value, nonce)
+    signature = Account.sign_message(encode_defunct(text=message), private_key=account.key).signature.hex()
+    return VotingService.submit_vote(db, milestone_id, contributor_id, value, signature, nonce)
+
+def test_submit_vote_budget(perf_db, world, query_counter):
+    campaign_id, milestone_id, accounts = world(contributors=3)
+    (contributor_id, account), *_ = accounts
+
+    # milestone, voting window, profile, token, duplicate check, insert, commit
+    with query_counter.budget(9):
+        _vote(perf_db, campaign_id, milestone_id, contributor_id, account)
+
+@pytest.mark.parametrize("votes", [4, 16])
+def test_tally_votes_budget_does_not_grow_with_votes(perf_db, world, query_counter, votes):
+    campaign_id, milestone_id, accounts = world(contributors=votes + votes // 2)
+    for contributor_id, account in accounts[:votes]:
+        _vote(perf_db, campaign_id, milestone_id, contributor_id, account)
+
+    # Approved, so this includes releasing the milestone's funds
+    with query_counter.budget(17):
+        result = VotingService.tally_votes(perf_db, milestone_id)
+    assert result.outcome == 'approved'
+
+@pytest.mark.parametrize("contributors", [2, 8])
+def test_refunds_budget_does_not_grow_with_contributors(perf_db, world, query_counter, contributors):
+    campaign_id, _, _ = world(contributors=contributors)
+
+    # escrow, contributions, escrow balance, then one batch per table
+    with query_counter.budget(6):
+        refunds = RefundService.process_campaign_refunds(perf_db, campaign_id)
+    assert len(refunds) == contributors
+    escrow = perf_db.query(EscrowAccount).filter(EscrowAccount.campaign_id == campaign_id).one()
+    assert escrow.balance == 0
+
+def test_read_campaigns_budget(perf_db, perf_async_db, query_counter):
+    fundraiser = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    perf_db.add(fundraiser)
+    perf_db.add(FundraiserProfile(fundraiser_id=fundraiser.account_id, company_name="Farm Co"))
+    for _ in range(100):
+        _campaign(perf_db, fundraiser.account_id, status='active')
+    perf_db.commit()
+
+    async def read():
+        async with perf_async_db() as db:
+            return await read_campaigns(skip=0, limit=100, db=db)
+
+    # page, milestones (selectinload), evidence (selectinload), count
+    with query_counter.budget(4):
+        response = asyncio.run(read())
+    assert response.status_code == 200
+
+def test_fundraiser_campaigns_delta_budget(perf_db, query_counter):
+    fundraiser = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    perf_db.add(fundraiser)
+    for _ in range(20):
+        _campaign(perf_db, fundraiser.account_id, status='active')
+    perf_db.commit()
+
+    # One more than SQLite uses: Postgres also reads the commit horizon
+    with query_counter.budget(7):
+        delta = CampaignService.fundraiser_campaigns_delta(perf_db, fundraiser.account_id, 0)
+        assert all(len(c.milestones) == 3 for c in delta["changed"])
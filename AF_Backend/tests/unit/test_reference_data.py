@@ -0,0 +1,157 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+from app.models.user import User, FundraiserProfile, CompanyCategoryL1, CompanyCategoryL2
+from app.core import reference_data as reference_module
+from app.core.reference_data import ReferenceDataCache
+from app.services.campaign_service import CampaignService
+import uuid
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def cache():
+    # A private cache per test; Redis version checks are stubbed to a fixed value
+    cache = ReferenceDataCache()
+    with patch.object(reference_module, "reference_data", cache), \
+         patch.object(reference_module, "get_reference_data_version", return_value="1"), \
+         patch.object(reference_module, "bump_reference_data_version") as bump, \
+         patch("app.services.campaign_service.reference_data", cache):
+        cache.bump = bump
+        yield cache
+
+@pytest.fixture
+def categories(db):
+    l1 = CompanyCategoryL1(l1_id=uuid.uuid4(), l1_name="Agriculture", l1_risk_weight=0.8)
+    db.add(l1)
+    db.flush()
+    l2 = CompanyCategoryL2(l2_id=uuid.uuid4(), l1_id=l1.l1_id, l2_name="Dairy", l2_risk_weight=0.4)
+    db.add(l2)
+    db.commit()
+    return l1.l1_id, l2.l2_id
+
+def _count_queries(fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, statements
+
+def test_lookups_need_no_queries_once_loaded(db, cache, categories):
+    l1_id, l2_id = categories
+    cache.load(db)
+
+    weights, statements = _count_queries(lambda: cache.risk_weights(l1_id, l2_id, db))
+    assert weights == (0.8, 0.4)
+    assert statements == []
+    assert cache.l1_name(l1_id) == "Agriculture"
+    assert cache.risk_weights(None, None) == (0.5, 0.5)
+    assert cache.risk_weights(uuid.uuid4(), None, db) == (0.5, 0.5)
+
+def test_commit_touching_categories_reloads(db, cache, categories):
+    l1_id, l2_id = categories
+    cache.load(db)
+    cache.bump.reset_mock()
+
+    db.get(CompanyCategoryL1, l1_id).l1_risk_weight = 0.3
+    db.commit()
+    cache.bump.assert_called_once()
+    assert cache.risk_weights(l1_id, l2_id, db) == (0.3, 0.4)
+
+    # Unrelated commits do not invalidate
+    cache.bump.reset_mock()
+    db.add(User(email="x@test.com", password_hash="h", role='contributor'))
+    db.commit()
+    cache.bump.assert_not_called()
+
+def test_create_campaign_uses_cached_weights(db, cache, categories):
+    l1_id, l2_id = categories
+    user = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    db.add(user)
+    db.add(FundraiserProfile(fundraiser_id=user.account_id, company_name="Farm Co", industry_l1_id=l1_id, industry_l2_id=l2_id))
+    db.commit()
+    cache.load(db)
+
+    campaign = CampaignService.create_campaign(
+        db, fundraiser_id=user.account_id, title="T", description="d", funding_goal=1000.0, duration_months=6
+    )
+    assert float(campaign.category_c) == pytest.approx(0.7 * 0.8 + 0.3 * 0.4)
+
+def test_invalidate_keeps_serving_readers(db, cache, categories):
+    import threading
+    l1_id, l2_id = categories
+    cache.load(db)
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                assert cache.risk_weights(l1_id, l2_id, db) == (0.8, 0.4)
+                assert cache.l1_name(l1_id, db) == "Agriculture"
+            except Exception as e:  # AttributeError on a dropped snapshot
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(200):
+        cache.invalidate()
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+
+    # A snapshot taken before invalidate() stays readable
+    snapshot = cache._ensure_fresh(db)
+    cache.invalidate()
+    assert snapshot.l1[l1_id]["name"] == "Agriculture"
+
+def test_lookups_on_the_event_loop_never_load(cache, perf_engines):
+    import asyncio
+    import threading
+    # A file database, so the refresh thread sees the same tables
+    sync_engine = perf_engines[0]
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    db = SessionLocal()
+    l1_id = uuid.uuid4()
+    l1 = CompanyCategoryL1(l1_id=l1_id, l1_name="Agriculture", l1_risk_weight=0.8)
+    db.add(l1)
+    db.commit()
+    cache.load(db)
+    l1.l1_name = "Agribusiness"
+    db.commit()  # invalidates
+    db.close()
+
+    threads = []
+    listener = lambda *args: threads.append(threading.current_thread())
+    event.listen(sync_engine, "before_cursor_execute", listener)
+    try:
+        async def serialize():
+            return cache.l1_name(l1_id)
+        with patch("app.db.session.SessionLocal", SessionLocal):
+            assert asyncio.run(serialize()) == "Agriculture"  # current snapshot
+            cache._refresh_thread.join(5)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", listener)
+
+    assert threads and threading.main_thread() not in threads
+    assert cache.l1_name(l1_id) == "Agribusiness"
@@ -0,0 +1,68 @@
+import asyncio
+import time
+import uuid
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+
+from app.api.dependencies import deps
+from app.api.endpoints import auth
+from app.core import revocation as revocation_module
+from app.core import security
+from app.core.revocation import RevocationList
+from app.schemas.user import RefreshTokenRequest
+
+@pytest.fixture
+def revocations():
+    # A private list per test; publishing to Redis is stubbed
+    revocations = RevocationList()
+    with patch.object(revocation_module, "revocation_list", revocations), \
+         patch.object(deps, "revocation_list", revocations), \
+         patch.object(revocation_module, "publish_revocation_async", AsyncMock(return_value=True)):
+        yield revocations
+
+def _token(account_id, **claims):
+    return security.create_access_token(account_id, claims={"role": "contributor", "email": "c@test.com", "name": "carol", **claims})
+
+def test_principal_comes_from_claims(revocations):
+    account_id = uuid.uuid4()
+    principal = asyncio.run(deps.get_current_principal(_token(account_id)))
+    assert principal.account_id == account_id
+    assert principal.role == "contributor"
+    assert principal.display_name == "carol"
+
+    # Tokens from before role claims must be refreshed
+    legacy = security.jwt.encode({"sub": str(account_id), "exp": time.time() + 60}, security.settings.SECRET_KEY, algorithm=security.settings.ALGORITHM)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(deps.get_current_principal(legacy))
+    assert exc.value.status_code == 401
+
+def test_revoked_tokens_are_rejected(revocations):
+    account_id = uuid.uuid4()
+    token, other = _token(account_id), _token(account_id)
+
+    asyncio.run(revocation_module.revoke_access_token(security.decode_access_token(token)))
+    with pytest.raises(HTTPException):
+        asyncio.run(deps.get_current_principal(token))
+    assert asyncio.run(deps.get_current_principal(other)).account_id == account_id
+
+    asyncio.run(revocation_module.revoke_account_tokens(account_id))
+    with pytest.raises(HTTPException):
+        asyncio.run(deps.get_current_principal(other))
+    assert len(revocations) == 2
+
+def test_expired_entries_are_pruned():
+    revocations = RevocationList()
+    revocations.replace([("jti:old", time.time() - 1), ("jti:new", time.time() + 60), (f"account:{uuid.uuid4()}:1", time.time() - 1)])
+    revocations.prune()
+    assert len(revocations) == 1
+    assert revocations.is_revoked({"jti": "new", "sub": "x"})
+
+def test_reused_refresh_token_signs_the_account_out(revocations):
+    account_id = uuid.uuid4()
+    reused = {"account_id": str(account_id), "family": "f1", "reused": True}
+    with patch.object(auth, "consume_refresh_token_async", AsyncMock(return_value=reused)):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(auth.refresh_access_token(RefreshTokenRequest(refresh_token="stolen"), db=None))
+    assert exc.value.status_code == 401
+    assert revocations.is_revoked({"sub": str(account_id), "iat": int(time.time())})
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from app.core import metrics
+from app.core.instrumentation import RequestInstrumentationMiddleware, outbound, current_request_stats
+from app.db.session import instrument_engine
+
+engine = instrument_engine(create_engine("sqlite:///:memory:"), label="test")
+
+app = FastAPI()
+app.add_middleware(RequestInstrumentationMiddleware, query_warn_threshold=3)
+
+@app.get("/items/{count}")
+def run_queries(count: int):
+    # Sync endpoint: runs in the thread pool
+    with engine.connect() as conn:
+        for _ in range(count):
+            conn.execute(text("SELECT 1"))
+    with outbound("daraja"):
+        pass
+    stats = current_request_stats()
+    return {"queries": stats.queries, "outbound": sorted(stats.outbound_seconds)}
+
+def _get(path):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://t") as client:
+            return await client.get(path)
+    return asyncio.run(run())
+
+def _value(metric, *labels, sample="_sum"):
+    child = metric.labels(*labels)
+    return child._sum.get() if sample == "_sum" else child._value.get()
+
+def test_queries_and_outbound_calls_are_attributed_to_the_request():
+    endpoint = "/items/{count}"
+    queries_before = _value(metrics.HTTP_REQUEST_DB_QUERIES, "GET", endpoint)
+    outbound_before = metrics.OUTBOUND_CALL_SECONDS.labels("daraja")._sum.get()
+
+    response = _get("/items/2")
+    assert response.json() == {"queries": 2, "outbound": ["daraja"]}
+    assert _value(metrics.HTTP_REQUEST_DB_QUERIES, "GET", endpoint) - queries_before == 2
+    assert _value(metrics.HTTP_REQUEST_SECONDS, "GET", endpoint, "200") > 0
+    assert metrics.OUTBOUND_CALL_SECONDS.labels("daraja")._sum.get() > outbound_before
+    assert current_request_stats() is None
+
+def test_request_over_query_threshold_is_flagged(caplog):
+    before = _value(metrics.HTTP_QUERY_HEAVY_REQUESTS, "GET", "/items/{count}", sample="_value")
+
+    _get("/items/3")
+    assert _value(metrics.HTTP_QUERY_HEAVY_REQUESTS, "GET", "/items/{count}", sample="_value") == before
+
+    with caplog.at_level(logging.WARNING, logger="app.core.instrumentation"):
+        _get("/items/5")
+    assert _value(metrics.HTTP_QUERY_HEAVY_REQUESTS, "GET", "/items/{count}", sample="_value") == before + 1
+    assert "ran 5 queries" in caplog.text
@@ -0,0 +1,100 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from app.db.base import Base
+from app.models.user import User
+from app.models.campaign import Campaign
+from app.core import response_cache as cache_module
+from app.core.response_cache import CachedCampaignRead, mark_campaign_changed
+from app.schemas.campaign import CampaignProgress
+from app.services.campaign_state_service import CampaignStateService
+import uuid
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def store():
+    # Dict-backed stand-ins for the Redis helpers
+    versions, responses = {}, {}
+
+    def bump(campaign_ids):
+        for campaign_id in campaign_ids:
+            versions[campaign_id] = versions.get(campaign_id, 0) + 1
+        return True
+
+    with patch.object(cache_module, "get_campaign_cache_version", lambda cid: str(versions.get(cid, 0))), \
+         patch.object(cache_module, "bump_campaign_cache_versions", side_effect=bump) as bump_mock, \
+         patch.object(cache_module, "get_cached_response", lambda key: responses.get(key)), \
+         patch.object(cache_module, "set_cached_response", lambda key, etag, body: responses.__setitem__(key, {"etag": etag, "body": body})):
+        yield {"versions": versions, "responses": responses, "bump": bump_mock}
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def _progress(status):
+    return {
+        "status": status, "funding_percentage": 0.0, "total_contributions": Decimal("0"),
+        "funding_goal": Decimal("1000"), "milestones_total": 3, "milestones_completed": 0,
+        "next_action_required": "Launch Campaign"
+    }
+
+def test_cached_body_and_not_modified(store):
+    campaign_id = uuid.uuid4()
+    first = CachedCampaignRead(_request(), campaign_id, "progress")
+    assert first.cached() is None
+    response = first.respond(_progress("draft"), CampaignProgress)
+    etag = response.headers["etag"]
+
+    hit = CachedCampaignRead(_request(), campaign_id, "progress").cached()
+    assert hit.status_code == 200
+    assert hit.body == response.body
+    assert hit.headers["etag"] == etag
+
+    revalidated = CachedCampaignRead(_request(f'W/{etag}, "other"'), campaign_id, "progress").cached()
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+
+def test_commit_bumps_version_and_rollback_does_not(db, store):
+    campaign_id = uuid.uuid4()
+    db.query(Campaign).count()
+    mark_campaign_changed(db, campaign_id)
+    db.rollback()
+    db.commit()
+    store["bump"].assert_not_called()
+
+    mark_campaign_changed(db, campaign_id)
+    db.commit()
+    store["bump"].assert_called_once_with([campaign_id])
+    assert CachedCampaignRead(_request(), campaign_id, "progress").cached() is None
+
+def test_transition_invalidates_cached_responses(db, store):
+    user = User(account_id=uuid.uuid4(), email="f@test.com", password_hash="h", role='fundraiser')
+    db.add(user)
+    campaign = Campaign(
+        campaign_id=uuid.uuid4(), fundraiser_id=user.account_id, title="T", description="d",
+        funding_goal_f=1000, duration_d=6, category_c=0.5, num_phases_p=3, alpha_value=1.8, status='draft'
+    )
+    db.add(campaign)
+    db.commit()
+    campaign_id = campaign.campaign_id
+    CachedCampaignRead(_request(), campaign_id, "progress").respond(_progress("draft"), CampaignProgress)
+
+    CampaignStateService.launch_campaign(db, campaign_id)
+    assert store["versions"][campaign_id] == 1
+    assert CachedCampaignRead(_request(), campaign_id, "progress").cached() is None
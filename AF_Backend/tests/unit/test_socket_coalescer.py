@@ -0,0 +1,47 @@
+import asyncio
+from app.core.socket_manager import CampaignEventCoalescer
+
+class FakeServer:
+    def __init__(self):
+        self.emitted = []
+
+    async def emit(self, event, data=None, room=None):
+        self.emitted.append((event, data, room))
+
+def test_burst_is_coalesced_to_latest_payload():
+    server = FakeServer()
+    coalescer = CampaignEventCoalescer(server, window_ms=20)
+
+    async def run():
+        for i in range(5):
+            await coalescer.emit("milestone_update", "camp-1", {"milestone_number": i})
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert server.emitted == [
+        ("milestone_update", {"milestone_number": 4, "coalesced": 5}, "camp-1")
+    ]
+
+def test_emits_are_room_scoped_per_campaign():
+    server = FakeServer()
+    coalescer = CampaignEventCoalescer(server, window_ms=20)
+
+    async def run():
+        await coalescer.emit("payment_received", "camp-1", {"amount": 10})
+        await coalescer.emit("payment_received", "camp-2", {"amount": 20})
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    rooms = sorted(room for _, _, room in server.emitted)
+    assert rooms == ["camp-1", "camp-2"]
+    assert all(room is not None for _, _, room in server.emitted)
+
+def test_zero_window_emits_immediately():
+    server = FakeServer()
+    coalescer = CampaignEventCoalescer(server, window_ms=0)
+
+    asyncio.run(coalescer.emit("milestone_update", "camp-1", {"event": "x"}))
+
+    assert server.emitted == [("milestone_update", {"event": "x"}, "camp-1")]
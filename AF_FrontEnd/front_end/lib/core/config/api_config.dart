@@ -10,6 +10,8 @@ class ApiConfig {
 
   // Auth Endpoints
   static String get login => '$baseUrl/auth/login';
+  static String get refresh => '$baseUrl/auth/refresh';
+  static String get logout => '$baseUrl/auth/logout';
   static String get me => '$baseUrl/auth/me';
   static String get registerContributor => '$baseUrl/auth/register/contributor';
   static String get registerFundraiser => '$baseUrl/auth/register/fundraiser';
@@ -17,6 +19,7 @@ class ApiConfig {
   // Campaign Endpoints
   static String get campaigns => '$baseUrl/campaigns'; // No trailing slash anymore
   static String get myCampaigns => '$baseUrl/campaigns/my-campaigns';
+  static String get campaignPlan => '$baseUrl/campaigns/plan';
   static String get fundraiserStats => '$baseUrl/campaigns/fundraiser/stats';
   static String launchCampaign(String id) => '$baseUrl/campaigns/$id/launch';
   static String campaignProgress(String id) => '$baseUrl/campaigns/$id/progress';
@@ -38,6 +41,8 @@ class ApiConfig {
 
   // Payments
   static String get stkPush => '$baseUrl/payments/stk-push';
+  static String paymentStatus(String checkoutRequestId) =>
+      '$baseUrl/payments/$checkoutRequestId';
 
   // Simulation (Tester Tool)
   static String simulateAdvance(String id) => '$baseUrl/simulation/$id/advance';
@@ -3,6 +3,7 @@ import 'package:flutter_secure_storage/flutter_secure_storage.dart';
 import 'dart:io';
 
 import '../../core/config/api_config.dart';
+import '../services/token_refresher.dart';
 
 class ApiClient {
   static final String baseUrl = ApiConfig.baseUrl; // Declared in ApiConfig
@@ -24,16 +25,23 @@ class ApiClient {
     dio.interceptors.add(InterceptorsWrapper(
       onRequest: (options, handler) async {
         // Fetch JWT from secure storage
-        String? token = await _storage.read(key: 'jwt_token');
+        String? token = await _storage.read(key: TokenRefresher.accessTokenKey);
         if (token != null) {
           options.headers['Authorization'] = 'Bearer $token';
         }
         return handler.next(options);
       },
-      onError: (DioException e, handler) {
-        if (e.response?.statusCode == 401) {
-          // Future: Logic for token refresh or force logout
-          print('Auth Error: Token expired or invalid');
+      onError: (DioException e, handler) async {
+        if (TokenRefresher.shouldRefresh(e)) {
+          final token = await TokenRefresher.refresh();
+          if (token != null) {
+            try {
+              return handler.resolve(await TokenRefresher.retry(dio, e.requestOptions, token));
+            } on DioException catch (retryError) {
+              return handler.next(retryError);
+            }
+          }
+          print('Auth Error: Session expired, sign in again');
         }
         return handler.next(e);
       },
@@ -27,6 +27,22 @@ class CampaignApi {
     }
   }
 
+  /// Preview phase counts, weights and release amounts without creating a draft
+  Future<List<dynamic>> planCampaign({
+    required List<double> fundingGoals,
+    required List<int> durationMonths,
+  }) async {
+    try {
+      final response = await _apiClient.post(ApiConfig.campaignPlan, data: {
+        'funding_goals': fundingGoals,
+        'duration_months': durationMonths,
+      });
+      return response.data['plans'] as List<dynamic>;
+    } catch (e) {
+      rethrow;
+    }
+  }
+
   /// Launch a draft campaign to move it to 'active' status
   Future<Project> launchCampaign(String campaignId) async {
     try {
@@ -47,11 +63,15 @@ class CampaignApi {
     }
   }
 
-  /// Get the full timeline of milestones and events
-  Future<List<dynamic>> getCampaignTimeline(String campaignId) async {
+  /// Get the full timeline of milestones and events, or with [sinceVersion]
+  /// only the changes since then ({version, changed, deleted})
+  Future<dynamic> getCampaignTimeline(String campaignId, {int? sinceVersion}) async {
     try {
-      final response = await _apiClient.get(ApiConfig.campaignTimeline(campaignId));
-      return response.data as List<dynamic>;
+      final response = await _apiClient.get(
+        ApiConfig.campaignTimeline(campaignId),
+        queryParameters: sinceVersion != null ? {'since_version': sinceVersion} : null,
+      );
+      return response.data;
     } catch (e) {
       rethrow;
     }
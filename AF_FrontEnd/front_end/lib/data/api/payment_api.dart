@@ -28,4 +28,21 @@ class PaymentApi {
       rethrow;
     }
   }
+
+  /// Long-poll the status of an STK Push. Returns as soon as it leaves
+  /// 'pending' or after [waitSeconds].
+  Future<Map<String, dynamic>> getPaymentStatus(
+    String checkoutRequestId, {
+    int waitSeconds = 25,
+  }) async {
+    try {
+      final response = await _apiService.get(
+        ApiConfig.paymentStatus(checkoutRequestId),
+        queryParameters: {'wait': waitSeconds},
+      );
+      return response.data;
+    } catch (e) {
+      rethrow;
+    }
+  }
 }
@@ -4,11 +4,15 @@ import '../api/milestone_api.dart';
 import '../models/project.dart';
 import '../models/milestone.dart';
 import '../models/campaign_details.dart';
+import '../services/delta_sync_cache.dart';
 
 class CampaignRepository {
   final CampaignApi _campaignApi = CampaignApi();
   final MilestoneApi _milestoneApi = MilestoneApi();
 
+  // Shared by all instances: providers create a repository per fetch
+  static final DeltaSyncCache _timelines = DeltaSyncCache(idKey: 'milestone_id');
+
   Future<CampaignDetails> getCampaignDetails(String id) async {
     return await _campaignApi.getCampaignDetails(id);
   }
@@ -22,6 +26,15 @@ class CampaignRepository {
     return await _campaignApi.createCampaign(project);
   }
 
+  /// Server-computed plan for a single goal/duration, or null if unavailable
+  Future<Map<String, dynamic>?> planCampaign(double goalAmount, int durationMonths) async {
+    final plans = await _campaignApi.planCampaign(
+      fundingGoals: [goalAmount],
+      durationMonths: [durationMonths],
+    );
+    return plans.isEmpty ? null : plans.first as Map<String, dynamic>;
+  }
+
   Future<Project> launchCampaign(String campaignId) async {
     return await _campaignApi.launchCampaign(campaignId);
   }
@@ -31,7 +44,11 @@ class CampaignRepository {
   }
 
   Future<List<Milestone>> getCampaignTimeline(String campaignId) async {
-    final rawData = await _campaignApi.getCampaignTimeline(campaignId);
+    final data = await _campaignApi.getCampaignTimeline(
+      campaignId,
+      sinceVersion: _timelines.sinceVersion(campaignId),
+    );
+    final rawData = _timelines.apply(campaignId, data);
     final milestones = rawData.map((m) => Milestone.fromJson(m)).toList();
     milestones.sort((a, b) => a.milestoneNumber.compareTo(b.milestoneNumber));
     return milestones;
@@ -18,4 +18,13 @@ class PaymentRepository {
       rethrow;
     }
   }
+
+  /// Wait until the STK Push succeeds, fails or expires.
+  Future<Map<String, dynamic>> waitForPaymentResult(
+      String checkoutRequestId) async {
+    while (true) {
+      final status = await _api.getPaymentStatus(checkoutRequestId);
+      if (status['status'] != 'pending') return status;
+    }
+  }
 }
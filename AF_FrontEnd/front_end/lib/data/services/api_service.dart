@@ -3,6 +3,7 @@ import 'package:flutter/foundation.dart';
 import 'package:flutter_secure_storage/flutter_secure_storage.dart';
 import '../../core/config/api_config.dart';
 import 'log_service.dart';
+import 'token_refresher.dart';
 
 class ApiService {
   late final Dio _dio;
@@ -30,7 +31,7 @@ class ApiService {
     _dio.interceptors.add(
       InterceptorsWrapper(
         onRequest: (options, handler) async {
-          final token = await _storage.read(key: 'jwt_token');
+          final token = await _storage.read(key: TokenRefresher.accessTokenKey);
           if (token != null) {
             options.headers['Authorization'] = 'Bearer $token';
           }
@@ -43,9 +44,20 @@ class ApiService {
           _log(message);
           return handler.next(response);
         },
-        onError: (DioException e, handler) {
+        onError: (DioException e, handler) async {
           final message = 'ERROR[${e.response?.statusCode}] => PATH: ${e.requestOptions.path} | MESSAGE: ${e.message}';
           _log(message);
+          // Access tokens are short-lived: renew once and replay the request
+          if (TokenRefresher.shouldRefresh(e)) {
+            final token = await TokenRefresher.refresh();
+            if (token != null) {
+              try {
+                return handler.resolve(await TokenRefresher.retry(_dio, e.requestOptions, token));
+              } on DioException catch (retryError) {
+                return handler.next(retryError);
+              }
+            }
+          }
           return handler.next(e);
         },
       ),
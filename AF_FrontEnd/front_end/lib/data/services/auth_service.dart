@@ -1,6 +1,8 @@
 import 'package:dio/dio.dart';
 import 'package:flutter_secure_storage/flutter_secure_storage.dart';
 import 'api_service.dart';
+import 'token_refresher.dart';
+import 'delta_sync_cache.dart';
 import '../../core/config/api_config.dart';
 
 class AuthService {
@@ -8,7 +10,8 @@ class AuthService {
   final FlutterSecureStorage _storage = const FlutterSecureStorage();
 
   // Keys for secure storage
-  static const String _tokenKey = 'jwt_token';
+  static const String _tokenKey = TokenRefresher.accessTokenKey;
+  static const String _refreshTokenKey = TokenRefresher.refreshTokenKey;
   static const String _userRoleKey = 'user_role';
   static const String _userNameKey = 'user_full_name';
   static const String _userIdKey = 'user_id';
@@ -35,6 +38,10 @@ class AuthService {
         final displayName = response.data['display_name'];
 
         await _saveAuthData(token, role, userId, serverEmail ?? email);
+        final refreshToken = response.data['refresh_token'];
+        if (refreshToken != null) {
+          await _storage.write(key: _refreshTokenKey, value: refreshToken);
+        }
         
         if (displayName != null) {
           await _storage.write(key: _userNameKey, value: displayName);
@@ -147,7 +154,16 @@ class AuthService {
   }
 
   Future<void> logout() async {
+    // Best effort: revoke the session server side before forgetting it
+    try {
+      final refreshToken = await _storage.read(key: _refreshTokenKey);
+      await _apiService.post(ApiConfig.logout, data: {'refresh_token': refreshToken});
+    } catch (e) {
+      print("Logout request failed: $e");
+    }
+    DeltaSyncCache.clearAll();
     await _storage.delete(key: _tokenKey);
+    await _storage.delete(key: _refreshTokenKey);
     await _storage.delete(key: _userRoleKey);
     await _storage.delete(key: _userEmailKey);
     await _storage.delete(key: _userNameKey);
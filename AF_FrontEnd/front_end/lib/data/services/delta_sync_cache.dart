@@ -0,0 +1,51 @@
+/// In-memory copy of a list endpoint that supports `?since_version=`.
+///
+/// The first fetch of a scope (a campaign's timeline, the user's campaigns)
+/// asks for everything since version 0; every fetch merges the `changed`
+/// rows and `deleted` ids of the delta and keeps the server's `version` as
+/// the next since_version. That version can lag the rows already received
+/// while other writes are in flight, so rows may arrive twice; merging by id
+/// makes that harmless.
+class DeltaSyncCache {
+  DeltaSyncCache({required this.idKey}) {
+    _all.add(this);
+  }
+
+  static final List<DeltaSyncCache> _all = [];
+
+  final String idKey;
+
+  final Map<String, _SyncedRows> _scopes = {};
+
+  /// since_version to request for [scope]; 0 until it has been fetched.
+  int sinceVersion(String scope) => _scopes[scope]?.version ?? 0;
+
+  /// Applies a delta response and returns the merged rows.
+  List<Map<String, dynamic>> apply(String scope, Map<String, dynamic> data) {
+    final synced = _scopes.putIfAbsent(scope, () => _SyncedRows(0, {}));
+    for (final row in (data['changed'] as List).cast<Map<String, dynamic>>()) {
+      synced.rows[row[idKey].toString()] = row;
+    }
+    for (final id in data['deleted'] as List) {
+      synced.rows.remove(id.toString());
+    }
+    synced.version = data['version'] as int;
+    return synced.rows.values.toList();
+  }
+
+  void invalidate(String scope) => _scopes.remove(scope);
+
+  /// Drops every cached copy, e.g. on sign-out.
+  static void clearAll() {
+    for (final cache in _all) {
+      cache._scopes.clear();
+    }
+  }
+}
+
+class _SyncedRows {
+  _SyncedRows(this.version, this.rows);
+
+  int version;
+  final Map<String, Map<String, dynamic>> rows;
+}
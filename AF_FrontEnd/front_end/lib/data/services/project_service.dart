@@ -3,10 +3,15 @@ import 'api_service.dart';
 import '../../core/config/api_config.dart';
 import '../models/project.dart';
 import '../models/fundraiser_stats.dart';
+import 'delta_sync_cache.dart';
 
 class ProjectService {
   final ApiService _apiService = ApiService();
 
+  // Shared by all instances; cleared on sign-out
+  static final DeltaSyncCache _myCampaigns = DeltaSyncCache(idKey: 'campaign_id');
+  static const String _myCampaignsScope = 'my-campaigns';
+
   // Fetch active projects (Discovery Feed)
   Future<List<Project>> getActiveProjects() async {
     try {
@@ -39,9 +44,12 @@ class ProjectService {
   // Fetch only my projects (Fundraiser Dashboard)
   Future<List<Project>> getMyProjects() async {
     try {
-      final response = await _apiService.get(ApiConfig.myCampaigns); 
+      final response = await _apiService.get(
+        ApiConfig.myCampaigns,
+        queryParameters: {'since_version': _myCampaigns.sinceVersion(_myCampaignsScope)},
+      );
       if (response.statusCode == 200) {
-        final List<dynamic> data = response.data;
+        final data = _myCampaigns.apply(_myCampaignsScope, response.data);
         return data.map((json) => Project.fromJson(json)).toList();
       }
       return [];
@@ -3,6 +3,7 @@ import '../../core/config/api_config.dart';
 
 class SocketService {
   late IO.Socket socket;
+  final Set<String> _joinedCampaigns = {};
   static final SocketService _instance = SocketService._internal();
 
   factory SocketService() {
@@ -20,12 +21,18 @@ class SocketService {
     print('[SOCKET] Initializing with: $socketUrl');
 
     socket = IO.io(socketUrl, IO.OptionBuilder()
-      .setTransports(['websocket', 'polling']) // Allow polling as fallback
+      // Websocket only: polling needs sticky sessions across backend workers
+      .setTransports(['websocket'])
       .enableAutoConnect()
       .build());
 
     socket.onConnect((_) {
       print('[SOCKET] Connected to Backend');
+      // Rooms live on the worker holding the connection, so rejoin after
+      // every (re)connect in case we landed on a different one.
+      for (final campaignId in _joinedCampaigns) {
+        socket.emit('join_campaign', campaignId);
+      }
     });
 
     socket.onDisconnect((_) {
@@ -38,11 +45,13 @@ class SocketService {
   }
 
   void joinCampaign(String campaignId) {
+    _joinedCampaigns.add(campaignId);
     socket.emit('join_campaign', campaignId);
     print('[SOCKET] Joined campaign room: $campaignId');
   }
 
   void leaveCampaign(String campaignId) {
+    _joinedCampaigns.remove(campaignId);
     socket.emit('leave_campaign', campaignId);
     print('[SOCKET] Left campaign room: $campaignId');
   }
@@ -0,0 +1,77 @@
+import 'package:dio/dio.dart';
+import 'package:flutter_secure_storage/flutter_secure_storage.dart';
+import '../../core/config/api_config.dart';
+
+/// Renews the short-lived access token with the stored refresh token.
+///
+/// Shared by every ApiService / ApiClient instance: concurrent 401s wait on
+/// one refresh call, since the server accepts each refresh token only once
+/// and treats a replayed one as stolen.
+class TokenRefresher {
+  TokenRefresher._();
+
+  static const String accessTokenKey = 'jwt_token';
+  static const String refreshTokenKey = 'refresh_token';
+  static const String _retriedKey = 'auth_retried';
+
+  static const FlutterSecureStorage _storage = FlutterSecureStorage();
+  static Future<String?>? _inFlight;
+
+  // No interceptors, so a failing refresh cannot trigger another refresh
+  static final Dio _dio = Dio(
+    BaseOptions(
+      connectTimeout: ApiConfig.connectTimeout,
+      receiveTimeout: ApiConfig.receiveTimeout,
+      headers: {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+      },
+    ),
+  );
+
+  /// Returns the new access token, or null when the user has to sign in again.
+  static Future<String?> refresh() {
+    return _inFlight ??= _refresh().whenComplete(() => _inFlight = null);
+  }
+
+  static Future<String?> _refresh() async {
+    final refreshToken = await _storage.read(key: refreshTokenKey);
+    if (refreshToken == null) return null;
+    try {
+      final response = await _dio.post(
+        ApiConfig.refresh,
+        data: {'refresh_token': refreshToken},
+      );
+      final accessToken = response.data['access_token'] as String;
+      await _storage.write(key: accessTokenKey, value: accessToken);
+      final newRefreshToken = response.data['refresh_token'];
+      if (newRefreshToken != null) {
+        await _storage.write(key: refreshTokenKey, value: newRefreshToken);
+      } else {
+        await _storage.delete(key: refreshTokenKey);
+      }
+      return accessToken;
+    } on DioException catch (e) {
+      if (e.response?.statusCode == 401) {
+        await _storage.delete(key: refreshTokenKey);
+      }
+      return null;
+    }
+  }
+
+  /// Whether a failed request should be retried once with a refreshed token.
+  static bool shouldRefresh(DioException e) {
+    final path = e.requestOptions.path;
+    return e.response?.statusCode == 401 &&
+        e.requestOptions.extra[_retriedKey] != true &&
+        !path.endsWith('/auth/login') &&
+        !path.endsWith('/auth/refresh');
+  }
+
+  /// Replays [options] on [dio] with [accessToken].
+  static Future<Response> retry(Dio dio, RequestOptions options, String accessToken) {
+    options.headers['Authorization'] = 'Bearer $accessToken';
+    options.extra[_retriedKey] = true;
+    return dio.fetch(options);
+  }
+}
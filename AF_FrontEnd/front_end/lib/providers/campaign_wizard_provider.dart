@@ -1,5 +1,6 @@
 import 'package:flutter_riverpod/flutter_riverpod.dart';
 import '../../data/models/project.dart';
+import '../data/repositories/campaign_repository.dart';
 import 'dart:convert';
 
 class CampaignWizardState {
@@ -101,7 +102,7 @@ class CampaignWizardState {
       durationMonths: durationMonths,
       category: category,
       fundraiserId: fundraiserId,
-      numPhases: estimatedPhaseCount,
+      numPhases: phaseCount ?? estimatedPhaseCount,
       budgetData: budgetItems.isNotEmpty ? _serializeBudget(budgetItems) : null,
     );
   }
@@ -123,6 +124,25 @@ class CampaignWizardNotifier extends Notifier<CampaignWizardState> {
 
   void updateFinancials(double goal, int duration) {
     state = state.copyWith(goalAmount: goal, durationMonths: duration);
+    refreshPlan();
+  }
+
+  /// Replace the local estimate with the backend's plan for the current goal
+  /// and duration. Falls back to the estimate if the request fails.
+  Future<void> refreshPlan() async {
+    if (state.goalAmount <= 0) return;
+    final goal = state.goalAmount;
+    final duration = state.durationMonths;
+    try {
+      final plan = await CampaignRepository().planCampaign(goal, duration);
+      // Ignore responses for inputs the user has since changed
+      if (plan == null || goal != state.goalAmount || duration != state.durationMonths) return;
+      state = state.copyWith(
+        riskFactor: (plan['risk_factor_c'] as num).toDouble(),
+        phaseCount: plan['phase_count'] as int,
+        milestones: plan['milestones'] as List<dynamic>,
+      );
+    } catch (_) {}
   }
 
   void updateCategory(String category) {
@@ -59,18 +59,34 @@ class _ProjectDiscoveryDetailState
     super.initState();
     SocketService().joinCampaign(widget.project.id!);
 
+    // Someone funded this campaign; the payer's own confirmation comes from
+    // _awaitPaymentResult
     SocketService().socket.on('payment_received', (data) {
       if (data != null && data['campaign_id'] == widget.project.id) {
         ref.invalidate(projectDetailProvider(widget.project.id!));
         ref.invalidate(activeProjectsProvider);
+      }
+    });
+  }
 
+  Future<void> _awaitPaymentResult(String checkoutRequestId) async {
+    try {
+      final status =
+          await _paymentRepository.waitForPaymentResult(checkoutRequestId);
+      if (!mounted) return;
+
+      if (status['status'] == 'success') {
+        ref.invalidate(projectDetailProvider(widget.project.id!));
+        ref.invalidate(activeProjectsProvider);
         _amountController.clear();
-        if (mounted) {
-          Navigator.of(context).popUntil((route) => route is PageRoute);
-          _showPaymentConfirmedDialog();
-        }
+        Navigator.of(context).popUntil((route) => route is PageRoute);
+        _showPaymentConfirmedDialog();
+      } else {
+        _showSnackBar(status['message'] ?? "Payment was not completed");
       }
-    });
+    } catch (e) {
+      // Socket updates still refresh the page if polling fails
+    }
   }
 
   void _showPaymentConfirmedDialog() {
@@ -134,6 +150,7 @@ class _ProjectDiscoveryDetailState
 
       if (mounted) {
         _showRequestSentDialog(result['message']);
+        _awaitPaymentResult(result['checkout_request_id']);
       }
     } catch (e) {
       if (mounted) {
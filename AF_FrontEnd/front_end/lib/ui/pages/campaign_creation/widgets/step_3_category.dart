@@ -77,9 +77,9 @@ class Step3Category extends ConsumerWidget {
           Row(
             mainAxisAlignment: MainAxisAlignment.spaceAround,
             children: [
-              _buildAlgoStat("Risk factor (C)", state.estimatedRiskC.toStringAsFixed(3), Colors.orange),
+              _buildAlgoStat("Risk factor (C)", (state.riskFactor ?? state.estimatedRiskC).toStringAsFixed(3), Colors.orange),
               Container(height: 30, width: 1, color: Colors.grey.shade200),
-              _buildAlgoStat("Phase count (P)", state.estimatedPhaseCount.toString(), Colors.blue),
+              _buildAlgoStat("Phase count (P)", (state.phaseCount ?? state.estimatedPhaseCount).toString(), Colors.blue),
             ],
           ),
           const SizedBox(height: 8),